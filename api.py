@@ -1,21 +1,42 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, url_for, stream_with_context
 from flask_cors import CORS
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib import colormaps
 import cmath
 import io
 import base64
 import warnings
 import time
-from typing import Dict, List, Tuple, Optional, Callable, Any
+from typing import Dict, List, Tuple, Optional, Callable, Any, Iterator, Union
 import sympy as sp
 from sympy.parsing.sympy_parser import parse_expr
 from sympy import symbols
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from functools import lru_cache
 from dataclasses import dataclass, asdict
+from collections import OrderedDict, deque
 import uuid
 import math
+import json
+import os
+import re
+import threading
+import multiprocessing
+import struct
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,6 +56,12 @@ def seguro_float(valor, default=0.0, min_val=1e-15):
     except (ValueError, TypeError):
         return float(default)
 
+def seguro_float_array(valores, default=0.0, min_val=1e-15) -> np.ndarray:
+    """Versión vectorizada de seguro_float."""
+    arr = np.asarray(valores, dtype=np.float64)
+    arr = np.where(np.isfinite(arr), arr, float(default))
+    return np.where(np.abs(arr) < min_val, float(min_val), arr)
+
 def seguro_complex(real, imag):
     """Crea un número complejo de manera segura."""
     return complex(
@@ -42,36 +69,6 @@ def seguro_complex(real, imag):
         seguro_float(imag, 0.5, 1e-15)
     )
 
-def convertir_a_numero(valor):
-    try:
-        if isinstance(valor, (int, float)):
-            return seguro_float(valor)
-        elif isinstance(valor, str):
-            if '.' in valor or 'e' in valor.lower() or 'E' in valor.lower():
-                return seguro_float(valor)
-            else:
-                return int(valor)
-        elif isinstance(valor, complex):
-            return complex(
-                seguro_float(valor.real),
-                seguro_float(valor.imag)
-            )
-        else:
-            return 0.0
-    except:
-        return 0.0
-
-def convertir_datos_numericos(data):
-    if isinstance(data, dict):
-        result = {}
-        for key, value in data.items():
-            result[key] = convertir_datos_numericos(value)
-        return result
-    elif isinstance(data, list):
-        return [convertir_datos_numericos(item) for item in data]
-    else:
-        return convertir_a_numero(data)
-
 def serializar_complex(z):
     if isinstance(z, complex):
         return {'real': seguro_float(z.real), 'imag': seguro_float(z.imag)}
@@ -101,6 +98,291 @@ def resultado_a_json(resultado):
         except (ValueError, TypeError):
             return str(resultado)
 
+# SERIALIZACIÓN DE RESPUESTAS
+TIPOS_FORMATO = {
+    'application/vnd.secante.columnar+json': 'columnar',
+    'application/vnd.secante.binario+json': 'binario'
+}
+
+def formato_solicitado() -> str:
+    """Formato de respuesta pedido por ?formato= o por la cabecera Accept."""
+    formato = request.args.get('formato', '')
+    if formato in ('json', 'columnar', 'binario'):
+        return formato
+    
+    accept = request.headers.get('Accept', '')
+    for tipo, nombre in TIPOS_FORMATO.items():
+        if tipo in accept:
+            return nombre
+    return 'json'
+
+def serie_columnar(valores, formato: str = 'columnar', dtype: str = '<f8'):
+    valores = np.ascontiguousarray(valores, dtype=dtype)
+    if formato == 'binario':
+        return {
+            'dtype': valores.dtype.name,
+            'longitud': int(valores.size),
+            'datos': base64.b64encode(valores.tobytes()).decode('ascii')
+        }
+    return valores
+
+def trayectoria_columnar(trayectoria: np.ndarray, formato: str = 'columnar') -> Dict[str, Any]:
+    return {
+        'real': serie_columnar(trayectoria.real, formato),
+        'imag': serie_columnar(trayectoria.imag, formato)
+    }
+
+def _a_json_nativo(valor):
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+def respuesta_json(payload: Dict[str, Any], formato: str = 'json', status: int = 200) -> Response:
+    if orjson is not None:
+        cuerpo = orjson.dumps(payload, default=_a_json_nativo,
+                              option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    else:
+        cuerpo = json.dumps(payload, default=_a_json_nativo)
+    
+    mimetype = 'application/json' if formato == 'json' else f'application/vnd.secante.{formato}+json'
+    return Response(cuerpo, status=status, mimetype=mimetype)
+
+# DECODIFICACIÓN DE SOLICITUDES
+class ErrorValidacion(ValueError):
+    """Errores de validación acumulados de una solicitud."""
+    
+    def __init__(self, errores: List[Dict[str, str]]):
+        super().__init__('; '.join(f"{e['campo']}: {e['mensaje']}" for e in errores))
+        self.errores = errores
+
+@dataclass(frozen=True)
+class Campo:
+    tipo: str
+    default: Any = None
+    requerido: bool = False
+    minimo: Optional[float] = None
+    maximo: Optional[float] = None
+    opciones: Optional[Tuple[str, ...]] = None
+    esquema: Optional[Dict[str, 'Campo']] = None
+
+def _decodificar_float(valor) -> float:
+    if isinstance(valor, bool) or not isinstance(valor, (int, float, str)):
+        raise ValueError('se esperaba un número')
+    try:
+        resultado = float(valor)
+    except ValueError:
+        raise ValueError('se esperaba un número')
+    if not math.isfinite(resultado):
+        raise ValueError('el número debe ser finito')
+    return resultado
+
+def _decodificar_int(valor) -> int:
+    if isinstance(valor, bool):
+        raise ValueError('se esperaba un entero')
+    if isinstance(valor, int):
+        return valor
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    if isinstance(valor, str) and valor.strip().lstrip('+-').isdigit():
+        return int(valor)
+    raise ValueError('se esperaba un entero')
+
+def _decodificar_bool(valor) -> bool:
+    if isinstance(valor, bool):
+        return valor
+    if isinstance(valor, int) and valor in (0, 1):
+        return bool(valor)
+    if isinstance(valor, str) and valor.lower() in ('true', 'false', '1', '0'):
+        return valor.lower() in ('true', '1')
+    raise ValueError('se esperaba un booleano')
+
+def _decodificar_str(valor) -> str:
+    if not isinstance(valor, str):
+        raise ValueError('se esperaba una cadena')
+    return valor
+
+def _decodificar_array(valor) -> np.ndarray:
+    if not isinstance(valor, (list, tuple)):
+        raise ValueError('se esperaba una lista de números')
+    try:
+        arr = np.asarray(valor, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError('la lista contiene valores no numéricos')
+    if arr.ndim != 1:
+        raise ValueError('se esperaba una lista plana de números')
+    if not np.all(np.isfinite(arr)):
+        raise ValueError('la lista contiene valores no finitos')
+    return arr
+
+def _decodificar_lista_str(valor) -> List[str]:
+    if not isinstance(valor, list) or not all(isinstance(v, str) for v in valor):
+        raise ValueError('se esperaba una lista de cadenas')
+    return valor
+
+DECODIFICADORES = {
+    'float': _decodificar_float,
+    'int': _decodificar_int,
+    'bool': _decodificar_bool,
+    'str': _decodificar_str,
+    'array': _decodificar_array,
+    'lista': _decodificar_lista_str
+}
+
+def _validar_campo(nombre: str, campo: Campo, valor, errores: List[Dict[str, str]]):
+    if campo.tipo == 'objeto':
+        if not isinstance(valor, dict):
+            errores.append({'campo': nombre, 'mensaje': 'se esperaba un objeto'})
+            return None
+        return _decodificar_esquema(campo.esquema, valor, errores, prefijo=f'{nombre}.')
+    
+    try:
+        valor = DECODIFICADORES[campo.tipo](valor)
+    except ValueError as e:
+        errores.append({'campo': nombre, 'mensaje': str(e)})
+        return None
+    
+    medida = len(valor) if campo.tipo in ('array', 'lista') else valor
+    if campo.minimo is not None and medida < campo.minimo:
+        errores.append({'campo': nombre, 'mensaje': f'debe ser >= {campo.minimo}'})
+    elif campo.maximo is not None and medida > campo.maximo:
+        errores.append({'campo': nombre, 'mensaje': f'debe ser <= {campo.maximo}'})
+    elif campo.opciones is not None and valor not in campo.opciones:
+        errores.append({'campo': nombre, 'mensaje': f"debe ser uno de: {', '.join(campo.opciones)}"})
+    return valor
+
+def _decodificar_esquema(esquema: Dict[str, Campo], data: Dict[str, Any],
+                         errores: List[Dict[str, str]], prefijo: str = '') -> Dict[str, Any]:
+    resultado = {}
+    for nombre, campo in esquema.items():
+        valor = data.get(nombre)
+        if valor is None:
+            if campo.requerido:
+                errores.append({'campo': prefijo + nombre, 'mensaje': 'campo requerido faltante'})
+            resultado[nombre] = campo.default
+            continue
+        resultado[nombre] = _validar_campo(prefijo + nombre, campo, valor, errores)
+    return resultado
+
+def decodificar_solicitud(esquema: Dict[str, Campo], data=None) -> Dict[str, Any]:
+    """Decodifica y valida el cuerpo JSON en una sola pasada según el esquema."""
+    if data is None:
+        data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise ErrorValidacion([{'campo': 'cuerpo', 'mensaje': 'debe ser un objeto JSON'}])
+    
+    errores = []
+    resultado = _decodificar_esquema(esquema, data, errores)
+    if errores:
+        raise ErrorValidacion(errores)
+    return resultado
+
+def respuesta_error_validacion(error: ErrorValidacion):
+    return jsonify({
+        'status': 'error',
+        'message': str(error),
+        'errores': error.errores
+    }), 400
+
+ESTRATEGIAS_CICLOS = ('perturbacion', 'reset', 'hibrido', 'perturbacion_hibrida', 'adaptativa',
+                      'newton_secante')
+
+METODOS_ITERACION = ('secante', 'muller', 'iqi', 'steffensen')
+
+ESQUEMA_CONFIGURAR = {
+    'expresion_funcion': Campo('str', requerido=True),
+    'tol': Campo('float', 1e-12, minimo=0.0),
+    'max_iter': Campo('int', 200, minimo=1),
+    'estrategia_ciclos': Campo('str', 'perturbacion_hibrida', opciones=ESTRATEGIAS_CICLOS),
+    'usar_derivada_numerica': Campo('bool', False),
+    'metodo': Campo('str', 'secante', opciones=METODOS_ITERACION)
+}
+
+ESQUEMA_EJECUTAR = {
+    'handle': Campo('str'),
+    'id_ejecucion': Campo('str'),
+    'visualizacion': Campo('str', opciones=('diferida', 'inline', 'ninguna')),
+    'transporte': Campo('str', opciones=('ndjson', 'sse')),
+    'x0_real': Campo('float', requerido=True),
+    'x0_imag': Campo('float', requerido=True),
+    'x1_real': Campo('float', requerido=True),
+    'x1_imag': Campo('float', requerido=True)
+}
+
+ESQUEMA_REGION = {
+    'x_min': Campo('float', -2.0),
+    'x_max': Campo('float', 2.0),
+    'y_min': Campo('float', -2.0),
+    'y_max': Campo('float', 2.0)
+}
+
+# Tamaño del pool de procesos compartido; SECANTE_MAX_WORKERS lo fija para todo el proceso
+MAX_WORKERS_PROCESOS = max(1, int(os.environ.get('SECANTE_MAX_WORKERS') or os.cpu_count() or 1))
+
+# La malla tiene n_puntos² semillas; el motor vectorizado las procesa en lotes acotados
+MAX_PUNTOS_BUSQUEDA = 1024
+MAX_SEMILLAS_POR_PASADA = 16384
+
+ESQUEMA_BUSCAR_RAICES = {
+    'handle': Campo('str'),
+    'region': Campo('objeto', requerido=True, esquema=ESQUEMA_REGION),
+    'n_puntos': Campo('int', 20, minimo=1, maximo=MAX_PUNTOS_BUSQUEDA),
+    'distancia_minima': Campo('float', 0.05, minimo=0.0),
+    'paralelo': Campo('bool', True),
+    'vectorizado': Campo('bool', True),
+    'procesos': Campo('bool', False),
+    'max_workers': Campo('int', minimo=1, maximo=MAX_WORKERS_PROCESOS),
+    'adaptativo': Campo('bool', False),
+    'max_semillas': Campo('int', minimo=5),
+    'profundidad_max': Campo('int', 6, minimo=0, maximo=12),
+    'raices_objetivo': Campo('int', minimo=1),
+    'contar_raices': Campo('bool', False),
+    'semillas_companion': Campo('bool', True),
+    'deflacion': Campo('bool', False)
+}
+
+MAX_SEMILLAS_LOTE = 20000
+
+ESQUEMA_EJECUTAR_LOTE = {
+    'handle': Campo('str'),
+    'x0_real': Campo('array', requerido=True, minimo=1, maximo=MAX_SEMILLAS_LOTE),
+    'x0_imag': Campo('array', requerido=True, minimo=1, maximo=MAX_SEMILLAS_LOTE),
+    'x1_real': Campo('array', maximo=MAX_SEMILLAS_LOTE),
+    'x1_imag': Campo('array', maximo=MAX_SEMILLAS_LOTE),
+    'ids': Campo('lista', maximo=MAX_SEMILLAS_LOTE),
+    'trayectorias': Campo('bool', False),
+    'procesos': Campo('bool', False),
+    'max_workers': Campo('int', minimo=1, maximo=MAX_WORKERS_PROCESOS)
+}
+
+MAX_RAICES_CUENCAS = 256
+
+ESQUEMA_CUENCAS = {
+    'handle': Campo('str'),
+    'region': Campo('objeto', requerido=True, esquema=ESQUEMA_REGION),
+    'ancho': Campo('int', 256, minimo=1, maximo=4096),
+    'alto': Campo('int', 256, minimo=1, maximo=4096),
+    'filas_por_bloque': Campo('int', minimo=1),
+    'distancia_minima': Campo('float', minimo=0.0),
+    'max_raices': Campo('int', MAX_RAICES_CUENCAS, minimo=1, maximo=MAX_RAICES_CUENCAS),
+    'salida': Campo('str', 'arrays', opciones=('arrays', 'ndjson', 'png'))
+}
+
+# La salida 'arrays' devuelve la malla completa en una sola respuesta; las mayores se piden
+# como 'ndjson' o 'png', que se envían bloque a bloque
+MAX_PIXELES_CUENCAS_ARRAYS = 1024 * 1024
+
+ESQUEMA_SENSIBILIDAD = {
+    'handle': Campo('str'),
+    'raiz_real': Campo('float', requerido=True),
+    'raiz_imag': Campo('float', requerido=True),
+    'niveles_ruido': Campo('array', minimo=1, maximo=64),
+    'muestras_por_nivel': Campo('int', 5, minimo=1, maximo=10**6),
+    'semilla': Campo('int', minimo=0),
+    'detalle_por_nivel': Campo('int', 100, minimo=0, maximo=1000)
+}
+
 # MODELOS DE DATOS
 @dataclass
 class PuntoComplejo:
@@ -117,18 +399,26 @@ class PuntoComplejo:
     def to_dict(self):
         return {'real': float(self.real), 'imag': float(self.imag)}
 
-@dataclass
 class ResultadoSecante:
+    """Resultado compacto: trayectoria y series de error en arreglos contiguos de NumPy."""
+    
+    __slots__ = (
+        'id_ejecucion', 'raiz', 'iteraciones', 'convergio', 'trayectoria', 'error_final',
+        'tiempo_ejecucion', 'configuracion', 'errores_iteracion', 'errores_relativos',
+        'ciclos_detectados', 'tipo_convergencia', 'ratio_convergencia', 'error_relativo_final',
+        'tasa_reduccion_error', 'velocidad_convergencia', 'orden_aproximado'
+    )
+    
     id_ejecucion: str
     raiz: PuntoComplejo
     iteraciones: int
     convergio: bool
-    trayectoria: List[PuntoComplejo]
+    trayectoria: np.ndarray
     error_final: float
     tiempo_ejecucion: float
     configuracion: Dict[str, Any]
-    errores_iteracion: List[float]
-    errores_relativos: List[float]
+    errores_iteracion: np.ndarray
+    errores_relativos: np.ndarray
     ciclos_detectados: int
     tipo_convergencia: str
     ratio_convergencia: float
@@ -137,18 +427,53 @@ class ResultadoSecante:
     velocidad_convergencia: float
     orden_aproximado: float
     
-    def to_dict(self):
+    def __init__(self, **campos):
+        for campo in self.__slots__:
+            setattr(self, campo, campos[campo])
+        # Copia explícita: las series suelen llegar como vistas recortadas de los buffers
+        # de max_iter+2 posiciones, que de otro modo seguirían vivos en el historial
+        self.trayectoria = np.array(self.trayectoria, dtype=np.complex128, copy=True)
+        self.errores_iteracion = np.array(self.errores_iteracion, dtype=np.float64, copy=True)
+        self.errores_relativos = np.array(self.errores_relativos, dtype=np.float64, copy=True)
+    
+    @staticmethod
+    def _bytes_retenidos(arreglo: np.ndarray) -> int:
+        base = arreglo
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        return max(base.nbytes, arreglo.nbytes)
+    
+    def nbytes(self) -> int:
+        return (self._bytes_retenidos(self.trayectoria) +
+                self._bytes_retenidos(self.errores_iteracion) +
+                self._bytes_retenidos(self.errores_relativos))
+    
+    def trayectoria_dict(self) -> List[Dict[str, float]]:
+        return [{'real': r, 'imag': i}
+                for r, i in zip(self.trayectoria.real.tolist(), self.trayectoria.imag.tolist())]
+    
+    def to_dict(self, formato: str = 'json'):
+        if formato == 'json':
+            trayectoria = self.trayectoria_dict()
+            errores_iteracion = self.errores_iteracion.tolist()
+            errores_relativos = self.errores_relativos.tolist()
+        else:
+            trayectoria = trayectoria_columnar(self.trayectoria, formato)
+            errores_iteracion = serie_columnar(self.errores_iteracion, formato)
+            errores_relativos = serie_columnar(self.errores_relativos, formato)
+        
         return {
             'id_ejecucion': self.id_ejecucion,
             'raiz': self.raiz.to_dict(),
             'iteraciones': int(self.iteraciones),
             'convergio': bool(self.convergio),
-            'trayectoria': [p.to_dict() for p in self.trayectoria],
+            'formato': formato,
+            'trayectoria': trayectoria,
             'error_final': seguro_float(self.error_final, 1e-15),
             'tiempo_ejecucion': seguro_float(self.tiempo_ejecucion, 0.1),
             'configuracion': self.configuracion,
-            'errores_iteracion': [seguro_float(e, 1e-15) for e in self.errores_iteracion],
-            'errores_relativos': [seguro_float(e, 1e-15) for e in self.errores_relativos],
+            'errores_iteracion': errores_iteracion,
+            'errores_relativos': errores_relativos,
             'ciclos_detectados': int(self.ciclos_detectados),
             'tipo_convergencia': str(self.tipo_convergencia),
             'ratio_convergencia': seguro_float(self.ratio_convergencia, 1.0),
@@ -184,86 +509,744 @@ class Estudiante:
     email: Optional[str] = None
     avatar_url: Optional[str] = None
 
+# REGISTRO DE RAÍCES
+class RegistroRaices:
+    """Raíces únicas indexadas en celdas de lado distancia_minima para deduplicar en O(1)."""
+    
+    def __init__(self, distancia_minima: float, campo_contador: str = 'veces_encontrada'):
+        self.distancia_minima = max(float(distancia_minima), 1e-15)
+        self.campo_contador = campo_contador
+        self._entradas = []
+        self._celdas = {}
+        self._lock = threading.Lock()
+    
+    def _celda(self, z: complex) -> Tuple[int, int]:
+        return (math.floor(z.real / self.distancia_minima),
+                math.floor(z.imag / self.distancia_minima))
+    
+    def _buscar_cercana(self, z: complex) -> Optional[Dict[str, Any]]:
+        cx, cy = self._celda(z)
+        candidata = None
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for idx in self._celdas.get((cx + dx, cy + dy), ()):
+                    if abs(z - self._entradas[idx]['complejo']) < self.distancia_minima:
+                        if candidata is None or idx < candidata:
+                            candidata = idx
+        return self._entradas[candidata] if candidata is not None else None
+    
+    def insertar(self, raiz_compleja: complex, veces: int = 1, **datos) -> bool:
+        z = complex(raiz_compleja)
+        if not (math.isfinite(z.real) and math.isfinite(z.imag)):
+            return False
+        
+        with self._lock:
+            existente = self._buscar_cercana(z)
+            if existente is not None:
+                existente[self.campo_contador] += int(veces)
+                return False
+            
+            self._agregar(z, veces, datos)
+            return True
+    
+    def _agregar(self, z: complex, veces: int, datos: Dict[str, Any]):
+        self._celdas.setdefault(self._celda(z), []).append(len(self._entradas))
+        self._entradas.append({'complejo': z, **datos, self.campo_contador: int(veces)})
+    
+    def insertar_lote(self, raices: np.ndarray,
+                      datos_de: Optional[Callable[[complex], Dict[str, Any]]] = None) -> int:
+        """Equivale a llamar a insertar() con cada raíz en orden, comparando distancias por bloques."""
+        raices = np.asarray(raices, dtype=np.complex128).ravel()
+        raices = raices[np.isfinite(raices)]
+        if raices.size == 0:
+            return 0
+        
+        asignadas = np.full(raices.size, -1, dtype=np.int64)
+        with self._lock:
+            if self._entradas:
+                # Cada raíz va a la entrada existente de menor índice a menos de distancia_minima,
+                # buscándola solo en las 3×3 celdas vecinas de su celda
+                celdas = np.stack([np.floor(raices.real / self.distancia_minima),
+                                   np.floor(raices.imag / self.distancia_minima)], axis=1)
+                claves, inversa, conteos = np.unique(celdas, axis=0, return_inverse=True,
+                                                     return_counts=True)
+                por_celda = np.split(np.argsort(inversa.ravel(), kind='stable'), np.cumsum(conteos)[:-1])
+                for (cx, cy), puntos in zip(claves.tolist(), por_celda):
+                    candidatas = sorted(
+                        idx for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                        for idx in self._celdas.get((int(cx) + dx, int(cy) + dy), ())
+                    )
+                    if not candidatas:
+                        continue
+                    referencias = np.array([self._entradas[i]['complejo'] for i in candidatas])
+                    cerca = np.abs(raices[puntos, np.newaxis] - referencias) < self.distancia_minima
+                    con_entrada = cerca.any(axis=1)
+                    asignadas[puntos[con_entrada]] = np.asarray(candidatas)[cerca[con_entrada].argmax(axis=1)]
+                
+                existentes, veces = np.unique(asignadas[asignadas >= 0], return_counts=True)
+                for idx, n in zip(existentes.tolist(), veces.tolist()):
+                    self._entradas[idx][self.campo_contador] += n
+            
+            # Las restantes crean entradas en orden: la primera libre funda una entrada y se lleva
+            # todas las libres a menos de distancia_minima, igual que al insertarlas una a una
+            libres = np.flatnonzero(asignadas < 0)
+            nuevas = 0
+            while libres.size:
+                z = complex(raices[libres[0]])
+                cerca = np.abs(raices[libres] - z) < self.distancia_minima
+                self._agregar(z, int(cerca.sum()), datos_de(z) if datos_de else {})
+                libres = libres[~cerca]
+                nuevas += 1
+        return nuevas
+    
+    def fusionar(self, entradas) -> int:
+        nuevas = 0
+        for entrada in entradas:
+            datos = {k: v for k, v in entrada.items() if k not in ('complejo', self.campo_contador)}
+            nuevas += self.insertar(entrada['complejo'], entrada.get(self.campo_contador, 1), **datos)
+        return nuevas
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
+    
+    def __iter__(self):
+        return iter(list(self._entradas))
+    
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        del estado['_lock']
+        return estado
+    
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._lock = threading.Lock()
+
+# HISTORIAL DE EJECUCIONES
+class HistorialEjecuciones:
+    """Historial acotado de ejecuciones indexado por id, con agregados incrementales."""
+    
+    def __init__(self, max_ejecuciones: int = 1000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_ejecuciones = max(int(max_ejecuciones), 1)
+        self.max_bytes = max(int(max_bytes), 1)
+        self._resultados = OrderedDict()
+        self._bytes = {}
+        self._lock = threading.Lock()
+        self.bytes_estimados = 0
+        self.descartados = 0
+        self._suma_tiempos = 0.0
+        self._total_tiempos = 0
+    
+    @staticmethod
+    def estimar_bytes(resultado: ResultadoSecante) -> int:
+        return 1024 + resultado.nbytes()
+    
+    def agregar(self, resultado: ResultadoSecante):
+        tamano = self.estimar_bytes(resultado)
+        
+        with self._lock:
+            if resultado.id_ejecucion in self._resultados:
+                self._descartar(resultado.id_ejecucion)
+            
+            self._resultados[resultado.id_ejecucion] = resultado
+            self._bytes[resultado.id_ejecucion] = tamano
+            self.bytes_estimados += tamano
+            self._suma_tiempos += resultado.tiempo_ejecucion
+            self._total_tiempos += 1
+            
+            while len(self._resultados) > 1 and (
+                    len(self._resultados) > self.max_ejecuciones or
+                    self.bytes_estimados > self.max_bytes):
+                self._descartar(next(iter(self._resultados)))
+                self.descartados += 1
+    
+    def _descartar(self, id_ejecucion: str):
+        del self._resultados[id_ejecucion]
+        self.bytes_estimados -= self._bytes.pop(id_ejecucion)
+    
+    def obtener(self, id_ejecucion: str) -> Optional[ResultadoSecante]:
+        return self._resultados.get(id_ejecucion)
+    
+    @property
+    def tiempo_promedio(self) -> float:
+        return self._suma_tiempos / self._total_tiempos if self._total_tiempos else 0.0
+    
+    def __len__(self) -> int:
+        return len(self._resultados)
+    
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._resultados.values()))
+
+# COMPILACIÓN Y CACHÉ DE EXPRESIONES
+@dataclass
+class FuncionCompilada:
+    expresion_normalizada: str
+    expr_sympy: Any
+    escalar: Callable[[complex], complex]
+    vectorizada: Callable[[np.ndarray], np.ndarray]
+    coeficientes: Optional[np.ndarray] = None
+    escalar_con_derivada: Optional[Callable[[complex], Tuple[complex, complex]]] = None
+    vectorizada_con_derivada: Optional[Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]] = None
+    backend: str = 'numpy'
+
+class CacheFunciones:
+    """Caché LRU de funciones compiladas compartida por todo el proceso."""
+    
+    def __init__(self, max_entradas: int = 64):
+        self.max_entradas = int(max_entradas)
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def obtener(self, clave: str, constructor: Callable[[str], FuncionCompilada]) -> FuncionCompilada:
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self._entradas[clave]
+            self.fallos += 1
+        
+        compilada = constructor(clave)
+        
+        with self._lock:
+            self._entradas[clave] = compilada
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+        return compilada
+    
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self.aciertos = 0
+            self.fallos = 0
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.aciertos + self.fallos
+            return {
+                'entradas': len(self._entradas),
+                'max_entradas': self.max_entradas,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / total if total else 0.0
+            }
+
+CACHE_FUNCIONES = CacheFunciones(max_entradas=64)
+
+def normalizar_expresion(expresion: str) -> str:
+    expresion = expresion.strip()
+    
+    caracteres_peligrosos = ['import', 'exec', 'eval', '__', 'open', 'file']
+    for peligroso in caracteres_peligrosos:
+        if peligroso in expresion.lower():
+            raise ValueError(f"Expresión contiene término no permitido")
+    
+    expr_limpia = expresion.replace('^', '**')
+    # Se aceptan prefijos de módulo (cmath.sin, np.exp): sympy resuelve las funciones por nombre
+    expr_limpia = re.sub(r'\b(?:cmath|numpy|np|math)\.', '', expr_limpia)
+    
+    if 'z' not in expr_limpia:
+        expr_limpia = expr_limpia.replace('x', 'z').replace('X', 'z')
+    
+    return expr_limpia
+
+def coeficientes_polinomio(expr_sympy, z) -> Optional[np.ndarray]:
+    """Coeficientes (grado mayor primero) si la expresión es un polinomio numérico en z."""
+    try:
+        polinomio = sp.Poly(expr_sympy, z)
+        coeficientes = np.array([complex(c) for c in polinomio.all_coeffs()], dtype=np.complex128)
+    except (sp.PolynomialError, TypeError, ValueError):
+        return None
+    
+    if coeficientes.size < 2 or not np.all(np.isfinite(coeficientes)):
+        return None
+    return coeficientes
+
+def compilar_polinomio(expr_limpia: str, expr_sympy, coeficientes: np.ndarray) -> FuncionCompilada:
+    """Evalúa el polinomio con el esquema de Horner en lugar del código lambdificado."""
+    lista_coeficientes = coeficientes.tolist()
+    
+    # Horner disperso: los tramos de coeficientes nulos se saltan con una sola potencia
+    no_nulos = np.flatnonzero(coeficientes)
+    saltos = np.diff(np.append(no_nulos, coeficientes.size - 1)).tolist()
+    pasos = list(zip(saltos, coeficientes[no_nulos].tolist()))
+    
+    def horner_escalar(z_val: complex) -> complex:
+        z_val = complex(z_val)
+        resultado = 0j
+        try:
+            for salto, c in pasos:
+                resultado += c
+                if salto:
+                    resultado *= z_val ** salto
+        except OverflowError:
+            # La potencia compleja lanza al desbordar; como en funcion_segura se devuelve el
+            # escalar NumPy (inf/nan) del núcleo vectorizado, cuyo abs() no depende de errno
+            return horner_vectorizado(np.array([z_val]))[0]
+        if abs(resultado) < 1e-15:
+            resultado += complex(1e-15, 1e-15)
+        return resultado
+    
+    def horner_vectorizado(z_vals: np.ndarray) -> np.ndarray:
+        z_arr = np.asarray(z_vals, dtype=np.complex128)
+        resultado = np.full(z_arr.shape, coeficientes[0], dtype=np.complex128)
+        with np.errstate(all='ignore'):
+            for c in lista_coeficientes[1:]:
+                resultado *= z_arr
+                if c:
+                    resultado += c
+        
+        resultado[np.abs(resultado) < 1e-15] += complex(1e-15, 1e-15)
+        return resultado
+    
+    def horner_con_derivada(z_val: complex) -> Tuple[complex, complex]:
+        z_val = complex(z_val)
+        valor, derivada = 0j, 0j
+        for c in lista_coeficientes:
+            derivada = derivada * z_val + valor
+            valor = valor * z_val + c
+        if abs(valor) < 1e-15:
+            valor += complex(1e-15, 1e-15)
+        return valor, derivada
+    
+    def horner_con_derivada_vectorizado(z_vals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        z_arr = np.asarray(z_vals, dtype=np.complex128)
+        valor = np.full(z_arr.shape, coeficientes[0], dtype=np.complex128)
+        derivada = np.zeros(z_arr.shape, dtype=np.complex128)
+        with np.errstate(all='ignore'):
+            for c in lista_coeficientes[1:]:
+                derivada *= z_arr
+                derivada += valor
+                valor *= z_arr
+                if c:
+                    valor += c
+        
+        valor[np.abs(valor) < 1e-15] += complex(1e-15, 1e-15)
+        return valor, derivada
+    
+    return FuncionCompilada(
+        expresion_normalizada=expr_limpia,
+        expr_sympy=expr_sympy,
+        escalar=horner_escalar,
+        vectorizada=horner_vectorizado,
+        coeficientes=coeficientes,
+        escalar_con_derivada=horner_con_derivada,
+        vectorizada_con_derivada=horner_con_derivada_vectorizado,
+        backend='horner'
+    )
+
+def deflactar_funcion(funcion_vectorizada: Callable[[np.ndarray], np.ndarray],
+                      raices: List[complex]) -> Callable[[np.ndarray], np.ndarray]:
+    """Evaluador vectorizado de f(z) / prod(z - r_i) sobre las raíces ya confirmadas."""
+    raices_arr = np.asarray(raices, dtype=np.complex128)
+    
+    def funcion_deflactada(z_vals: np.ndarray) -> np.ndarray:
+        z_arr = np.asarray(z_vals, dtype=np.complex128)
+        with np.errstate(all='ignore'):
+            divisor = np.prod(z_arr[..., np.newaxis] - raices_arr, axis=-1)
+            resultado = funcion_vectorizada(z_arr) / divisor
+        
+        resultado[np.abs(resultado) < 1e-15] += complex(1e-15, 1e-15)
+        return resultado
+    
+    return funcion_deflactada
+
+def compilar_derivada(expr_sympy, z) -> Tuple[Optional[Callable], Optional[Callable]]:
+    """Compila f y f' juntas, compartiendo subexpresiones comunes con cse."""
+    try:
+        f_y_derivada = sp.lambdify(z, [expr_sympy, sp.diff(expr_sympy, z)],
+                                   modules=['numpy', 'cmath'], cse=True)
+    except Exception as e:
+        logger.warning(f"No se pudo compilar la derivada analítica: {e}")
+        return None, None
+    
+    def escalar_con_derivada(z_val: complex) -> Tuple[complex, complex]:
+        try:
+            valor, derivada = f_y_derivada(complex(z_val))
+            valor, derivada = complex(valor), complex(derivada)
+        except (ZeroDivisionError, OverflowError, ValueError, TypeError):
+            return complex(1e-15, 1e-15), 0j
+        if abs(valor) < 1e-15:
+            valor += complex(1e-15, 1e-15)
+        return valor, derivada
+    
+    def vectorizada_con_derivada(z_vals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        z_arr = np.asarray(z_vals, dtype=np.complex128)
+        with np.errstate(all='ignore'):
+            valor, derivada = f_y_derivada(z_arr)
+        valor = np.array(np.broadcast_to(np.asarray(valor, dtype=np.complex128), z_arr.shape))
+        derivada = np.array(np.broadcast_to(np.asarray(derivada, dtype=np.complex128), z_arr.shape))
+        
+        valor[np.abs(valor) < 1e-15] += complex(1e-15, 1e-15)
+        return valor, derivada
+    
+    return escalar_con_derivada, vectorizada_con_derivada
+
+FUNCIONES_NUMEXPR = {
+    sp.sin: 'sin', sp.cos: 'cos', sp.tan: 'tan',
+    sp.asin: 'arcsin', sp.acos: 'arccos', sp.atan: 'arctan',
+    sp.sinh: 'sinh', sp.cosh: 'cosh', sp.tanh: 'tanh',
+    sp.asinh: 'arcsinh', sp.acosh: 'arccosh', sp.atanh: 'arctanh',
+    sp.exp: 'exp', sp.log: 'log', sp.Abs: 'abs',
+    sp.conjugate: 'conj', sp.re: 'real', sp.im: 'imag'
+}
+
+def expresion_numexpr(expr_sympy, z) -> Optional[str]:
+    """Traduce la expresión a la sintaxis de numexpr; None si usa funciones no soportadas."""
+    def traducir(nodo) -> str:
+        if nodo == z:
+            return 'z'
+        if nodo.is_number:
+            valor = complex(nodo)
+            if not cmath.isfinite(valor):
+                raise ValueError(nodo)
+            return repr(valor.real) if valor.imag == 0 else repr(valor)
+        if nodo.is_Add:
+            return '(' + ' + '.join(traducir(a) for a in nodo.args) + ')'
+        if nodo.is_Mul:
+            return '(' + ' * '.join(traducir(a) for a in nodo.args) + ')'
+        if nodo.is_Pow:
+            base, exponente = nodo.args
+            if exponente == -1:
+                return f'(1 / {traducir(base)})'
+            # La potencia compleja general de numexpr es lenta; las potencias enteras
+            # pequeñas de z se escriben como productos
+            if base == z and exponente.is_Integer and 2 <= exponente <= 4:
+                return '(' + ' * '.join(['z'] * int(exponente)) + ')'
+            return f'({traducir(base)} ** {traducir(exponente)})'
+        nombre = FUNCIONES_NUMEXPR.get(nodo.func)
+        if nombre is not None and len(nodo.args) == 1:
+            return f'{nombre}({traducir(nodo.args[0])})'
+        raise ValueError(nodo)
+    
+    try:
+        return traducir(expr_sympy)
+    except (ValueError, TypeError):
+        return None
+
+def compilar_cmath(expr_sympy, z) -> Optional[Callable]:
+    """Núcleo escalar con cmath puro; None si la expresión usa funciones que cmath no tiene."""
+    try:
+        nucleo = sp.lambdify(z, expr_sympy, modules=['cmath'])
+    except Exception:
+        return None
+    try:
+        complex(nucleo(complex(0.5, 0.25)))
+    except (ZeroDivisionError, OverflowError, ValueError):
+        pass
+    except Exception:
+        return None
+    return nucleo
+
+def compilar_expresion(expr_limpia: str) -> FuncionCompilada:
+    z = symbols('z')
+    expr_sympy = parse_expr(expr_limpia)
+    
+    coeficientes = coeficientes_polinomio(expr_sympy, z)
+    if coeficientes is not None:
+        return compilar_polinomio(expr_limpia, expr_sympy, coeficientes)
+    
+    expr_lamdified = sp.lambdify(z, expr_sympy, modules=['numpy', 'cmath'])
+    
+    # cmath puro para escalares y numexpr para arreglos; la versión NumPy de lambdify
+    # queda como respaldo cuando la expresión usa funciones que esos backends no cubren
+    nucleo_escalar = compilar_cmath(expr_sympy, z)
+    nucleo_vectorizado = None
+    cadena_numexpr = expresion_numexpr(expr_sympy, z) if numexpr is not None else None
+    if cadena_numexpr is not None:
+        nucleo_vectorizado = lambda z_arr: numexpr.evaluate(cadena_numexpr, local_dict={'z': z_arr})
+    backend = '+'.join(
+        [nombre for nombre, nucleo in (('cmath', nucleo_escalar), ('numexpr', nucleo_vectorizado))
+         if nucleo is not None] or ['numpy']
+    )
+    
+    def funcion_rapida(z_val: complex) -> complex:
+        try:
+            val = nucleo_escalar(z_val)
+        except (ZeroDivisionError, OverflowError, ValueError, TypeError):
+            # cmath lanza excepciones donde NumPy devuelve inf/nan: se delega en el núcleo
+            # NumPy para que un desbordamiento no parezca una raíz exacta
+            return funcion_segura(z_val)
+        if abs(val) < 1e-15:
+            return complex(val) + complex(1e-15, 1e-15)
+        return complex(val)
+    
+    def funcion_segura(z_val: complex) -> complex:
+        try:
+            if isinstance(z_val, (int, float)):
+                z_val = complex(z_val)
+            
+            resultado = expr_lamdified(z_val)
+            
+            if resultado is None:
+                return complex(1e-15, 1e-15)
+            
+            if isinstance(resultado, (int, float)):
+                val = complex(resultado, 0.0)
+                if abs(val) < 1e-15:
+                    val += complex(1e-15, 1e-15)
+                return val
+            elif isinstance(resultado, complex):
+                if abs(resultado) < 1e-15:
+                    return resultado + complex(1e-15, 1e-15)
+                return resultado
+            else:
+                try:
+                    val = complex(float(resultado), 0.0)
+                    return val if abs(val) > 1e-15 else val + complex(1e-15, 1e-15)
+                except:
+                    return complex(1e-15, 1e-15)
+                    
+        except (ZeroDivisionError, OverflowError, ValueError, TypeError):
+            return complex(1e-15, 1e-15)
+    
+    def funcion_vectorizada_segura(z_vals: np.ndarray) -> np.ndarray:
+        z_arr = np.asarray(z_vals, dtype=np.complex128)
+        try:
+            with np.errstate(all='ignore'):
+                if nucleo_vectorizado is not None:
+                    try:
+                        resultado = nucleo_vectorizado(z_arr)
+                    except Exception:
+                        resultado = expr_lamdified(z_arr)
+                else:
+                    resultado = expr_lamdified(z_arr)
+            resultado = np.asarray(resultado, dtype=np.complex128)
+            # Solo se copia si el resultado es escalar o comparte memoria con la entrada
+            if resultado.shape != z_arr.shape or np.may_share_memory(resultado, z_arr):
+                resultado = np.array(np.broadcast_to(resultado, z_arr.shape))
+        except Exception:
+            resultado = np.array(
+                [funcion_segura(complex(v)) for v in z_arr.ravel()],
+                dtype=np.complex128
+            ).reshape(z_arr.shape)
+        
+        resultado[np.abs(resultado) < 1e-15] += complex(1e-15, 1e-15)
+        return resultado
+    
+    escalar_con_derivada, vectorizada_con_derivada = compilar_derivada(expr_sympy, z)
+    
+    return FuncionCompilada(
+        expresion_normalizada=expr_limpia,
+        expr_sympy=expr_sympy,
+        escalar=funcion_rapida if nucleo_escalar is not None else funcion_segura,
+        vectorizada=funcion_vectorizada_segura,
+        escalar_con_derivada=escalar_con_derivada,
+        vectorizada_con_derivada=vectorizada_con_derivada,
+        backend=backend
+    )
+
+# DETECCIÓN DE CICLOS
+class DetectorCiclos:
+    """Detección incremental de ciclos sobre una ventana circular de errores con sumas acumuladas."""
+    
+    def __init__(self, ventana: int = 10):
+        self.ventana = int(ventana)
+        self.total = 0
+        self._errores = [0.0] * self.ventana
+        self._difs = [0.0] * (self.ventana - 1)
+        self._pares = [0] * (self.ventana - 2)
+        self._suma = 0.0
+        self._suma_cuad = 0.0
+        self._acumulado = 0.0
+        self._cambios = 0
+        self._signo_previo = 0
+    
+    def agregar(self, error: float):
+        ventana = self.ventana
+        total = self.total
+        
+        if total > 0:
+            dif = error - self._errores[(total - 1) % ventana]
+            pos = (total - 1) % (ventana - 1)
+            if total >= ventana:
+                saliente = self._difs[pos]
+                self._suma -= saliente
+                self._suma_cuad -= saliente * saliente
+            self._difs[pos] = dif
+            self._suma += dif
+            self._suma_cuad += dif * dif
+            self._acumulado += dif * dif
+            
+            signo = int(dif > 0) - int(dif < 0)
+            if total > 1:
+                par = abs(signo - self._signo_previo)
+                pos_par = (total - 2) % (ventana - 2)
+                if total >= ventana:
+                    self._cambios -= self._pares[pos_par]
+                self._pares[pos_par] = par
+                self._cambios += par
+            self._signo_previo = signo
+        
+        self._errores[total % ventana] = error
+        self.total = total + 1
+    
+    def _varianza_baja(self) -> bool:
+        n = self.ventana - 1
+        varianza = self._suma_cuad / n - (self._suma / n) ** 2
+        if varianza - 1e-12 * self._acumulado / n > 1e-20:
+            return False
+        
+        self._suma = sum(self._difs)
+        self._suma_cuad = sum(d * d for d in self._difs)
+        self._acumulado = self._suma_cuad
+        media = self._suma / n
+        varianza = sum((d - media) ** 2 for d in self._difs) / n
+        return math.sqrt(varianza) < 1e-10
+    
+    def hay_ciclo(self) -> bool:
+        if self.total < self.ventana:
+            return False
+        
+        primero = self._errores[self.total % self.ventana]
+        ultimo = self._errores[(self.total - 1) % self.ventana]
+        if abs(ultimo - primero) / (primero + 1e-15) < 0.01:
+            return True
+        
+        if self._varianza_baja():
+            return True
+        
+        return self._cambios > self.ventana * 0.8
+
+class DetectorCiclosLote:
+    """Misma detección que DetectorCiclos aplicada a muchos carriles en paralelo."""
+    
+    def __init__(self, carriles: int, ventana: int = 10):
+        self.ventana = int(ventana)
+        self.total = 0
+        self._errores = np.zeros((carriles, self.ventana))
+        self._difs = np.zeros((carriles, self.ventana - 1))
+        self._pares = np.zeros((carriles, self.ventana - 2))
+        self._suma = np.zeros(carriles)
+        self._suma_cuad = np.zeros(carriles)
+        self._acumulado = np.zeros(carriles)
+        self._cambios = np.zeros(carriles)
+        self._signo_previo = np.zeros(carriles)
+    
+    def agregar(self, errores: np.ndarray):
+        ventana = self.ventana
+        total = self.total
+        
+        if total > 0:
+            dif = errores - self._errores[:, (total - 1) % ventana]
+            pos = (total - 1) % (ventana - 1)
+            if total >= ventana:
+                saliente = self._difs[:, pos]
+                self._suma -= saliente
+                self._suma_cuad -= saliente * saliente
+            self._difs[:, pos] = dif
+            self._suma += dif
+            self._suma_cuad += dif * dif
+            self._acumulado += dif * dif
+            
+            signo = np.sign(dif)
+            if total > 1:
+                par = np.abs(signo - self._signo_previo)
+                pos_par = (total - 2) % (ventana - 2)
+                if total >= ventana:
+                    self._cambios -= self._pares[:, pos_par]
+                self._pares[:, pos_par] = par
+                self._cambios += par
+            self._signo_previo = signo
+        
+        self._errores[:, total % ventana] = errores
+        self.total = total + 1
+    
+    def hay_ciclo(self) -> np.ndarray:
+        if self.total < self.ventana:
+            return np.zeros(self._suma.size, dtype=bool)
+        
+        primero = self._errores[:, self.total % self.ventana]
+        ultimo = self._errores[:, (self.total - 1) % self.ventana]
+        estancado = np.abs(ultimo - primero) / (primero + 1e-15) < 0.01
+        
+        n = self.ventana - 1
+        varianza = self._suma_cuad / n - (self._suma / n) ** 2
+        dudoso = varianza - 1e-12 * self._acumulado / n <= 1e-20
+        varianza_baja = np.zeros_like(estancado)
+        if dudoso.any():
+            difs = self._difs[dudoso]
+            self._suma[dudoso] = difs.sum(axis=1)
+            self._suma_cuad[dudoso] = (difs * difs).sum(axis=1)
+            self._acumulado[dudoso] = self._suma_cuad[dudoso]
+            varianza_baja[dudoso] = np.std(difs, axis=1) < 1e-10
+        
+        return estancado | varianza_baja | (self._cambios > self.ventana * 0.8)
+    
+    def filtrar(self, mascara: np.ndarray):
+        self._errores = self._errores[mascara]
+        self._difs = self._difs[mascara]
+        self._pares = self._pares[mascara]
+        self._suma = self._suma[mascara]
+        self._suma_cuad = self._suma_cuad[mascara]
+        self._acumulado = self._acumulado[mascara]
+        self._cambios = self._cambios[mascara]
+        self._signo_previo = self._signo_previo[mascara]
+
+# RENDERIZADO DE VISUALIZACIONES
+EJECUTOR_VISUALIZACIONES = ThreadPoolExecutor(max_workers=2, thread_name_prefix='visualizacion')
+
 class SecanteComplejoAvanzado:
     def __init__(self, 
                  expresion_funcion: str,
                  tol: float = 1e-12,
                  max_iter: int = 200,
                  estrategia_ciclos: str = 'perturbacion_hibrida',
-                 usar_derivada_numerica: bool = False):
+                 usar_derivada_numerica: bool = False,
+                 metodo: str = 'secante',
+                 max_historial: int = 1000,
+                 max_bytes_historial: int = 64 * 1024 * 1024):
         self.expresion_funcion = expresion_funcion
         self.tol = seguro_float(tol, 1e-12)
         self.max_iter = int(max_iter)
         self.estrategia_ciclos = estrategia_ciclos
         self.usar_derivada_numerica = bool(usar_derivada_numerica)
+        self.metodo = metodo
         
-        self.funcion = self._parsear_funcion(expresion_funcion)
+        self.funcion_compilada = self._parsear_funcion(expresion_funcion)
+        self.funcion = self.funcion_compilada.escalar
+        self.funcion_vectorizada = self.funcion_compilada.vectorizada
         
-        self.historial_ejecuciones = []
-        self.raices_encontradas = []
+        self.historial_ejecuciones = HistorialEjecuciones(
+            max_ejecuciones=max_historial,
+            max_bytes=max_bytes_historial
+        )
+        self.raices_encontradas = RegistroRaices(0.01, campo_contador='contador')
         self.estadisticas = {
             'ejecuciones_totales': 0,
             'convergencias_exitosas': 0,
             'tiempo_promedio': 0.0
         }
+        self.visualizaciones = OrderedDict()
+        self.max_visualizaciones = 32
+        self._lock_visualizaciones = threading.Lock()
         self._configurar_estrategias()
+        self._configurar_metodos()
     
-    def _parsear_funcion(self, expresion: str) -> Callable[[complex], complex]:
+    def _parsear_funcion(self, expresion: str) -> FuncionCompilada:
         try:
-            expresion = expresion.strip()
-            
-            caracteres_peligrosos = ['import', 'exec', 'eval', '__', 'open', 'file']
-            for peligroso in caracteres_peligrosos:
-                if peligroso in expresion.lower():
-                    raise ValueError(f"Expresión contiene término no permitido")
-            
-            expr_limpia = expresion.replace('^', '**')
-            
-            if 'z' not in expr_limpia:
-                expr_limpia = expr_limpia.replace('x', 'z').replace('X', 'z')
-            
-            z = symbols('z')
-            expr_sympy = parse_expr(expr_limpia)
-            
-            expr_lamdified = sp.lambdify(z, expr_sympy, modules=['numpy', 'cmath'])
-            
-            def funcion_segura(z_val: complex) -> complex:
-                try:
-                    if isinstance(z_val, (int, float)):
-                        z_val = complex(z_val)
-                    
-                    resultado = expr_lamdified(z_val)
-                    
-                    if resultado is None:
-                        return complex(1e-15, 1e-15)
-                    
-                    if isinstance(resultado, (int, float)):
-                        val = complex(resultado, 0.0)
-                        if abs(val) < 1e-15:
-                            val += complex(1e-15, 1e-15)
-                        return val
-                    elif isinstance(resultado, complex):
-                        if abs(resultado) < 1e-15:
-                            return resultado + complex(1e-15, 1e-15)
-                        return resultado
-                    else:
-                        try:
-                            val = complex(float(resultado), 0.0)
-                            return val if abs(val) > 1e-15 else val + complex(1e-15, 1e-15)
-                        except:
-                            return complex(1e-15, 1e-15)
-                            
-                except (ZeroDivisionError, OverflowError, ValueError, TypeError):
-                    return complex(1e-15, 1e-15)
-            
-            return funcion_segura
+            expr_limpia = normalizar_expresion(expresion)
+            return CACHE_FUNCIONES.obtener(expr_limpia, compilar_expresion)
             
         except Exception as e:
             logger.error(f"Error parseando función: {e}")
             def funcion_por_defecto(z: complex) -> complex:
                 val = complex(z.real**2 + z.imag**2 - 1, 0)
                 return val if abs(val) > 1e-15 else val + complex(1e-15, 1e-15)
-            return funcion_por_defecto
+            
+            def funcion_por_defecto_vectorizada(z_vals: np.ndarray) -> np.ndarray:
+                z_arr = np.asarray(z_vals, dtype=np.complex128)
+                val = (z_arr.real**2 + z_arr.imag**2 - 1).astype(np.complex128)
+                val[np.abs(val) < 1e-15] += complex(1e-15, 1e-15)
+                return val
+            return FuncionCompilada(
+                expresion_normalizada='',
+                expr_sympy=None,
+                escalar=funcion_por_defecto,
+                vectorizada=funcion_por_defecto_vectorizada
+            )
     
     def _configurar_estrategias(self):
         self.estrategias = {
@@ -271,7 +1254,8 @@ class SecanteComplejoAvanzado:
             'reset': self._estrategia_reset,
             'hibrido': self._estrategia_hibrido,
             'perturbacion_hibrida': self._estrategia_perturbacion_hibrida,
-            'adaptativa': self._estrategia_adaptativa
+            'adaptativa': self._estrategia_adaptativa,
+            'newton_secante': self._estrategia_newton_secante
         }
         self.contador_ciclos = 0
         self.umbral_perturbacion = 1e-8
@@ -332,24 +1316,132 @@ class SecanteComplejoAvanzado:
                               iteracion: int) -> Tuple[complex, complex, complex, complex]:
         return self._estrategia_perturbacion_hibrida(x0, x1, fx0, fx1, iteracion)
     
-    def _detectar_ciclo(self, errores: List[float], ventana: int = 10) -> bool:
-        if len(errores) < ventana:
-            return False
-        
-        ultimos = errores[-ventana:]
-        mejora_relativa = abs(ultimos[-1] - ultimos[0]) / (ultimos[0] + 1e-15)
-        if mejora_relativa < 0.01:
-            self.contador_ciclos += 1
-            return True
-        
-        diferencias = np.diff(ultimos)
-        if np.std(diferencias) < 1e-10:
-            self.contador_ciclos += 1
-            return True
-        
-        signos = np.sign(diferencias)
-        cambios_signo = np.sum(np.abs(np.diff(signos)))
-        if cambios_signo > ventana * 0.8:
+    def _estrategia_newton_secante(self, x0: complex, x1: complex, fx0: complex, fx1: complex,
+                                   iteracion: int) -> Tuple[complex, complex, complex, complex]:
+        # Sin perturbaciones periódicas: el cambio entre pasos de Newton y secante
+        # se decide en el bucle según el progreso, y los ciclos se tratan con reset
+        return x0, x1, fx0, fx1
+    
+    def _configurar_metodos(self):
+        # Cada método aporta un paso escalar y uno vectorizado; None deja la secante de dos puntos
+        self.metodos = {
+            'secante': (None, None),
+            'muller': (self._paso_muller, self._paso_muller_lote),
+            'iqi': (self._paso_iqi, self._paso_iqi_lote),
+            'steffensen': (self._paso_steffensen, self._paso_steffensen_lote)
+        }
+    
+    @staticmethod
+    def _paso_muller(x_ant, x0: complex, x1: complex, fx_ant, fx0: complex, fx1: complex,
+                     funcion: Callable) -> Optional[complex]:
+        """Muller: raíz de la parábola por los tres últimos puntos (orden ~1.84)."""
+        if x_ant is None:
+            return None
+        h1 = x0 - x_ant
+        h2 = x1 - x0
+        if abs(h1) < 1e-15 or abs(h2) < 1e-15 or abs(h1 + h2) < 1e-15:
+            return None
+        d1 = (fx0 - fx_ant) / h1
+        d2 = (fx1 - fx0) / h2
+        a = (d2 - d1) / (h2 + h1)
+        b = a * h2 + d2
+        # La raíz cuadrada compleja permite salir del eje real con semillas reales
+        raiz_disc = cmath.sqrt(b * b - 4 * a * fx1)
+        denominador = b + raiz_disc if abs(b + raiz_disc) >= abs(b - raiz_disc) else b - raiz_disc
+        if abs(denominador) < 1e-15:
+            return None
+        x_next = x1 - 2 * fx1 / denominador
+        return x_next if cmath.isfinite(x_next) else None
+    
+    @staticmethod
+    def _paso_iqi(x_ant, x0: complex, x1: complex, fx_ant, fx0: complex, fx1: complex,
+                  funcion: Callable) -> Optional[complex]:
+        """Interpolación cuadrática inversa sobre los tres últimos puntos (orden ~1.84)."""
+        if x_ant is None:
+            return None
+        d01 = fx_ant - fx0
+        d02 = fx_ant - fx1
+        d12 = fx0 - fx1
+        if min(abs(d01), abs(d02), abs(d12)) < 1e-15:
+            return None
+        x_next = (x_ant * fx0 * fx1 / (d01 * d02)
+                  - x0 * fx_ant * fx1 / (d01 * d12)
+                  + x1 * fx_ant * fx0 / (d02 * d12))
+        return x_next if cmath.isfinite(x_next) else None
+    
+    @staticmethod
+    def _paso_steffensen(x_ant, x0: complex, x1: complex, fx_ant, fx0: complex, fx1: complex,
+                         funcion: Callable) -> Optional[complex]:
+        """Steffensen: pendiente con incremento f(x), acotado lejos de la raíz (orden 2)."""
+        limite = 1e-2 * (1 + abs(x1))
+        h = fx1 if abs(fx1) <= limite else fx1 * (limite / abs(fx1))
+        if abs(h) < 1e-300:
+            return None
+        pendiente = (funcion(x1 + h) - fx1) / h
+        if abs(pendiente) < 1e-15:
+            return None
+        x_next = x1 - fx1 / pendiente
+        return x_next if cmath.isfinite(x_next) else None
+    
+    @staticmethod
+    def _paso_muller_lote(x_ant: np.ndarray, x0: np.ndarray, x1: np.ndarray, fx_ant: np.ndarray,
+                          fx0: np.ndarray, fx1: np.ndarray,
+                          funcion: Callable) -> Tuple[np.ndarray, np.ndarray]:
+        with np.errstate(all='ignore'):
+            h1 = x0 - x_ant
+            h2 = x1 - x0
+            d1 = (fx0 - fx_ant) / h1
+            d2 = (fx1 - fx0) / h2
+            a = (d2 - d1) / (h2 + h1)
+            b = a * h2 + d2
+            raiz_disc = np.sqrt(b * b - 4 * a * fx1)
+            denominador = np.where(np.abs(b + raiz_disc) >= np.abs(b - raiz_disc),
+                                   b + raiz_disc, b - raiz_disc)
+            x_next = x1 - 2 * fx1 / denominador
+        valido = (np.isfinite(x_next) & (np.abs(h1) > 1e-15) & (np.abs(h2) > 1e-15)
+                  & (np.abs(denominador) > 1e-15))
+        return x_next, valido
+    
+    @staticmethod
+    def _paso_iqi_lote(x_ant: np.ndarray, x0: np.ndarray, x1: np.ndarray, fx_ant: np.ndarray,
+                       fx0: np.ndarray, fx1: np.ndarray,
+                       funcion: Callable) -> Tuple[np.ndarray, np.ndarray]:
+        with np.errstate(all='ignore'):
+            d01 = fx_ant - fx0
+            d02 = fx_ant - fx1
+            d12 = fx0 - fx1
+            x_next = (x_ant * fx0 * fx1 / (d01 * d02)
+                      - x0 * fx_ant * fx1 / (d01 * d12)
+                      + x1 * fx_ant * fx0 / (d02 * d12))
+        valido = (np.isfinite(x_next) & (np.abs(d01) > 1e-15) & (np.abs(d02) > 1e-15)
+                  & (np.abs(d12) > 1e-15))
+        return x_next, valido
+    
+    @staticmethod
+    def _paso_steffensen_lote(x_ant: np.ndarray, x0: np.ndarray, x1: np.ndarray, fx_ant: np.ndarray,
+                              fx0: np.ndarray, fx1: np.ndarray,
+                              funcion: Callable) -> Tuple[np.ndarray, np.ndarray]:
+        with np.errstate(all='ignore'):
+            limite = 1e-2 * (1 + np.abs(x1))
+            modulo = np.abs(fx1)
+            h = np.where(modulo <= limite, fx1, fx1 * (limite / modulo))
+            h = np.where(np.abs(h) > 1e-300, h, 1.0)
+            pendiente = (funcion(x1 + h) - fx1) / h
+            x_next = x1 - fx1 / pendiente
+        valido = np.isfinite(x_next) & (np.abs(pendiente) > 1e-15)
+        return x_next, valido
+    
+    def _derivada(self, f: Callable, z):
+        """Derivada analítica si f es la función compilada; numérica en otro caso."""
+        compilada = self.funcion_compilada
+        if f is self.funcion and compilada.escalar_con_derivada is not None:
+            return compilada.escalar_con_derivada(z)[1]
+        if f is self.funcion_vectorizada and compilada.vectorizada_con_derivada is not None:
+            return compilada.vectorizada_con_derivada(z)[1]
+        return self._calcular_derivada_numerica(f, z)
+    
+    def _detectar_ciclo(self, detector: DetectorCiclos) -> bool:
+        if detector.hay_ciclo():
             self.contador_ciclos += 1
             return True
         
@@ -370,8 +1462,23 @@ class SecanteComplejoAvanzado:
                         x0_imag,
                         x1_real, 
                         x1_imag,
-                        id_ejecucion: Optional[str] = None) -> Dict[str, Any]:
-        
+                        id_ejecucion: Optional[str] = None,
+                        formato: str = 'json') -> Dict[str, Any]:
+        for evento in self.iterar_secante(x0_real, x0_imag, x1_real, x1_imag,
+                                          id_ejecucion=id_ejecucion, eventos=False,
+                                          formato=formato):
+            pass
+        return evento['resultado']
+    
+    def iterar_secante(self, 
+                       x0_real,
+                       x0_imag,
+                       x1_real, 
+                       x1_imag,
+                       id_ejecucion: Optional[str] = None,
+                       eventos: bool = True,
+                       formato: str = 'json') -> Iterator[Dict[str, Any]]:
+        """Versión generadora del método: emite un evento por iteración y el resultado al final."""
         inicio = time.time()
         
         x0 = seguro_complex(x0_real, x0_imag)
@@ -387,147 +1494,202 @@ class SecanteComplejoAvanzado:
             fx0 = complex(-1.0, 0.0)
             fx1 = complex(1.0, 0.0)
         
-        trayectoria = [
-            PuntoComplejo.from_complex(x0), 
-            PuntoComplejo.from_complex(x1)
-        ]
+        capacidad = self.max_iter + 2
+        trayectoria = np.empty(capacidad, dtype=np.complex128)
+        errores = np.empty(capacidad, dtype=np.float64)
+        errores_relativos = np.empty(capacidad, dtype=np.float64)
         
-        errores = [
-            max(seguro_float(abs(fx0), 1.0, 1e-15), 1e-15),
-            max(seguro_float(abs(fx1), 1.0, 1e-15), 1e-15)
-        ]
+        trayectoria[0] = x0
+        trayectoria[1] = x1
+        errores[0] = max(seguro_float(abs(fx0), 1.0, 1e-15), 1e-15)
+        errores[1] = max(seguro_float(abs(fx1), 1.0, 1e-15), 1e-15)
+        n_puntos = 2
+        n_relativos = 0
+        z_anterior = x1
+        
+        detector = DetectorCiclos()
+        detector.agregar(float(errores[0]))
+        detector.agregar(float(errores[1]))
         
-        errores_relativos = []
         ciclos_detectados = 0
         convergio = False
         raiz_final = x1
         iteracion_final = 0
         
+        if eventos:
+            yield {
+                'tipo': 'inicio',
+                'id_ejecucion': id_ejecucion,
+                'puntos': [PuntoComplejo.from_complex(x0).to_dict(),
+                           PuntoComplejo.from_complex(x1).to_dict()],
+                'errores': errores[:2].tolist()
+            }
+        
         estrategia_func = self.estrategias.get(
             self.estrategia_ciclos, 
             self._estrategia_perturbacion_hibrida
         )
+        tol = self.tol
+        funcion = self.funcion
+        
+        con_derivada = self.funcion_compilada.escalar_con_derivada
+        hibrido = self.estrategia_ciclos == 'newton_secante' and con_derivada is not None
+        if hibrido:
+            fx1, dfx1 = con_derivada(x1)
+            usar_newton = True
+        
+        paso_metodo = self.metodos.get(self.metodo, (None, None))[0]
+        x_ant = fx_ant = None
         
         for k in range(1, self.max_iter + 1):
             try:
                 x0, x1, fx0, fx1 = estrategia_func(x0, x1, fx0, fx1, k)
                 
                 denominador = fx1 - fx0
-                denominador_abs = abs(denominador)
                 
-                if denominador_abs < 1e-15:
-                    if self.usar_derivada_numerica:
-                        try:
-                            derivada = self._calcular_derivada_numerica(self.funcion, x1)
-                            if abs(derivada) > 1e-15:
-                                x_next = x1 - fx1 / derivada
-                            else:
+                x_next = None
+                if hibrido and usar_newton and abs(dfx1) > 1e-15:
+                    x_next = x1 - fx1 / dfx1
+                elif paso_metodo is not None:
+                    x_next = paso_metodo(x_ant, x0, x1, fx_ant, fx0, fx1, funcion)
+                
+                if x_next is None:
+                    if abs(denominador) < 1e-15:
+                        if self.usar_derivada_numerica:
+                            try:
+                                derivada = self._derivada(funcion, x1)
+                                if abs(derivada) > 1e-15:
+                                    x_next = x1 - fx1 / derivada
+                                else:
+                                    x_next = (x0 + x1) / 2
+                            except:
                                 x_next = (x0 + x1) / 2
-                        except:
-                            x_next = (x0 + x1) / 2
+                        else:
+                            angulo = np.random.uniform(0, 2*np.pi)
+                            perturbacion = cmath.rect(1e-8, angulo)
+                            x_next = (x0 + x1) / 2 + perturbacion
                     else:
-                        angulo = np.random.uniform(0, 2*np.pi)
-                        perturbacion = cmath.rect(1e-8, angulo)
-                        x_next = (x0 + x1) / 2 + perturbacion
-                else:
-                    try:
-                        x_next = x1 - fx1 * (x1 - x0) / denominador
-                    except ZeroDivisionError:
-                        x_next = (x0 + x1) / 2
+                        try:
+                            x_next = x1 - fx1 * (x1 - x0) / denominador
+                        except ZeroDivisionError:
+                            x_next = (x0 + x1) / 2
                 
                 try:
-                    fx_next = self.funcion(x_next)
+                    if hibrido:
+                        fx_next, dfx_next = con_derivada(x_next)
+                    else:
+                        fx_next = funcion(x_next)
                     if not isinstance(fx_next, (int, float, complex)):
                         fx_next = complex(1e-15, 1e-15)
                 except Exception:
                     fx_next = complex(1e-15, 1e-15)
+                    dfx_next = 0j
                 
                 try:
-                    error_actual = float(abs(complex(fx_next)))
-                    
-                    if math.isnan(error_actual) or math.isinf(error_actual):
+                    error_actual = float(abs(fx_next))
+                    if error_actual != error_actual or error_actual == math.inf:
                         error_actual = 1.0
-                    elif error_actual == 0:
-                        error_actual = 1e-15
                     elif error_actual < 1e-15:
-                        error_actual = max(error_actual, 1e-15)
-                        
+                        error_actual = 1e-15
                 except:
                     error_actual = 1.0
                 
-                trayectoria.append(PuntoComplejo.from_complex(x_next))
-                errores.append(error_actual)
+                if hibrido:
+                    # Newton mientras reduzca el error; si se estanca, secante hasta que vuelva a progresar
+                    error_previo = float(errores[n_puntos - 1])
+                    usar_newton = (error_actual <= 0.9 * error_previo if usar_newton
+                                   else error_actual < 0.5 * error_previo)
                 
-                if k > 0 and len(trayectoria) > 1:
-                    try:
-                        z_actual = trayectoria[-1].to_complex()
-                        z_anterior = trayectoria[-2].to_complex()
-                        
-                        if abs(z_anterior) > 1e-15:
-                            error_rel = abs((z_actual - z_anterior) / z_anterior)
-                        else:
-                            error_rel = abs(z_actual - z_anterior)
-                        
-                        error_rel = max(seguro_float(error_rel, 1e-15, 1e-15), 1e-15)
-                        errores_relativos.append(error_rel)
-                        
-                    except:
-                        errores_relativos.append(1e-15)
+                trayectoria[n_puntos] = x_next
+                errores[n_puntos] = error_actual
+                n_puntos += 1
+                detector.agregar(error_actual)
+                
+                try:
+                    if abs(z_anterior) > 1e-15:
+                        error_rel = float(abs((x_next - z_anterior) / z_anterior))
+                    else:
+                        error_rel = float(abs(x_next - z_anterior))
+                    if error_rel != error_rel or error_rel == math.inf or error_rel < 1e-15:
+                        error_rel = 1e-15
+                except:
+                    error_rel = 1e-15
+                errores_relativos[n_relativos] = error_rel
+                n_relativos += 1
+                z_anterior = x_next
+                
+                if eventos:
+                    yield {
+                        'tipo': 'iteracion',
+                        'iteracion': k,
+                        'z': PuntoComplejo.from_complex(x_next).to_dict(),
+                        'error': float(error_actual),
+                        'error_relativo': float(error_rel)
+                    }
                 
-                if error_actual < self.tol:
+                if error_actual < tol:
                     convergio = True
                     raiz_final = x_next
                     iteracion_final = k
-                    
-                    if error_actual == 0:
-                        error_actual = 1e-15
-                        errores[-1] = error_actual
                     break
                 
-                if k > 10 and self._detectar_ciclo(errores):
+                if k > 10 and self._detectar_ciclo(detector):
                     ciclos_detectados += 1
+                    if eventos:
+                        yield {
+                            'tipo': 'ciclo',
+                            'iteracion': k,
+                            'ciclos_detectados': ciclos_detectados
+                        }
                     try:
                         x0, x1, fx0, fx1 = self._estrategia_reset(x0, x1, fx0, fx1, k)
                     except:
                         x0 = complex(np.random.uniform(-2, 2), np.random.uniform(-2, 2))
                         x1 = complex(np.random.uniform(-2, 2), np.random.uniform(-2, 2))
-                        fx0 = self.funcion(x0)
-                        fx1 = self.funcion(x1)
+                        fx0 = funcion(x0)
+                        fx1 = funcion(x1)
+                    if hibrido:
+                        fx1, dfx1 = con_derivada(x1)
+                    x_ant = fx_ant = None
                     continue
                 
+                x_ant, fx_ant = x0, fx0
                 x0, x1 = x1, x_next
                 fx0, fx1 = fx1, fx_next
+                if hibrido:
+                    dfx1 = dfx_next
                 
             except Exception:
+                x_ant = fx_ant = None
                 x0 = complex(0.5, 0.5)
                 x1 = complex(1.0, 0.0)
                 fx0 = complex(-1.0, 0.0)
                 fx1 = complex(1.0, 0.0)
+                if hibrido:
+                    fx1, dfx1 = con_derivada(x1)
         
         tiempo_total = max(time.time() - inicio, 0.001)
         
+        trayectoria = trayectoria[:n_puntos]
+        errores = errores[:n_puntos]
+        errores_relativos = errores_relativos[:n_relativos]
+        reales = seguro_float_array(trayectoria.real)
+        imaginarios = seguro_float_array(trayectoria.imag)
+        
         tasa_reduccion_error = 1.0
         velocidad_convergencia = 0.0
         
-        if len(errores) > 1:
-            try:
-                error_inicial = max(errores[0], 1e-15)
-                error_final = max(errores[-1], 1e-15)
-                
-                if error_final > 0:
-                    tasa_reduccion_error = error_inicial / error_final
-                    tasa_reduccion_error = max(tasa_reduccion_error, 1.0)
-                    
-                    if iteracion_final > 0 and error_inicial > error_final:
-                        velocidad_convergencia = iteracion_final / np.log(error_inicial/error_final)
-            except:
-                pass
+        error_inicial = max(float(errores[0]), 1e-15)
+        error_final = max(float(errores[-1]), 1e-15)
+        tasa_reduccion_error = max(error_inicial / error_final, 1.0)
+        if iteracion_final > 0 and error_inicial > error_final:
+            velocidad_convergencia = iteracion_final / math.log(error_inicial / error_final)
         
-        analisis_convergencia = self._analizar_convergencia(errores, trayectoria)
+        analisis_convergencia = self._analizar_convergencia(errores, reales + 1j * imaginarios)
         
-        error_final_val = seguro_float(errores[-1] if errores else 1.0, 1e-15, 1e-15)
+        error_final_val = seguro_float(errores[-1], 1e-15, 1e-15)
         error_relativo_final_val = seguro_float(
-            errores_relativos[-1] if errores_relativos else 1e-15, 
+            errores_relativos[-1] if n_relativos else 1e-15, 
             1e-15, 
             1e-15
         )
@@ -540,7 +1702,7 @@ class SecanteComplejoAvanzado:
             raiz=PuntoComplejo.from_complex(raiz_final),
             iteraciones=iteracion_final if convergio else self.max_iter,
             convergio=convergio,
-            trayectoria=trayectoria,
+            trayectoria=reales + 1j * imaginarios,
             error_final=error_final_val,
             tiempo_ejecucion=seguro_float(tiempo_total, 0.1, 0.001),
             configuracion={
@@ -548,10 +1710,11 @@ class SecanteComplejoAvanzado:
                 'tol': seguro_float(self.tol, 1e-12, 1e-15),
                 'max_iter': int(self.max_iter),
                 'estrategia_ciclos': self.estrategia_ciclos,
-                'usar_derivada_numerica': self.usar_derivada_numerica
+                'usar_derivada_numerica': self.usar_derivada_numerica,
+                'metodo': self.metodo
             },
-            errores_iteracion=[seguro_float(e, 1e-15, 1e-15) for e in errores],
-            errores_relativos=[seguro_float(e, 1e-15, 1e-15) for e in errores_relativos],
+            errores_iteracion=errores,
+            errores_relativos=errores_relativos,
             ciclos_detectados=ciclos_detectados,
             tipo_convergencia=analisis_convergencia.get('tipo', 'no_determinado'),
             ratio_convergencia=seguro_float(analisis_convergencia.get('ratio_promedio', 1.0), 1.0, 1e-15),
@@ -561,49 +1724,316 @@ class SecanteComplejoAvanzado:
             orden_aproximado=seguro_float(analisis_convergencia.get('orden_estimado', 1.0), 1.0, 1e-15)
         )
         
-        self.historial_ejecuciones.append(resultado)
+        self.historial_ejecuciones.agregar(resultado)
         self.estadisticas['ejecuciones_totales'] += 1
         
         if convergio:
             self.estadisticas['convergencias_exitosas'] += 1
             self._registrar_raiz_unica(resultado.raiz)
         
-        if self.historial_ejecuciones:
-            tiempos = [r.tiempo_ejecucion for r in self.historial_ejecuciones]
-            self.estadisticas['tiempo_promedio'] = seguro_float(
-                np.mean(tiempos) if tiempos else 0.0,
-                0.1,
-                0.001
+        self.estadisticas['tiempo_promedio'] = seguro_float(
+            self.historial_ejecuciones.tiempo_promedio,
+            0.1,
+            0.001
+        )
+        
+        yield {'tipo': 'resultado', 'resultado': resultado.to_dict(formato)}
+    
+    def _estrategia_lote(self, x0: np.ndarray, x1: np.ndarray, fx0: np.ndarray, fx1: np.ndarray,
+                         iteracion: int, funcion: Optional[Callable] = None
+                         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        funcion = funcion or self.funcion_vectorizada
+        n = x1.size
+        estrategia = self.estrategia_ciclos if self.estrategia_ciclos in self.estrategias \
+            else 'perturbacion_hibrida'
+        
+        if estrategia == 'perturbacion' and iteracion % 10 == 0:
+            u = self.umbral_perturbacion
+            x1 = x1 + np.random.uniform(-u, u, n) + 1j * np.random.uniform(-u, u, n)
+            fx1 = funcion(x1)
+        elif estrategia == 'reset' and iteracion > 20 and iteracion % 15 == 0:
+            x0 = np.random.uniform(-2, 2, n) + 1j * np.random.uniform(-2, 2, n)
+            x1 = np.random.uniform(-2, 2, n) + 1j * np.random.uniform(-2, 2, n)
+            fx0 = funcion(x0)
+            fx1 = funcion(x1)
+        elif estrategia == 'hibrido':
+            if iteracion % 12 == 0:
+                u = self.umbral_perturbacion / 10
+                x1 = x1 + np.random.uniform(-u, u, n) + 1j * np.random.uniform(-u, u, n)
+                fx1 = funcion(x1)
+            if iteracion > 30 and iteracion % 25 == 0:
+                x0 = (x0 + x1) / 2
+                fx0 = funcion(x0)
+        elif estrategia in ('perturbacion_hibrida', 'adaptativa') and iteracion % 8 == 0:
+            magnitud = self.umbral_perturbacion * (1 + iteracion/100)
+            x1 = x1 + magnitud * np.exp(1j * np.random.uniform(0, 2*np.pi, n))
+            fx1 = funcion(x1)
+        
+        return x0, x1, fx0, fx1
+    
+    @staticmethod
+    def _errores_lote(fx: np.ndarray) -> np.ndarray:
+        errores = np.abs(fx)
+        errores[~np.isfinite(errores)] = 1.0
+        return np.maximum(errores, 1e-15)
+    
+    def ejecutar_secante_lote(self, x0s, x1s, ventana: int = 10,
+                              funcion: Optional[Callable] = None,
+                              registrar: bool = True) -> Dict[str, np.ndarray]:
+        """Avanza todas las semillas (x0, x1) a la vez con operaciones vectorizadas."""
+        funcion = funcion or self.funcion_vectorizada
+        con_derivada = self.funcion_compilada.vectorizada_con_derivada
+        hibrido = (self.estrategia_ciclos == 'newton_secante' and con_derivada is not None
+                   and funcion is self.funcion_vectorizada)
+        x0 = np.array(x0s, dtype=np.complex128).ravel()
+        x1 = np.array(x1s, dtype=np.complex128).ravel()
+        n = x0.size
+        
+        raices = x1.copy()
+        convergio = np.zeros(n, dtype=bool)
+        iteraciones = np.full(n, self.max_iter, dtype=np.int64)
+        errores_finales = np.ones(n, dtype=np.float64)
+        ciclos_detectados = np.zeros(n, dtype=np.int64)
+        
+        fx0 = funcion(x0)
+        fx1 = funcion(x1)
+        if hibrido:
+            fx1, dfx1 = con_derivada(x1)
+            usar_newton = np.ones(n, dtype=bool)
+        
+        paso_metodo = self.metodos.get(self.metodo, (None, None))[1]
+        if paso_metodo is not None:
+            # NaN marca los carriles que aún no tienen un tercer punto
+            x_ant = np.full(n, np.nan, dtype=np.complex128)
+            fx_ant = np.full(n, np.nan, dtype=np.complex128)
+        
+        detector = DetectorCiclosLote(n, ventana)
+        detector.agregar(self._errores_lote(fx0))
+        errores_finales[:] = self._errores_lote(fx1)
+        detector.agregar(errores_finales)
+        
+        activos = np.arange(n)
+        
+        for k in range(1, self.max_iter + 1):
+            if activos.size == 0:
+                break
+            
+            x0, x1, fx0, fx1 = self._estrategia_lote(x0, x1, fx0, fx1, k, funcion)
+            
+            denominador = fx1 - fx0
+            colapsado = np.abs(denominador) < 1e-15
+            with np.errstate(all='ignore'):
+                x_next = x1 - fx1 * (x1 - x0) / np.where(colapsado, 1.0, denominador)
+            
+            if colapsado.any():
+                medio = (x0[colapsado] + x1[colapsado]) / 2
+                if self.usar_derivada_numerica:
+                    with np.errstate(all='ignore'):
+                        derivada = self._derivada(funcion, x1[colapsado])
+                        paso_newton = x1[colapsado] - fx1[colapsado] / derivada
+                    x_next[colapsado] = np.where(np.abs(derivada) > 1e-15, paso_newton, medio)
+                else:
+                    angulos = np.random.uniform(0, 2*np.pi, medio.size)
+                    x_next[colapsado] = medio + 1e-8 * np.exp(1j * angulos)
+            
+            if paso_metodo is not None:
+                x_metodo, valido = paso_metodo(x_ant, x0, x1, fx_ant, fx0, fx1, funcion)
+                x_next = np.where(valido, x_metodo, x_next)
+            
+            if hibrido:
+                newton = usar_newton & (np.abs(dfx1) > 1e-15)
+                with np.errstate(all='ignore'):
+                    x_next = np.where(newton, x1 - fx1 / np.where(newton, dfx1, 1.0), x_next)
+                fx_next, dfx_next = con_derivada(x_next)
+            else:
+                fx_next = funcion(x_next)
+            error_actual = self._errores_lote(fx_next)
+            
+            if hibrido:
+                error_previo = self._errores_lote(fx1)
+                usar_newton = np.where(usar_newton, error_actual <= 0.9 * error_previo,
+                                       error_actual < 0.5 * error_previo)
+            
+            detector.agregar(error_actual)
+            errores_finales[activos] = error_actual
+            
+            hecho = error_actual < self.tol
+            if hecho.any():
+                raices[activos[hecho]] = x_next[hecho]
+                convergio[activos[hecho]] = True
+                iteraciones[activos[hecho]] = k
+            
+            ciclo = np.zeros(activos.size, dtype=bool)
+            if k > 10:
+                ciclo = detector.hay_ciclo() & ~hecho
+                
+                if ciclo.any():
+                    ciclos_detectados[activos[ciclo]] += 1
+                    if k > 20 and k % 15 == 0:
+                        m = int(ciclo.sum())
+                        x0[ciclo] = np.random.uniform(-2, 2, m) + 1j * np.random.uniform(-2, 2, m)
+                        x1[ciclo] = np.random.uniform(-2, 2, m) + 1j * np.random.uniform(-2, 2, m)
+                        fx0[ciclo] = funcion(x0[ciclo])
+                        fx1[ciclo] = funcion(x1[ciclo])
+                        if hibrido:
+                            dfx1[ciclo] = con_derivada(x1[ciclo])[1]
+                    if paso_metodo is not None:
+                        # Como en el bucle escalar, un ciclo descarta el tercer punto aunque no
+                        # haya reinicio: el siguiente paso vuelve a ser de secante
+                        x_ant[ciclo] = np.nan
+                        fx_ant[ciclo] = np.nan
+            
+            avanzar = ~hecho & ~ciclo
+            if paso_metodo is not None:
+                x_ant = np.where(avanzar, x0, x_ant)
+                fx_ant = np.where(avanzar, fx0, fx_ant)
+            x0 = np.where(avanzar, x1, x0)
+            fx0 = np.where(avanzar, fx1, fx0)
+            x1 = np.where(avanzar, x_next, x1)
+            fx1 = np.where(avanzar, fx_next, fx1)
+            if hibrido:
+                dfx1 = np.where(avanzar, dfx_next, dfx1)
+            
+            if hecho.any():
+                seguir = ~hecho
+                x0, x1, fx0, fx1 = x0[seguir], x1[seguir], fx0[seguir], fx1[seguir]
+                if hibrido:
+                    dfx1, usar_newton = dfx1[seguir], usar_newton[seguir]
+                if paso_metodo is not None:
+                    x_ant, fx_ant = x_ant[seguir], fx_ant[seguir]
+                detector.filtrar(seguir)
+                activos = activos[seguir]
+        
+        raices[~np.isfinite(raices)] = 0.0
+        
+        if registrar:
+            self.estadisticas['ejecuciones_totales'] += n
+            self.estadisticas['convergencias_exitosas'] += int(convergio.sum())
+            self.raices_encontradas.insertar_lote(
+                raices[convergio],
+                lambda z: {'raiz': PuntoComplejo.from_complex(z), 'fecha_descubrimiento': time.time()}
             )
         
-        return resultado.to_dict()
+        return {
+            'raices': raices,
+            'convergio': convergio,
+            'iteraciones': iteraciones,
+            'errores_finales': errores_finales,
+            'ciclos_detectados': ciclos_detectados
+        }
     
-    def _analizar_convergencia(self, errores: List[float], 
-                              trayectoria: List[PuntoComplejo]) -> Dict[str, Any]:
-        if len(errores) < 4:
-            return {'tipo': 'insuficientes_datos', 'ratio_promedio': 1.0, 'orden_estimado': 1.0}
+    def ejecutar_lote(self, x0s, x1s, ids: Optional[List[str]] = None,
+                      trayectorias: bool = False, procesos: bool = False,
+                      max_workers: Optional[int] = None, formato: str = 'json') -> Dict[str, Any]:
+        """Ejecuta muchas semillas en una sola llamada y devuelve un resumen por semilla."""
+        inicio = time.time()
+        x0 = np.asarray(x0s, dtype=np.complex128).ravel()
+        x1 = np.asarray(x1s, dtype=np.complex128).ravel()
+        n = x0.size
+        
+        if trayectorias:
+            campos = ('id_ejecucion', 'raiz', 'convergio', 'iteraciones', 'error_final',
+                      'ciclos_detectados', 'trayectoria')
+            resultados = []
+            for i in range(n):
+                resultado = self.ejecutar_secante(
+                    x0[i].real, x0[i].imag, x1[i].real, x1[i].imag,
+                    id_ejecucion=ids[i] if ids else None,
+                    formato=formato
+                )
+                resultados.append({campo: resultado[campo] for campo in campos})
+            convergencias = sum(1 for r in resultados if r['convergio'])
+        else:
+            if procesos and n > 1:
+                max_workers = workers_solicitados(max_workers)
+                configuracion = {
+                    'tol': self.tol,
+                    'max_iter': self.max_iter,
+                    'estrategia_ciclos': self.estrategia_ciclos,
+                    'usar_derivada_numerica': self.usar_derivada_numerica,
+                    'metodo': self.metodo
+                }
+                partes = np.array_split(np.arange(n), min(n, max_workers * 4))
+                bloques = list(ejecutar_en_pool(
+                    ejecutar_lote_bloque,
+                    [(self.expresion_funcion, configuracion, x0[parte], x1[parte]) for parte in partes],
+                    max_workers
+                ))
+                lote = {clave: np.concatenate([b[clave] for b in bloques]) for clave in bloques[0]}
+                
+                self.estadisticas['ejecuciones_totales'] += n
+                self.estadisticas['convergencias_exitosas'] += int(lote['convergio'].sum())
+                self.raices_encontradas.insertar_lote(
+                    lote['raices'][lote['convergio']],
+                    lambda z: {'raiz': PuntoComplejo.from_complex(z), 'fecha_descubrimiento': time.time()}
+                )
+            else:
+                lote = self.ejecutar_secante_lote(x0, x1)
+            
+            errores = seguro_float_array(lote['errores_finales'], 1.0)
+            convergencias = int(lote['convergio'].sum())
+            
+            if formato == 'json':
+                resultados = [
+                    {
+                        'raiz': {'real': real, 'imag': imag},
+                        'convergio': convergio,
+                        'iteraciones': iteraciones,
+                        'error_final': error,
+                        'ciclos_detectados': ciclos
+                    }
+                    for real, imag, convergio, iteraciones, error, ciclos in zip(
+                        lote['raices'].real.tolist(), lote['raices'].imag.tolist(),
+                        lote['convergio'].tolist(), lote['iteraciones'].tolist(),
+                        errores.tolist(), lote['ciclos_detectados'].tolist()
+                    )
+                ]
+                if ids:
+                    for resultado, id_semilla in zip(resultados, ids):
+                        resultado['id'] = id_semilla
+            else:
+                resultados = {
+                    'raiz': trayectoria_columnar(lote['raices'], formato),
+                    'convergio': lote['convergio'],
+                    'iteraciones': lote['iteraciones'],
+                    'error_final': serie_columnar(errores, formato),
+                    'ciclos_detectados': lote['ciclos_detectados']
+                }
+                if ids:
+                    resultados['id'] = ids
         
-        ratios = []
-        ordenes = []
+        return {
+            'n_semillas': int(n),
+            'convergencias': int(convergencias),
+            'tasa_convergencia': seguro_float(convergencias / n if n else 0.0, 0.0, 0.0),
+            'tiempo_total': seguro_float(time.time() - inicio),
+            'formato': formato,
+            'resultados': resultados
+        }
+    
+    def memoria_estimada(self) -> int:
+        return (4096 + self.historial_ejecuciones.bytes_estimados +
+                150 * 1024 * len(self.visualizaciones))
+    
+    def _analizar_convergencia(self, errores: np.ndarray, 
+                              trayectoria: np.ndarray) -> Dict[str, Any]:
+        errores = np.asarray(errores, dtype=np.float64)
+        if errores.size < 4:
+            return {'tipo': 'insuficientes_datos', 'ratio_promedio': 1.0, 'orden_estimado': 1.0}
         
-        for i in range(2, len(errores) - 1):
-            if errores[i-1] > 0 and errores[i] > 0 and errores[i-2] > 0:
-                try:
-                    ratio = abs(np.log(errores[i]) / np.log(errores[i-1]))
-                    ratios.append(seguro_float(ratio, 1.0))
-                    
-                    if errores[i-1] > 0 and errores[i-2] > 0:
-                        orden = np.log(abs(errores[i] / errores[i-1])) / np.log(abs(errores[i-1] / errores[i-2]))
-                        if not math.isnan(orden) and not math.isinf(orden):
-                            ordenes.append(seguro_float(orden, 1.0))
-                except:
-                    continue
+        with np.errstate(all='ignore'):
+            logs = np.log(errores[:-1])
+            ratios = seguro_float_array(np.abs(logs[2:] / logs[1:-1]), 1.0)
+            
+            log_cocientes = np.log(np.abs(errores[1:-1] / errores[:-2]))
+            ordenes = log_cocientes[1:] / log_cocientes[:-1]
+            ordenes = seguro_float_array(ordenes[np.isfinite(ordenes)], 1.0)
         
-        if not ratios:
+        if ratios.size == 0:
             return {'tipo': 'no_determinado', 'ratio_promedio': 1.0, 'orden_estimado': 1.0}
         
-        ratio_promedio = seguro_float(np.mean(ratios) if ratios else 1.0, 1.0)
-        orden_estimado = seguro_float(np.mean(ordenes) if ordenes else 1.0, 1.0)
+        ratio_promedio = seguro_float(np.mean(ratios), 1.0)
+        orden_estimado = seguro_float(np.mean(ordenes) if ordenes.size else 1.0, 1.0)
         
         if orden_estimado >= 1.5 and orden_estimado < 1.7:
             tipo = 'cuadrática_aproximada'
@@ -623,58 +2053,50 @@ class SecanteComplejoAvanzado:
             'tipo': tipo,
             'ratio_promedio': ratio_promedio,
             'orden_estimado': orden_estimado,
-            'ratios_individuales': ratios,
-            'ordenes_individuales': ordenes,
+            'ratios_individuales': ratios.tolist(),
+            'ordenes_individuales': ordenes.tolist(),
             'error_inicial': seguro_float(errores[0], 1.0),
             'error_final': seguro_float(errores[-1], 1e-15)
         }
     
-    def _analizar_oscilaciones(self, trayectoria: List[PuntoComplejo]) -> int:
-        if len(trayectoria) < 3:
+    def _analizar_oscilaciones(self, trayectoria: np.ndarray) -> int:
+        trayectoria = np.asarray(trayectoria, dtype=np.complex128)
+        if trayectoria.size < 3:
             return 0
         
-        cambios = 0
-        for i in range(1, len(trayectoria) - 1):
-            vec_ant = complex(
-                trayectoria[i].real - trayectoria[i-1].real,
-                trayectoria[i].imag - trayectoria[i-1].imag
-            )
-            vec_sig = complex(
-                trayectoria[i+1].real - trayectoria[i].real,
-                trayectoria[i+1].imag - trayectoria[i].imag
-            )
-            
-            if abs(vec_ant) > 1e-10 and abs(vec_sig) > 1e-10:
-                cos_angulo = (vec_ant.real * vec_sig.real + vec_ant.imag * vec_sig.imag) / \
-                            (abs(vec_ant) * abs(vec_sig))
-                
-                if cos_angulo < -0.5:
-                    cambios += 1
+        pasos = np.diff(trayectoria)
+        vec_ant, vec_sig = pasos[:-1], pasos[1:]
+        norma_ant, norma_sig = np.abs(vec_ant), np.abs(vec_sig)
+        validos = (norma_ant > 1e-10) & (norma_sig > 1e-10)
         
-        return cambios
+        cos_angulo = (vec_ant[validos] * np.conj(vec_sig[validos])).real / \
+                     (norma_ant[validos] * norma_sig[validos])
+        return int(np.count_nonzero(cos_angulo < -0.5))
     
-    def _registrar_raiz_unica(self, raiz: PuntoComplejo, 
-                            distancia_minima: float = 0.01) -> bool:
-        for raiz_existente in self.raices_encontradas:
-            distancia = abs(complex(raiz.real, raiz.imag) - 
-                          complex(raiz_existente['raiz'].real, raiz_existente['raiz'].imag))
-            
-            if distancia < distancia_minima:
-                raiz_existente['contador'] += 1
-                return False
-        
-        self.raices_encontradas.append({
-            'raiz': raiz,
-            'contador': 1,
-            'fecha_descubrimiento': time.time()
-        })
-        return True
+    def _registrar_raiz_unica(self, raiz: PuntoComplejo) -> bool:
+        return self.raices_encontradas.insertar(
+            complex(raiz.real, raiz.imag),
+            raiz=raiz,
+            fecha_descubrimiento=time.time()
+        )
     
     def buscar_raices_multiples(self, 
                                region: Dict[str, float],
                                n_puntos: int = 30,
                                distancia_minima: float = 0.05,
-                               paralelo: bool = True) -> Dict[str, Any]:
+                               paralelo: bool = True,
+                               vectorizado: bool = True,
+                               procesos: bool = False,
+                               max_workers: Optional[int] = None,
+                               adaptativo: bool = False,
+                               max_semillas: Optional[int] = None,
+                               profundidad_max: int = 6,
+                               raices_objetivo: Optional[int] = None,
+                               contar_raices: bool = False,
+                               semillas_companion: bool = True,
+                               deflacion: bool = False,
+                               progreso: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Busca raíces en la región; `progreso(puntos, raices)` puede lanzar para interrumpirla."""
         inicio = time.time()
         
         x_min = seguro_float(region.get('x_min', -2), -2)
@@ -684,13 +2106,26 @@ class SecanteComplejoAvanzado:
         n_puntos = int(n_puntos)
         distancia_minima = seguro_float(distancia_minima, 0.05)
         paralelo = bool(paralelo)
+        vectorizado = bool(vectorizado)
+        procesos = bool(procesos)
+        max_workers = workers_solicitados(max_workers)
+        adaptativo = bool(adaptativo)
+        max_semillas = int(max_semillas) if max_semillas else max(n_puntos, 5) ** 2
+        profundidad = 0
         
         xs = np.linspace(x_min, x_max, max(n_puntos, 5))
         ys = np.linspace(y_min, y_max, max(n_puntos, 5))
         
-        raices_encontradas = []
+        raices_encontradas = RegistroRaices(distancia_minima)
         puntos_procesados = 0
         
+        def registrar_raiz(raiz_compleja, error, iteraciones, ciclos_detectados):
+            return fusionar_raiz(raices_encontradas, raiz_compleja, error, iteraciones, ciclos_detectados)
+        
+        def notificar(puntos: int):
+            if progreso is not None:
+                progreso(int(puntos), len(raices_encontradas))
+        
         def procesar_punto(i, j):
             x0 = complex(float(xs[i]), float(ys[j]))
             x1 = complex(float(xs[i]) + 0.02, float(ys[j]) + 0.02)
@@ -704,42 +2139,160 @@ class SecanteComplejoAvanzado:
             if resultado['convergio']:
                 raiz_real = seguro_float(resultado['raiz']['real'])
                 raiz_imag = seguro_float(resultado['raiz']['imag'])
-                raiz_compleja = complex(raiz_real, raiz_imag)
-                
-                es_unica = True
-                for raiz_exist in raices_encontradas:
-                    dist = abs(raiz_compleja - raiz_exist['complejo'])
-                    if dist < distancia_minima:
-                        es_unica = False
-                        raiz_exist['veces_encontrada'] += 1
-                        break
-                
-                if es_unica:
-                    raices_encontradas.append({
-                        'complejo': raiz_compleja,
-                        'real': raiz_real,
-                        'imag': raiz_imag,
-                        'error': seguro_float(resultado['error_final']),
-                        'iteraciones': int(resultado['iteraciones']),
-                        'ciclos_detectados': int(resultado.get('ciclos_detectados', 0)),
-                        'veces_encontrada': 1
-                    })
+                registrar_raiz(
+                    complex(raiz_real, raiz_imag),
+                    resultado['error_final'],
+                    resultado['iteraciones'],
+                    resultado.get('ciclos_detectados', 0)
+                )
             
             return 1
         
-        if paralelo:
+        def raices_dentro() -> int:
+            return sum(1 for r in raices_encontradas
+                       if x_min <= r['real'] <= x_max and y_min <= r['imag'] <= y_max)
+        
+        autovalores = self.raices_polinomio() if semillas_companion else None
+        if autovalores is not None and autovalores.size:
+            # Solo se pulen los autovalores de la región más un margen, y solo se registran
+            # las raíces pulidas que caen dentro de la región
+            margen_x, margen_y = 0.1 * (x_max - x_min), 0.1 * (y_max - y_min)
+            cercanos = autovalores[(autovalores.real >= x_min - margen_x) &
+                                   (autovalores.real <= x_max + margen_x) &
+                                   (autovalores.imag >= y_min - margen_y) &
+                                   (autovalores.imag <= y_max + margen_y)]
+            if cercanos.size:
+                lote = self.ejecutar_secante_lote(cercanos, cercanos * (1 + 1e-7) + 1e-7)
+                for idx in np.flatnonzero(lote['convergio']):
+                    raiz = complex(lote['raices'][idx])
+                    if x_min <= raiz.real <= x_max and y_min <= raiz.imag <= y_max:
+                        registrar_raiz(raiz, lote['errores_finales'][idx],
+                                       lote['iteraciones'][idx], lote['ciclos_detectados'][idx])
+                puntos_procesados += int(cercanos.size)
+            notificar(puntos_procesados)
+            
+            if raices_objetivo is None:
+                en_region = cercanos[(cercanos.real >= x_min) & (cercanos.real <= x_max) &
+                                     (cercanos.imag >= y_min) & (cercanos.imag <= y_max)]
+                raices_objetivo = RegistroRaices(distancia_minima).insertar_lote(en_region)
+        
+        # Para polinomios la matriz compañera ya da el conteo exacto sin multiplicidades
+        raices_esperadas = None
+        if contar_raices and autovalores is None:
+            raices_esperadas = self.contar_raices_region(x_min, x_max, y_min, y_max)
+            if raices_objetivo is None and raices_esperadas and raices_esperadas > 0:
+                raices_objetivo = raices_esperadas
+        
+        if raices_objetivo is not None and raices_dentro() >= raices_objetivo:
+            # Las semillas de la matriz compañera ya cubren todas las raíces de la región
+            pass
+        elif deflacion:
+            puntos_procesados, profundidad = self._buscar_raices_deflacion(
+                x_min, x_max, y_min, y_max,
+                raices_encontradas=raices_encontradas,
+                registrar_raiz=registrar_raiz,
+                max_semillas=max_semillas,
+                raices_objetivo=raices_objetivo,
+                notificar=notificar
+            )
+        elif adaptativo:
+            puntos_procesados, profundidad = self._buscar_raices_adaptativa(
+                x_min, x_max, y_min, y_max,
+                n_inicial=max(2, n_puntos // 8),
+                distancia_minima=distancia_minima,
+                max_semillas=max_semillas,
+                profundidad_max=int(profundidad_max),
+                raices_objetivo=raices_objetivo,
+                registrar_raiz=registrar_raiz,
+                notificar=notificar
+            )
+        elif procesos:
+            malla_x, malla_y = np.meshgrid(xs, ys, indexing='ij')
+            semillas = (malla_x + 1j * malla_y).ravel()
+            bloques = np.array_split(semillas, min(semillas.size, max_workers * 4))
+            configuracion = {
+                'tol': self.tol,
+                'max_iter': self.max_iter,
+                'estrategia_ciclos': self.estrategia_ciclos,
+                'usar_derivada_numerica': self.usar_derivada_numerica,
+                'metodo': self.metodo
+            }
+            
+            resultados_bloques = ejecutar_en_pool(
+                buscar_raices_bloque,
+                [(self.expresion_funcion, configuracion, bloque, distancia_minima, vectorizado)
+                 for bloque in bloques],
+                max_workers
+            )
+            
+            convergencias = 0
+            try:
+                for bloque, (raices_bloque, convergidas_bloque) in zip(bloques, resultados_bloques):
+                    convergencias += convergidas_bloque
+                    raices_encontradas.fusionar(raices_bloque)
+                    puntos_procesados += int(bloque.size)
+                    notificar(puntos_procesados)
+            finally:
+                resultados_bloques.close()
+            
+            puntos_procesados = int(semillas.size)
+            self.estadisticas['ejecuciones_totales'] += puntos_procesados
+            self.estadisticas['convergencias_exitosas'] += convergencias
+            for raiz in raices_encontradas:
+                self._registrar_raiz_unica(PuntoComplejo.from_complex(raiz['complejo']))
+        elif vectorizado:
+            malla_x, malla_y = np.meshgrid(xs, ys, indexing='ij')
+            semillas = (malla_x + 1j * malla_y).ravel()
+            # Con un objetivo conocido se recorre la malla en pasadas intercaladas
+            # (de gruesa a fina) para poder parar en cuanto aparecen todas las raíces
+            pasadas = 8 if raices_objetivo or progreso is not None else 1
+            # Cada lote tiene como mucho MAX_SEMILLAS_POR_PASADA semillas, para que los
+            # búferes por semilla de ejecutar_secante_lote no crezcan con la malla
+            pasadas = max(pasadas, -(-semillas.size // MAX_SEMILLAS_POR_PASADA))
+            
+            for pasada in range(pasadas):
+                bloque = semillas[pasada::pasadas]
+                lote = self.ejecutar_secante_lote(bloque, bloque + complex(0.02, 0.02))
+                
+                for idx in np.flatnonzero(lote['convergio']):
+                    raiz = complex(lote['raices'][idx])
+                    registrar_raiz(
+                        complex(seguro_float(raiz.real), seguro_float(raiz.imag)),
+                        lote['errores_finales'][idx],
+                        lote['iteraciones'][idx],
+                        lote['ciclos_detectados'][idx]
+                    )
+                puntos_procesados += int(bloque.size)
+                notificar(puntos_procesados)
+                
+                if raices_objetivo and raices_dentro() >= raices_objetivo:
+                    break
+        elif paralelo:
             with ThreadPoolExecutor(max_workers=4) as executor:
                 futures = []
                 for i in range(len(xs)):
                     for j in range(len(ys)):
                         futures.append(executor.submit(procesar_punto, i, j))
                 
-                for future in futures:
-                    puntos_procesados += future.result()
+                try:
+                    for future in futures:
+                        puntos_procesados += future.result()
+                        notificar(puntos_procesados)
+                except BaseException:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
         else:
             for i in range(len(xs)):
                 for j in range(len(ys)):
                     puntos_procesados += procesar_punto(i, j)
+                notificar(puntos_procesados)
+        
+        if raices_esperadas and not procesos:
+            if raices_dentro() < raices_esperadas:
+                puntos_procesados += self._completar_por_subregiones(
+                    x_min, x_max, y_min, y_max, raices_encontradas, registrar_raiz
+                )
+                notificar(puntos_procesados)
         
         tiempo_total = seguro_float(time.time() - inicio, 0.1)
         
@@ -759,6 +2312,7 @@ class SecanteComplejoAvanzado:
             'raices': raices_serializadas,
             'total_raices': len(raices_serializadas),
             'puntos_procesados': puntos_procesados,
+            'raices_esperadas': raices_esperadas,
             'tiempo_busqueda': tiempo_total,
             'region': {
                 'x_min': x_min,
@@ -769,81 +2323,534 @@ class SecanteComplejoAvanzado:
             'configuracion': {
                 'n_puntos': n_puntos,
                 'distancia_minima': distancia_minima,
-                'paralelo': paralelo
+                'paralelo': paralelo,
+                'vectorizado': vectorizado,
+                'procesos': procesos,
+                'max_workers': max_workers if procesos else None,
+                'adaptativo': adaptativo,
+                'max_semillas': max_semillas if adaptativo else None,
+                'profundidad_alcanzada': profundidad if adaptativo and not deflacion else None,
+                'contar_raices': bool(contar_raices),
+                'semillas_companion': autovalores is not None,
+                'deflacion': bool(deflacion),
+                'rondas_deflacion': profundidad if deflacion else None
+            }
+        }
+    
+    def raices_polinomio(self, grado_max: int = 200) -> Optional[np.ndarray]:
+        """Autovalores de la matriz compañera si la función es un polinomio de grado <= grado_max."""
+        coeficientes = self.funcion_compilada.coeficientes
+        # np.roots es O(n^3): por encima de grado_max la malla es más barata
+        if coeficientes is None or coeficientes.size - 1 > grado_max:
+            return None
+        return np.roots(coeficientes)
+    
+    def contar_raices_region(self, x_min: float, x_max: float, y_min: float, y_max: float,
+                             puntos_por_lado: int = 256, max_puntos_por_lado: int = 16384) -> Optional[int]:
+        """Ceros menos polos dentro del rectángulo según el principio del argumento.
+        
+        Devuelve None si hay un cero o polo sobre el contorno o si el muestreo no converge.
+        """
+        n = int(puntos_por_lado)
+        while n <= max_puntos_por_lado:
+            t = np.linspace(0.0, 1.0, n, endpoint=False)
+            contorno = np.concatenate([
+                (x_min + (x_max - x_min) * t) + 1j * y_min,
+                x_max + 1j * (y_min + (y_max - y_min) * t),
+                (x_max - (x_max - x_min) * t) + 1j * y_max,
+                x_min + 1j * (y_max - (y_max - y_min) * t)
+            ])
+            valores = self.funcion_vectorizada(contorno)
+            if not np.all(np.isfinite(valores)) or np.abs(valores).min() < 1e-12:
+                return None
+            
+            with np.errstate(all='ignore'):
+                saltos = np.angle(np.roll(valores, -1) / valores)
+            if np.abs(saltos).max() < np.pi / 3:
+                return int(round(saltos.sum() / (2 * np.pi)))
+            n *= 2
+        return None
+    
+    def _completar_por_subregiones(self, x_min: float, x_max: float, y_min: float, y_max: float,
+                                   raices_encontradas: 'RegistroRaices', registrar_raiz: Callable,
+                                   n_puntos: int = 8, profundidad: int = 0,
+                                   profundidad_max: int = 4) -> int:
+        """Busca en los cuadrantes donde el conteo indica raíces que aún no se han encontrado."""
+        mx, my = (x_min + x_max) / 2, (y_min + y_max) / 2
+        puntos_procesados = 0
+        
+        for qx0, qx1, qy0, qy1 in ((x_min, mx, y_min, my), (mx, x_max, y_min, my),
+                                   (x_min, mx, my, y_max), (mx, x_max, my, y_max)):
+            esperadas = self.contar_raices_region(qx0, qx1, qy0, qy1)
+            if not esperadas or esperadas < 0:
+                continue
+            
+            def halladas():
+                return sum(1 for r in raices_encontradas
+                           if qx0 <= r['real'] <= qx1 and qy0 <= r['imag'] <= qy1)
+            
+            if halladas() >= esperadas:
+                continue
+            
+            malla_x, malla_y = np.meshgrid(np.linspace(qx0, qx1, n_puntos),
+                                           np.linspace(qy0, qy1, n_puntos), indexing='ij')
+            semillas = (malla_x + 1j * malla_y).ravel()
+            lote = self.ejecutar_secante_lote(semillas, semillas + complex(0.02, 0.02))
+            for idx in np.flatnonzero(lote['convergio']):
+                registrar_raiz(complex(lote['raices'][idx]), lote['errores_finales'][idx],
+                               lote['iteraciones'][idx], lote['ciclos_detectados'][idx])
+            puntos_procesados += int(semillas.size)
+            
+            if halladas() < esperadas and profundidad < profundidad_max:
+                puntos_procesados += self._completar_por_subregiones(
+                    qx0, qx1, qy0, qy1, raices_encontradas, registrar_raiz,
+                    n_puntos, profundidad + 1, profundidad_max
+                )
+        
+        return puntos_procesados
+    
+    @staticmethod
+    def _asignar_cercanas(z: np.ndarray, conocidas: List[complex], distancia_minima: float) -> np.ndarray:
+        """Índice de la raíz conocida más cercana a cada punto, o -1 si ninguna está a distancia_minima."""
+        indices = np.full(z.size, -1, dtype=np.int32)
+        if not conocidas or z.size == 0:
+            return indices
+        referencias = np.asarray(conocidas, dtype=np.complex128)
+        # Bloques acotados para que la matriz de distancias no crezca con píxeles × raíces
+        paso = max(1, 2**21 // referencias.size)
+        for inicio in range(0, z.size, paso):
+            distancias = np.abs(z[inicio:inicio + paso, np.newaxis] - referencias[np.newaxis, :])
+            cercana = distancias.argmin(axis=1)
+            asignada = distancias[np.arange(cercana.size), cercana] < distancia_minima
+            indices[inicio:inicio + paso][asignada] = cercana[asignada]
+        return indices
+    
+    @staticmethod
+    def _indices_raices(lote: Dict[str, np.ndarray], conocidas: List[complex],
+                        distancia_minima: float, max_raices: Optional[int] = None) -> np.ndarray:
+        """Índice en `conocidas` de la raíz alcanzada por cada semilla (-1 si no converge)."""
+        indices = np.full(lote['raices'].size, -1, dtype=np.int32)
+        pendientes = np.flatnonzero(lote['convergio'] & np.isfinite(lote['raices']))
+        if pendientes.size == 0:
+            return indices
+        
+        z = lote['raices'][pendientes]
+        asignadas = SecanteComplejoAvanzado._asignar_cercanas(z, conocidas, distancia_minima)
+        libres = asignadas < 0
+        
+        # Agrupación por celdas de lado distancia_minima, de la más poblada a la menos, fusionando
+        # las que caen a menos de distancia_minima de una ya aceptada. Cada pasada añade al menos
+        # una raíz; los puntos en el borde de un grupo quedan para la siguiente
+        while libres.any() and (max_raices is None or len(conocidas) < max_raices):
+            posiciones = np.flatnonzero(libres)
+            z_libres = z[posiciones]
+            claves = (np.floor(z_libres.real / distancia_minima) +
+                      1j * np.floor(z_libres.imag / distancia_minima))
+            _, primeros, conteos = np.unique(claves, return_index=True, return_counts=True)
+            nuevas = []
+            for idx in primeros[np.argsort(-conteos, kind='stable')]:
+                candidata = complex(z_libres[idx])
+                if nuevas and np.min(np.abs(np.asarray(nuevas) - candidata)) < distancia_minima:
+                    continue
+                nuevas.append(candidata)
+                if max_raices is not None and len(conocidas) + len(nuevas) >= max_raices:
+                    break
+            
+            base = len(conocidas)
+            conocidas.extend(nuevas)
+            nuevas_asignadas = SecanteComplejoAvanzado._asignar_cercanas(z_libres, nuevas, distancia_minima)
+            asignadas[posiciones] = np.where(nuevas_asignadas >= 0, nuevas_asignadas + base, -1)
+            libres = asignadas < 0
+        
+        indices[pendientes] = asignadas
+        return indices
+    
+    def _buscar_raices_adaptativa(self, x_min: float, x_max: float, y_min: float, y_max: float,
+                                  n_inicial: int, distancia_minima: float, max_semillas: int,
+                                  profundidad_max: int, raices_objetivo: Optional[int],
+                                  registrar_raiz: Callable,
+                                  notificar: Optional[Callable[[int], None]] = None) -> Tuple[int, int]:
+        """Refina un quadtree de celdas, subdividiendo solo las que no convergen a una única raíz."""
+        conocidas = []
+        muestras = {}
+        
+        def puntos_celda(celda):
+            cx0, cy0, cx1, cy1 = celda
+            return [(cx0, cy0), (cx1, cy0), (cx0, cy1), (cx1, cy1), ((cx0 + cx1) / 2, (cy0 + cy1) / 2)]
+        
+        bordes_x = np.linspace(x_min, x_max, n_inicial + 1)
+        bordes_y = np.linspace(y_min, y_max, n_inicial + 1)
+        celdas = [(bordes_x[i], bordes_y[j], bordes_x[i + 1], bordes_y[j + 1])
+                  for i in range(n_inicial) for j in range(n_inicial)]
+        
+        profundidad = 0
+        niveles_sin_novedad = 0
+        while celdas:
+            nuevos = list(dict.fromkeys(
+                p for celda in celdas for p in puntos_celda(celda) if p not in muestras
+            ))
+            presupuesto = max_semillas - len(muestras)
+            agotado = len(nuevos) > presupuesto
+            if agotado:
+                # Las celdas vienen ordenadas por prioridad: se procesan las que quepan
+                nuevos = []
+                seleccionados = set()
+                for celda in celdas:
+                    faltan = [p for p in dict.fromkeys(puntos_celda(celda))
+                              if p not in muestras and p not in seleccionados]
+                    if len(nuevos) + len(faltan) > presupuesto:
+                        break
+                    nuevos.extend(faltan)
+                    seleccionados.update(faltan)
+            
+            raices_previas = len(conocidas)
+            if nuevos:
+                semillas = np.array([complex(x, y) for x, y in nuevos])
+                lote = self.ejecutar_secante_lote(semillas, semillas + complex(0.02, 0.02))
+                indices = self._indices_raices(lote, conocidas, distancia_minima)
+                for punto, indice in zip(nuevos, indices.tolist()):
+                    muestras[punto] = indice
+                for idx in np.flatnonzero(lote['convergio']):
+                    registrar_raiz(complex(lote['raices'][idx]), lote['errores_finales'][idx],
+                                   lote['iteraciones'][idx], lote['ciclos_detectados'][idx])
+                if notificar is not None:
+                    notificar(len(muestras))
+            
+            niveles_sin_novedad = niveles_sin_novedad + 1 if len(conocidas) == raices_previas else 0
+            if raices_objetivo is not None and sum(
+                    1 for z in conocidas
+                    if x_min <= z.real <= x_max and y_min <= z.imag <= y_max) >= raices_objetivo:
+                break
+            if agotado or profundidad >= profundidad_max or niveles_sin_novedad >= 2:
+                break
+            
+            candidatas = []
+            for celda in celdas:
+                etiquetas = {muestras.get(p, -1) for p in puntos_celda(celda)}
+                if len(etiquetas) > 1 or -1 in etiquetas:
+                    candidatas.append((len(etiquetas) + (-1 in etiquetas), celda))
+            candidatas.sort(key=lambda c: c[0], reverse=True)
+            
+            celdas = []
+            for _, (cx0, cy0, cx1, cy1) in candidatas:
+                mx, my = (cx0 + cx1) / 2, (cy0 + cy1) / 2
+                celdas.extend([(cx0, cy0, mx, my), (mx, cy0, cx1, my),
+                               (cx0, my, mx, cy1), (mx, my, cx1, cy1)])
+            profundidad += 1
+        
+        return len(muestras), profundidad
+    
+    def _buscar_raices_deflacion(self, x_min: float, x_max: float, y_min: float, y_max: float,
+                                 raices_encontradas: 'RegistroRaices', registrar_raiz: Callable,
+                                 max_semillas: int, raices_objetivo: Optional[int],
+                                 semillas_por_ronda: int = 4,
+                                 notificar: Optional[Callable[[int], None]] = None) -> Tuple[int, int]:
+        """Busca raíces sucesivas sobre f deflactada por las ya confirmadas."""
+        confirmadas = []
+        puntos_procesados = 0
+        rondas = 0
+        rondas_sin_novedad = 0
+        
+        while puntos_procesados + semillas_por_ronda <= max_semillas and rondas_sin_novedad < 3:
+            if raices_objetivo is not None and sum(
+                    1 for r in raices_encontradas
+                    if x_min <= r['real'] <= x_max and y_min <= r['imag'] <= y_max) >= raices_objetivo:
+                break
+            rondas += 1
+            
+            funcion = deflactar_funcion(self.funcion_vectorizada, confirmadas) if confirmadas else None
+            semillas = (np.random.uniform(x_min, x_max, semillas_por_ronda) +
+                        1j * np.random.uniform(y_min, y_max, semillas_por_ronda))
+            lote = self.ejecutar_secante_lote(semillas, semillas + complex(0.02, 0.02),
+                                              funcion=funcion, registrar=False)
+            puntos_procesados += semillas_por_ronda
+            if notificar is not None:
+                notificar(puntos_procesados)
+            
+            # f / prod(z - r_i) tiende a cero lejos de la región: esos "ceros" son espurios
+            margen_x, margen_y = (x_max - x_min) / 2, (y_max - y_min) / 2
+            candidatas = lote['raices'][lote['convergio']]
+            candidatas = candidatas[(candidatas.real >= x_min - margen_x) & (candidatas.real <= x_max + margen_x) &
+                                    (candidatas.imag >= y_min - margen_y) & (candidatas.imag <= y_max + margen_y)]
+            if candidatas.size == 0:
+                rondas_sin_novedad += 1
+                continue
+            
+            # Se pulen sobre f original para eliminar el error acumulado por la deflación
+            pulido = self.ejecutar_secante_lote(candidatas, candidatas * (1 + 1e-7) + 1e-7)
+            previas = np.asarray(confirmadas, dtype=np.complex128)
+            repetidas = set()
+            progreso = False
+            
+            for idx in np.flatnonzero(pulido['convergio']):
+                z = complex(pulido['raices'][idx])
+                dentro = x_min <= z.real <= x_max and y_min <= z.imag <= y_max
+                if registrar_raiz(z, pulido['errores_finales'][idx],
+                                  pulido['iteraciones'][idx], pulido['ciclos_detectados'][idx]):
+                    confirmadas.append(z)
+                    # Las raíces fuera de la región se deflactan pero no cuentan como avance
+                    progreso = progreso or dentro
+                elif previas.size:
+                    # Si f deflactada vuelve a anularse sobre una raíz confirmada, esta es múltiple
+                    cercana = int(np.abs(previas - candidatas[idx]).argmin())
+                    if (abs(previas[cercana] - candidatas[idx]) < raices_encontradas.distancia_minima
+                            and cercana not in repetidas):
+                        repetidas.add(cercana)
+                        confirmadas.append(complex(previas[cercana]))
+                        progreso = progreso or dentro
+            
+            rondas_sin_novedad = 0 if progreso else rondas_sin_novedad + 1
+        
+        return puntos_procesados, rondas
+    
+    def distancia_fusion(self) -> float:
+        """Distancia para fusionar extremos: las raíces múltiples solo se aproximan a ~sqrt(tol)."""
+        return min(max(1e3 * math.sqrt(self.tol), 1e-9), 1e-2)
+    
+    def tipo_iteraciones_cuencas(self) -> type:
+        return np.uint16 if self.max_iter < 2**16 else np.uint32
+    
+    def iterar_cuencas(self, region: Dict[str, float], ancho: int, alto: int,
+                       distancia_minima: Optional[float] = None,
+                       filas_por_bloque: Optional[int] = None,
+                       raices: Optional[List[complex]] = None,
+                       max_raices: int = MAX_RAICES_CUENCAS,
+                       descendente: bool = False) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+        """Recorre la malla por bloques de filas y asigna a cada píxel el índice de su raíz."""
+        x_min = seguro_float(region.get('x_min', -2), -2)
+        x_max = seguro_float(region.get('x_max', 2), 2)
+        y_min = seguro_float(region.get('y_min', -2), -2)
+        y_max = seguro_float(region.get('y_max', 2), 2)
+        filas_por_bloque = int(filas_por_bloque or max(1, 65536 // ancho))
+        distancia_minima = distancia_minima or self.distancia_fusion()
+        tipo_iteraciones = self.tipo_iteraciones_cuencas()
+        
+        xs = np.linspace(x_min, x_max, ancho)
+        ys = np.linspace(y_min, y_max, alto)
+        if descendente:
+            ys = ys[::-1]
+        conocidas = raices if raices is not None else []
+        
+        for fila in range(0, alto, filas_por_bloque):
+            semillas = (xs[np.newaxis, :] + 1j * ys[fila:fila + filas_por_bloque, np.newaxis]).ravel()
+            lote = self.ejecutar_secante_lote(semillas, semillas + complex(0.02, 0.02))
+            
+            indices = self._indices_raices(lote, conocidas, distancia_minima, max_raices)
+            iteraciones = np.minimum(lote['iteraciones'], np.iinfo(tipo_iteraciones).max).astype(tipo_iteraciones)
+            
+            filas = indices.size // ancho
+            yield fila, indices.reshape(filas, ancho), iteraciones.reshape(filas, ancho)
+    
+    def generar_cuencas(self, region: Dict[str, float], ancho: int = 256, alto: int = 256,
+                        distancia_minima: Optional[float] = None,
+                        filas_por_bloque: Optional[int] = None,
+                        max_raices: int = MAX_RAICES_CUENCAS) -> Dict[str, Any]:
+        inicio = time.time()
+        ancho = int(ancho)
+        alto = int(alto)
+        if ancho * alto > MAX_PIXELES_CUENCAS_ARRAYS:
+            raise ValueError(f'ancho × alto no puede superar {MAX_PIXELES_CUENCAS_ARRAYS} píxeles '
+                             f"con salida 'arrays'; use 'ndjson' o 'png'")
+        
+        raices = []
+        indices = np.empty((alto, ancho), dtype=np.int16 if max_raices < 2**15 else np.int32)
+        iteraciones = np.empty((alto, ancho), dtype=self.tipo_iteraciones_cuencas())
+        for fila, indices_bloque, iteraciones_bloque in self.iterar_cuencas(
+                region, ancho, alto, distancia_minima, filas_por_bloque, raices, max_raices):
+            indices[fila:fila + indices_bloque.shape[0]] = indices_bloque
+            iteraciones[fila:fila + iteraciones_bloque.shape[0]] = iteraciones_bloque
+        
+        return {
+            'ancho': ancho,
+            'alto': alto,
+            'raices': [PuntoComplejo.from_complex(z).to_dict() for z in raices],
+            'indices': indices,
+            'iteraciones': iteraciones,
+            'pixeles_convergidos': int((indices >= 0).sum()),
+            'tiempo_total': seguro_float(time.time() - inicio),
+            'region': {k: seguro_float(region.get(k, v), v)
+                       for k, v in (('x_min', -2), ('x_max', 2), ('y_min', -2), ('y_max', 2))}
+        }
+    
+    def eventos_cuencas(self, region: Dict[str, float], ancho: int = 256, alto: int = 256,
+                        distancia_minima: Optional[float] = None,
+                        filas_por_bloque: Optional[int] = None,
+                        max_raices: int = MAX_RAICES_CUENCAS,
+                        formato: str = 'json') -> Iterator[Dict[str, Any]]:
+        """Eventos 'bloque' con los índices e iteraciones de cada bloque de filas y un 'fin' con el resumen."""
+        inicio = time.time()
+        ancho = int(ancho)
+        alto = int(alto)
+        tipo_indices = '<i2' if max_raices < 2**15 else '<i4'
+        tipo_iteraciones = np.dtype(self.tipo_iteraciones_cuencas()).newbyteorder('<').str
+        
+        raices = []
+        enviadas = 0
+        pixeles_convergidos = 0
+        for fila, indices, iteraciones in self.iterar_cuencas(
+                region, ancho, alto, distancia_minima, filas_por_bloque, raices, max_raices):
+            pixeles_convergidos += int((indices >= 0).sum())
+            nuevas, enviadas = raices[enviadas:], len(raices)
+            yield {
+                'tipo': 'bloque',
+                'fila': fila,
+                'filas': int(indices.shape[0]),
+                # Solo las raíces descubiertas en este bloque; sus índices siguen a las anteriores
+                'raices_nuevas': [PuntoComplejo.from_complex(z).to_dict() for z in nuevas],
+                'indices': (serie_columnar(indices.ravel(), 'binario', tipo_indices)
+                            if formato == 'binario' else indices.ravel().tolist()),
+                'iteraciones': (serie_columnar(iteraciones.ravel(), 'binario', tipo_iteraciones)
+                                if formato == 'binario' else iteraciones.ravel().tolist())
             }
+        
+        yield {
+            'tipo': 'fin',
+            'ancho': ancho,
+            'alto': alto,
+            'raices': [PuntoComplejo.from_complex(z).to_dict() for z in raices],
+            'pixeles_convergidos': pixeles_convergidos,
+            'tiempo_total': seguro_float(time.time() - inicio)
         }
     
+    def colorear_cuencas(self, indices: np.ndarray, iteraciones: np.ndarray) -> np.ndarray:
+        """Colorea cada píxel según su raíz y lo oscurece con el número de iteraciones (RGB uint8)."""
+        paleta = colormaps['tab20'](np.arange(20))[:, :3]
+        rgb = paleta[np.maximum(indices, 0) % 20]
+        sombra = 1.0 - 0.75 * np.log1p(iteraciones) / np.log1p(max(self.max_iter, 1))
+        rgb *= sombra[..., np.newaxis]
+        rgb[indices < 0] = 0.0
+        return np.round(rgb * 255).astype(np.uint8)
+    
+    def iterar_png_cuencas(self, region: Dict[str, float], ancho: int = 256, alto: int = 256,
+                           distancia_minima: Optional[float] = None,
+                           filas_por_bloque: Optional[int] = None,
+                           max_raices: int = MAX_RAICES_CUENCAS) -> Iterator[bytes]:
+        """Codifica el PNG fila a fila mientras se calculan los bloques, sin la malla completa en memoria."""
+        def fragmento(tipo: bytes, datos: bytes) -> bytes:
+            return (struct.pack('>I', len(datos)) + tipo + datos +
+                    struct.pack('>I', zlib.crc32(tipo + datos) & 0xffffffff))
+        
+        ancho = int(ancho)
+        alto = int(alto)
+        yield b'\x89PNG\r\n\x1a\n' + fragmento(b'IHDR', struct.pack('>IIBBBBB', ancho, alto, 8, 2, 0, 0, 0))
+        
+        compresor = zlib.compressobj(6)
+        # El PNG empieza por la fila superior: se recorre la malla desde y_max
+        for _, indices, iteraciones in self.iterar_cuencas(
+                region, ancho, alto, distancia_minima, filas_por_bloque, None, max_raices, descendente=True):
+            rgb = self.colorear_cuencas(indices, iteraciones).reshape(indices.shape[0], ancho * 3)
+            # Cada fila lleva delante el byte de filtro 0 (sin filtro)
+            filas = np.hstack([np.zeros((rgb.shape[0], 1), dtype=np.uint8), rgb])
+            datos = compresor.compress(filas.tobytes())
+            if datos:
+                yield fragmento(b'IDAT', datos)
+        
+        yield fragmento(b'IDAT', compresor.flush()) + fragmento(b'IEND', b'')
+    
     def analizar_sensibilidad_ruido(self, 
                                    raiz_real,
                                    raiz_imag,
                                    niveles_ruido: List[float] = None,
-                                   muestras_por_nivel: int = 5) -> Dict[str, Any]:
+                                   muestras_por_nivel: int = 5,
+                                   semilla: Optional[int] = None,
+                                   detalle_por_nivel: int = 100,
+                                   tamano_bloque: int = 2**18) -> Dict[str, Any]:
+        """Monte Carlo de |f| alrededor de la raíz, evaluando todas las perturbaciones por bloques."""
+        inicio = time.time()
         raiz_real = seguro_float(raiz_real)
         raiz_imag = seguro_float(raiz_imag)
         
         if niveles_ruido is None:
             niveles_ruido = [1e-15, 1e-12, 1e-9, 1e-6, 1e-3]
-        else:
-            niveles_ruido = [seguro_float(n) for n in niveles_ruido]
+        niveles = seguro_float_array(niveles_ruido)
         
         muestras_por_nivel = int(muestras_por_nivel)
+        detalle_por_nivel = min(int(detalle_por_nivel), muestras_por_nivel)
+        if semilla is None:
+            semilla = int(np.random.SeedSequence().generate_state(1)[0])
+        rng = np.random.default_rng(semilla)
         
         raiz_original = complex(raiz_real, raiz_imag)
         valor_original = seguro_float(abs(self.funcion(raiz_original)), 1e-15)
         
-        resultados = []
-        estadisticas_nivel = {}
-        
-        for nivel in niveles_ruido:
-            nivel = seguro_float(nivel)
-            sensibilidades = []
-            valores_perturbados = []
+        total = niveles.size * muestras_por_nivel
+        # Estadísticas por nivel acumuladas bloque a bloque (fusión de medias y M2 de Chan),
+        # sin guardar todas las muestras
+        conteo = np.zeros(niveles.size, dtype=np.float64)
+        media = np.zeros(niveles.size, dtype=np.float64)
+        m2 = np.zeros(niveles.size, dtype=np.float64)
+        minimos = np.full(niveles.size, np.inf)
+        maximos = np.full(niveles.size, -np.inf)
+        detalle = []
+        
+        for desde in range(0, total, tamano_bloque):
+            indices = np.arange(desde, min(desde + tamano_bloque, total))
+            nivel_de = indices // muestras_por_nivel
+            escala = niveles[nivel_de]
+            perturbaciones = (rng.uniform(-1.0, 1.0, indices.size) * escala +
+                              1j * rng.uniform(-1.0, 1.0, indices.size) * escala)
             
-            for _ in range(muestras_por_nivel):
-                raiz_perturbada = raiz_original + complex(
-                    float(np.random.uniform(-nivel, nivel)),
-                    float(np.random.uniform(-nivel, nivel))
-                )
-                
-                valor_perturbado = seguro_float(abs(self.funcion(raiz_perturbada)), 1e-15)
-                
-                if valor_original > 0:
-                    sensibilidad = abs(valor_perturbado - valor_original) / valor_original
-                else:
-                    sensibilidad = abs(valor_perturbado)
-                
-                sensibilidades.append(seguro_float(sensibilidad))
-                valores_perturbados.append(seguro_float(valor_perturbado))
+            valores = seguro_float_array(np.abs(self.funcion_vectorizada(raiz_original + perturbaciones)),
+                                         1e-15)
+            sensibilidades = seguro_float_array(np.abs(valores - valor_original) / valor_original)
             
-            sensibilidad_promedio = seguro_float(np.mean(sensibilidades))
-            sensibilidad_std = seguro_float(np.std(sensibilidades))
+            conteo_bloque = np.bincount(nivel_de, minlength=niveles.size).astype(np.float64)
+            con_muestras = conteo_bloque > 0
+            media_bloque = np.zeros(niveles.size)
+            media_bloque[con_muestras] = (np.bincount(nivel_de, sensibilidades, niveles.size)[con_muestras]
+                                          / conteo_bloque[con_muestras])
+            m2_bloque = np.bincount(nivel_de, (sensibilidades - media_bloque[nivel_de])**2, niveles.size)
+            conteo_total = conteo + conteo_bloque
+            delta = media_bloque - media
+            with np.errstate(all='ignore'):
+                peso = np.where(con_muestras, conteo_bloque / np.maximum(conteo_total, 1), 0.0)
+            media += delta * peso
+            m2 += m2_bloque + delta**2 * conteo * peso
+            conteo = conteo_total
+            np.minimum.at(minimos, nivel_de, sensibilidades)
+            np.maximum.at(maximos, nivel_de, sensibilidades)
             
-            resultados_nivel = []
-            for i in range(muestras_por_nivel):
-                resultados_nivel.append(ResultadoSensibilidad(
+            en_detalle = np.flatnonzero(indices % muestras_por_nivel < detalle_por_nivel)
+            detalle.extend(
+                ResultadoSensibilidad(
                     nivel_ruido=nivel,
-                    sensibilidad=sensibilidades[i],
+                    sensibilidad=sensibilidad,
                     valor_original=valor_original,
-                    valor_perturbado=valores_perturbados[i],
-                    raiz_perturbada=PuntoComplejo.from_complex(
-                        raiz_original + complex(
-                            float(np.random.uniform(-nivel, nivel)),
-                            float(np.random.uniform(-nivel, nivel))
-                        )
-                    )
-                ))
-            
-            estadisticas_nivel[nivel] = {
-                'sensibilidad_promedio': sensibilidad_promedio,
-                'sensibilidad_std': sensibilidad_std,
-                'min': seguro_float(np.min(sensibilidades)),
-                'max': seguro_float(np.max(sensibilidades))
+                    valor_perturbado=valor,
+                    raiz_perturbada=PuntoComplejo.from_complex(raiz_original + perturbacion)
+                ).to_dict()
+                for nivel, sensibilidad, valor, perturbacion in zip(
+                    escala[en_detalle].tolist(),
+                    sensibilidades[en_detalle].tolist(),
+                    valores[en_detalle].tolist(),
+                    perturbaciones[en_detalle].tolist()
+                )
+            )
+        
+        estadisticas = {
+            'niveles': niveles,
+            'sensibilidad_promedio': seguro_float_array(media),
+            'sensibilidad_std': seguro_float_array(np.sqrt(m2 / np.maximum(conteo, 1))),
+            'min': seguro_float_array(minimos),
+            'max': seguro_float_array(maximos)
+        }
+        estadisticas_nivel = {
+            nivel: {
+                'sensibilidad_promedio': promedio,
+                'sensibilidad_std': std,
+                'min': minimo,
+                'max': maximo
             }
-            
-            resultados.extend([r.to_dict() for r in resultados_nivel])
+            for nivel, promedio, std, minimo, maximo in zip(
+                niveles.tolist(),
+                estadisticas['sensibilidad_promedio'].tolist(),
+                estadisticas['sensibilidad_std'].tolist(),
+                estadisticas['min'].tolist(),
+                estadisticas['max'].tolist()
+            )
+        }
         
-        sensibilidad_global = seguro_float(np.mean([s['sensibilidad_promedio'] 
-                                      for s in estadisticas_nivel.values()]))
+        sensibilidad_global = seguro_float(estadisticas['sensibilidad_promedio'].mean())
         
         if sensibilidad_global < 0.1:
             estabilidad = 'muy_estable'
@@ -860,26 +2867,53 @@ class SecanteComplejoAvanzado:
                 'imag': raiz_imag,
                 'valor_funcion': valor_original
             },
-            'resultados': resultados,
+            'resultados': detalle,
+            'total_muestras': int(total),
             'estadisticas_por_nivel': estadisticas_nivel,
+            'estadisticas': estadisticas,
             'clasificacion_estabilidad': estabilidad,
             'sensibilidad_global': sensibilidad_global,
+            'tiempo_total': seguro_float(time.time() - inicio),
             'configuracion': {
-                'niveles_ruido': niveles_ruido,
-                'muestras_por_nivel': muestras_por_nivel
+                'niveles_ruido': niveles.tolist(),
+                'muestras_por_nivel': muestras_por_nivel,
+                'detalle_por_nivel': detalle_por_nivel,
+                'semilla': semilla,
+                'distribucion': 'uniforme',
+                'perturbacion': 'real e imaginaria independientes en [-nivel, nivel]'
             }
         }
     
     def generar_visualizacion_trayectoria(self, 
-                                        trayectoria: List[PuntoComplejo],
+                                        trayectoria: Union[np.ndarray, List[PuntoComplejo]],
                                         raiz: PuntoComplejo,
                                         region: Optional[Dict[str, float]] = None,
-                                        titulo: str = "Trayectoria del Método de la Secante") -> str:
+                                        titulo: str = "Trayectoria del Método de la Secante",
+                                        errores: Optional[List[float]] = None) -> str:
+        try:
+            return base64.b64encode(
+                self.generar_png_trayectoria(trayectoria, raiz, region, titulo, errores)
+            ).decode('utf-8')
+        except Exception as e:
+            logger.error(f"Error generando visualización: {e}")
+            return ""
+    
+    def generar_png_trayectoria(self, 
+                                trayectoria: Union[np.ndarray, List[PuntoComplejo]],
+                                raiz: PuntoComplejo,
+                                region: Optional[Dict[str, float]] = None,
+                                titulo: str = "Trayectoria del Método de la Secante",
+                                errores: Optional[List[float]] = None) -> bytes:
         try:
-            fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+            fig = Figure(figsize=(14, 6))
+            axes = fig.subplots(1, 2)
             
-            reales = [float(p.real) for p in trayectoria]
-            imaginarios = [float(p.imag) for p in trayectoria]
+            if isinstance(trayectoria, np.ndarray):
+                reales = trayectoria.real.tolist()
+                imaginarios = trayectoria.imag.tolist()
+            else:
+                reales = [float(p.real) for p in trayectoria]
+                imaginarios = [float(p.imag) for p in trayectoria]
             
             ax1 = axes[0]
             
@@ -918,11 +2952,9 @@ class SecanteComplejoAvanzado:
             ax1.axis('equal')
             
             ax2 = axes[1]
-            errores = []
-            for punto in trayectoria:
-                z = complex(punto.real, punto.imag)
-                error = abs(self.funcion(z))
-                errores.append(seguro_float(error, 1e-15))
+            if errores is None or len(errores) != len(trayectoria):
+                errores = self._errores_trayectoria(reales, imaginarios)
+            errores = list(errores)
             
             iteraciones = list(range(len(errores)))
             ax2.semilogy(iteraciones, errores, 'r-o', linewidth=2, markersize=4)
@@ -941,34 +2973,63 @@ class SecanteComplejoAvanzado:
                         transform=ax2.transAxes, verticalalignment='top',
                         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
             
-            plt.tight_layout()
+            fig.tight_layout()
             buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-            plt.close(fig)
-            buf.seek(0)
-            
-            img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-            return img_base64
+            fig.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+            return buf.getvalue()
             
         except Exception as e:
             logger.error(f"Error generando visualización: {e}")
-            return ""
+            return b""
     
-    def generar_informe_ejecucion(self, resultado_id: str) -> Dict[str, Any]:
-        resultado = None
-        for r in self.historial_ejecuciones:
-            if r.id_ejecucion == resultado_id:
-                resultado = r
-                break
+    def _errores_trayectoria(self, reales: List[float], imaginarios: List[float]) -> np.ndarray:
+        errores = np.abs(self.funcion_vectorizada(np.array(reales) + 1j * np.array(imaginarios)))
+        errores[~np.isfinite(errores)] = 1e-15
+        return np.maximum(errores, 1e-15)
+    
+    def solicitar_visualizacion(self, resultado_id: str) -> Future:
+        with self._lock_visualizaciones:
+            if resultado_id in self.visualizaciones:
+                self.visualizaciones.move_to_end(resultado_id)
+                return self.visualizaciones[resultado_id]
+            
+            resultado = self.historial_ejecuciones.obtener(resultado_id)
+            if not resultado:
+                raise ValueError(f"Resultado con ID {resultado_id} no encontrado")
+            
+            future = EJECUTOR_VISUALIZACIONES.submit(
+                self.generar_png_trayectoria,
+                resultado.trayectoria,
+                resultado.raiz,
+                titulo=f"Trayectoria: {self.expresion_funcion}",
+                errores=resultado.errores_iteracion
+            )
+            self.visualizaciones[resultado_id] = future
+            while len(self.visualizaciones) > self.max_visualizaciones:
+                self.visualizaciones.popitem(last=False)
+        
+        # Fuera del lock: si el render ya terminó, el callback se ejecuta en este hilo
+        future.add_done_callback(lambda f: self._descartar_visualizacion_fallida(resultado_id, f))
+        return future
+    
+    def _descartar_visualizacion_fallida(self, resultado_id: str, future: Future):
+        """Quita del caché los renders vacíos o con excepción para que la siguiente petición reintente."""
+        if not future.cancelled() and future.exception() is None and future.result():
+            return
+        with self._lock_visualizaciones:
+            if self.visualizaciones.get(resultado_id) is future:
+                del self.visualizaciones[resultado_id]
+    
+    def obtener_visualizacion_png(self, resultado_id: str, timeout: float = 30.0) -> bytes:
+        return self.solicitar_visualizacion(resultado_id).result(timeout=timeout)
+    
+    def generar_informe_ejecucion(self, resultado_id: str, formato: str = 'json') -> Dict[str, Any]:
+        resultado = self.historial_ejecuciones.obtener(resultado_id)
         
         if not resultado:
             raise ValueError(f"Resultado con ID {resultado_id} no encontrado")
         
-        img_base64 = self.generar_visualizacion_trayectoria(
-            resultado.trayectoria,
-            resultado.raiz,
-            titulo=f"Trayectoria - {self.expresion_funcion}"
-        )
+        img_base64 = base64.b64encode(self.obtener_visualizacion_png(resultado_id)).decode('utf-8')
         
         informe = {
             'id_ejecucion': resultado.id_ejecucion,
@@ -987,10 +3048,16 @@ class SecanteComplejoAvanzado:
                 'tasa_reduccion_error': resultado.tasa_reduccion_error
             },
             'analisis_convergencia': {
-                'errores_por_iteracion': resultado.errores_iteracion,
-                'errores_relativos': resultado.errores_relativos,
-                'trayectoria': [p.to_dict() for p in resultado.trayectoria],
+                'errores_por_iteracion': resultado.errores_iteracion.tolist(),
+                'errores_relativos': resultado.errores_relativos.tolist(),
+                'trayectoria': resultado.trayectoria_dict(),
                 'longitud_trayectoria': len(resultado.trayectoria)
+            } if formato == 'json' else {
+                'errores_por_iteracion': serie_columnar(resultado.errores_iteracion, formato),
+                'errores_relativos': serie_columnar(resultado.errores_relativos, formato),
+                'trayectoria': trayectoria_columnar(resultado.trayectoria, formato),
+                'longitud_trayectoria': len(resultado.trayectoria),
+                'formato': formato
             },
             'visualizacion_base64': img_base64,
             'recomendaciones': self._generar_recomendaciones(resultado),
@@ -1028,11 +3095,364 @@ class SecanteComplejoAvanzado:
         
         return recomendaciones
 
+# BÚSQUEDA DE RAÍCES EN PROCESOS
+def fusionar_raiz(raices: 'RegistroRaices', raiz_compleja: complex, error, iteraciones,
+                  ciclos_detectados, veces: int = 1) -> bool:
+    return raices.insertar(
+        raiz_compleja,
+        veces=veces,
+        real=raiz_compleja.real,
+        imag=raiz_compleja.imag,
+        error=seguro_float(error),
+        iteraciones=int(iteraciones),
+        ciclos_detectados=int(ciclos_detectados)
+    )
+
+# Un único pool para todo el proceso, creado en el primer uso y nunca recreado, así las
+# búsquedas en curso no pierden su executor. forkserver/spawn evita heredar locks tomados
+# por los hilos de Flask al hacer fork
+_pool_procesos: Optional[ProcessPoolExecutor] = None
+_lock_pool_procesos = threading.Lock()
+
+def obtener_pool_procesos() -> ProcessPoolExecutor:
+    global _pool_procesos
+    with _lock_pool_procesos:
+        if _pool_procesos is None:
+            _pool_procesos = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS_PROCESOS,
+                mp_context=multiprocessing.get_context(
+                    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                )
+            )
+        return _pool_procesos
+
+def workers_solicitados(max_workers: Optional[int]) -> int:
+    """Procesos que puede ocupar a la vez una solicitud, acotado por el tamaño del pool."""
+    return min(int(max_workers), MAX_WORKERS_PROCESOS) if max_workers else MAX_WORKERS_PROCESOS
+
+def ejecutar_en_pool(funcion: Callable, tareas: List[tuple], max_workers: int) -> Iterator[Any]:
+    """Envía las tareas al pool con como mucho max_workers en curso y devuelve los resultados en orden."""
+    pool = obtener_pool_procesos()
+    en_curso = deque()
+    try:
+        for argumentos in tareas:
+            if len(en_curso) >= max_workers:
+                yield en_curso.popleft().result()
+            en_curso.append(pool.submit(funcion, *argumentos))
+        while en_curso:
+            yield en_curso.popleft().result()
+    finally:
+        # Si se interrumpe la iteración no quedan tareas de esta solicitud en cola
+        for future in en_curso:
+            future.cancel()
+
+@lru_cache(maxsize=8)
+def _solver_de_proceso(expresion_funcion: str, tol: float, max_iter: int,
+                       estrategia_ciclos: str, usar_derivada_numerica: bool,
+                       metodo: str = 'secante') -> SecanteComplejoAvanzado:
+    return SecanteComplejoAvanzado(
+        expresion_funcion=expresion_funcion,
+        tol=tol,
+        max_iter=max_iter,
+        estrategia_ciclos=estrategia_ciclos,
+        usar_derivada_numerica=usar_derivada_numerica,
+        metodo=metodo
+    )
+
+def buscar_raices_bloque(expresion_funcion: str, configuracion: Dict[str, Any],
+                         semillas: np.ndarray, distancia_minima: float,
+                         vectorizado: bool = True) -> Tuple[List[Dict[str, Any]], int]:
+    """Procesa un bloque de semillas en un proceso worker y deduplica sus raíces localmente."""
+    solver = _solver_de_proceso(
+        expresion_funcion,
+        configuracion['tol'],
+        configuracion['max_iter'],
+        configuracion['estrategia_ciclos'],
+        configuracion['usar_derivada_numerica'],
+        configuracion.get('metodo', 'secante')
+    )
+    
+    raices = RegistroRaices(distancia_minima)
+    convergidas = 0
+    
+    if vectorizado:
+        lote = solver.ejecutar_secante_lote(semillas, semillas + complex(0.02, 0.02))
+        for idx in np.flatnonzero(lote['convergio']):
+            raiz = complex(lote['raices'][idx])
+            fusionar_raiz(raices, complex(seguro_float(raiz.real), seguro_float(raiz.imag)),
+                          lote['errores_finales'][idx], lote['iteraciones'][idx],
+                          lote['ciclos_detectados'][idx])
+        convergidas = int(lote['convergio'].sum())
+    else:
+        for semilla in semillas:
+            x0 = complex(semilla)
+            resultado = solver.ejecutar_secante(x0.real, x0.imag, x0.real + 0.02, x0.imag + 0.02)
+            if resultado['convergio']:
+                convergidas += 1
+                fusionar_raiz(raices, complex(resultado['raiz']['real'], resultado['raiz']['imag']),
+                              resultado['error_final'], resultado['iteraciones'],
+                              resultado.get('ciclos_detectados', 0))
+    
+    return list(raices), convergidas
+
+def ejecutar_lote_bloque(expresion_funcion: str, configuracion: Dict[str, Any],
+                         x0s: np.ndarray, x1s: np.ndarray) -> Dict[str, np.ndarray]:
+    """Ejecuta un bloque de pares de semillas en un proceso worker."""
+    solver = _solver_de_proceso(
+        expresion_funcion,
+        configuracion['tol'],
+        configuracion['max_iter'],
+        configuracion['estrategia_ciclos'],
+        configuracion['usar_derivada_numerica'],
+        configuracion.get('metodo', 'secante')
+    )
+    return solver.ejecutar_secante_lote(x0s, x1s)
+
+# REGISTRO DE SOLVERS
+class RegistroSolvers:
+    """Registro de solvers por handle con expulsión LRU, TTL y límite de memoria."""
+    
+    def __init__(self, max_solvers: int = 128, ttl_segundos: float = 3600.0,
+                 max_memoria_bytes: int = 256 * 1024 * 1024):
+        self.max_solvers = int(max_solvers)
+        self.ttl_segundos = float(ttl_segundos)
+        self.max_memoria_bytes = int(max_memoria_bytes)
+        self._solvers = OrderedDict()
+        self._lock = threading.Lock()
+        self.expulsados = 0
+    
+    def registrar(self, solver: SecanteComplejoAvanzado) -> str:
+        handle = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._solvers[handle] = {'solver': solver, 'ultimo_acceso': time.time()}
+            self._purgar()
+        return handle
+    
+    def obtener(self, handle: str) -> Optional[SecanteComplejoAvanzado]:
+        with self._lock:
+            entrada = self._solvers.get(handle)
+            if entrada is None:
+                return None
+            if time.time() - entrada['ultimo_acceso'] > self.ttl_segundos:
+                del self._solvers[handle]
+                self.expulsados += 1
+                return None
+            entrada['ultimo_acceso'] = time.time()
+            self._solvers.move_to_end(handle)
+            return entrada['solver']
+    
+    def eliminar(self, handle: str) -> bool:
+        with self._lock:
+            return self._solvers.pop(handle, None) is not None
+    
+    def _purgar(self):
+        limite = time.time() - self.ttl_segundos
+        for handle in [h for h, e in self._solvers.items() if e['ultimo_acceso'] < limite]:
+            del self._solvers[handle]
+            self.expulsados += 1
+        
+        while len(self._solvers) > self.max_solvers:
+            self._solvers.popitem(last=False)
+            self.expulsados += 1
+        
+        memoria = sum(e['solver'].memoria_estimada() for e in self._solvers.values())
+        while len(self._solvers) > 1 and memoria > self.max_memoria_bytes:
+            _, entrada = self._solvers.popitem(last=False)
+            memoria -= entrada['solver'].memoria_estimada()
+            self.expulsados += 1
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            self._purgar()
+            return {
+                'solvers_activos': len(self._solvers),
+                'max_solvers': self.max_solvers,
+                'ttl_segundos': self.ttl_segundos,
+                'memoria_estimada': sum(e['solver'].memoria_estimada() for e in self._solvers.values()),
+                'max_memoria_bytes': self.max_memoria_bytes,
+                'expulsados': self.expulsados
+            }
+
+REGISTRO_SOLVERS = RegistroSolvers()
+
+# TRABAJOS DE BÚSQUEDA EN SEGUNDO PLANO
+class BusquedaCancelada(Exception):
+    """Interrumpe una búsqueda desde su callback de progreso."""
+
+class TrabajosBusqueda:
+    """Cola de búsquedas de raíces ejecutadas por un pool de hilos, con progreso y cancelación."""
+    
+    ESTADOS_FINALES = ('completado', 'cancelado', 'error')
+    
+    def __init__(self, max_workers: int = 2, max_trabajos: int = 256, ttl_segundos: float = 3600.0):
+        self.max_workers = int(max_workers)
+        self.max_trabajos = int(max_trabajos)
+        self.ttl_segundos = float(ttl_segundos)
+        self._ejecutor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='busqueda')
+        self._trabajos = OrderedDict()
+        self._lock = threading.Lock()
+        self.expulsados = 0
+    
+    def enviar(self, solver: SecanteComplejoAvanzado, parametros: Dict[str, Any],
+               puntos_estimados: int) -> str:
+        id_trabajo = uuid.uuid4().hex[:12]
+        trabajo = {
+            'id_trabajo': id_trabajo,
+            'estado': 'en_cola',
+            'creado': time.time(),
+            'iniciado': None,
+            'finalizado': None,
+            'puntos_procesados': 0,
+            'puntos_estimados': int(puntos_estimados),
+            'raices_encontradas': 0,
+            'resultado': None,
+            'error': None,
+            'cancelar': threading.Event(),
+            'future': None
+        }
+        with self._lock:
+            self._purgar()
+            if len(self._trabajos) >= self.max_trabajos:
+                raise RuntimeError('Cola de búsquedas llena, inténtalo más tarde')
+            self._trabajos[id_trabajo] = trabajo
+        trabajo['future'] = self._ejecutor.submit(self._ejecutar, trabajo, solver, parametros)
+        return id_trabajo
+    
+    def _ejecutar(self, trabajo: Dict[str, Any], solver: SecanteComplejoAvanzado,
+                  parametros: Dict[str, Any]):
+        if trabajo['cancelar'].is_set():
+            self._finalizar(trabajo, 'cancelado')
+            return
+        trabajo['estado'] = 'en_ejecucion'
+        trabajo['iniciado'] = time.time()
+        
+        def progreso(puntos: int, raices: int):
+            if trabajo['cancelar'].is_set():
+                raise BusquedaCancelada()
+            trabajo['puntos_procesados'] = puntos
+            trabajo['raices_encontradas'] = raices
+        
+        try:
+            resultado = solver.buscar_raices_multiples(progreso=progreso, **parametros)
+        except BusquedaCancelada:
+            self._finalizar(trabajo, 'cancelado')
+        except Exception as e:
+            logger.error(f"Error en la búsqueda {trabajo['id_trabajo']}: {e}")
+            trabajo['error'] = str(e)
+            self._finalizar(trabajo, 'error')
+        else:
+            trabajo['resultado'] = resultado
+            trabajo['puntos_procesados'] = resultado['puntos_procesados']
+            trabajo['raices_encontradas'] = resultado['total_raices']
+            self._finalizar(trabajo, 'completado')
+    
+    @staticmethod
+    def _finalizar(trabajo: Dict[str, Any], estado: str):
+        trabajo['finalizado'] = time.time()
+        trabajo['estado'] = estado
+    
+    def obtener(self, id_trabajo: str, incluir_resultado: bool = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            trabajo = self._trabajos.get(id_trabajo)
+        if trabajo is None:
+            return None
+        return self._resumen(trabajo, incluir_resultado)
+    
+    def cancelar(self, id_trabajo: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            trabajo = self._trabajos.get(id_trabajo)
+        if trabajo is None:
+            return None
+        if trabajo['estado'] not in self.ESTADOS_FINALES:
+            trabajo['cancelar'].set()
+            # Si aún no empezó se retira de la cola; si está en ejecución para en el siguiente bloque
+            if trabajo['future'] is not None and trabajo['future'].cancel():
+                self._finalizar(trabajo, 'cancelado')
+        return self._resumen(trabajo, incluir_resultado=False)
+    
+    def listar(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._purgar()
+            trabajos = list(self._trabajos.values())
+        return [self._resumen(t, incluir_resultado=False) for t in trabajos]
+    
+    @staticmethod
+    def _resumen(trabajo: Dict[str, Any], incluir_resultado: bool) -> Dict[str, Any]:
+        estimados = max(trabajo['puntos_estimados'], 1)
+        final = trabajo['finalizado'] or time.time()
+        estado = trabajo['estado']
+        if estado == 'en_ejecucion' and trabajo['cancelar'].is_set():
+            estado = 'cancelando'
+        resumen = {
+            'id_trabajo': trabajo['id_trabajo'],
+            'estado': estado,
+            'puntos_procesados': int(trabajo['puntos_procesados']),
+            'puntos_estimados': int(trabajo['puntos_estimados']),
+            'progreso': 1.0 if trabajo['estado'] == 'completado'
+                        else min(trabajo['puntos_procesados'] / estimados, 1.0),
+            'raices_encontradas': int(trabajo['raices_encontradas']),
+            'tiempo_en_cola': (trabajo['iniciado'] or final) - trabajo['creado'],
+            'tiempo_ejecucion': final - trabajo['iniciado'] if trabajo['iniciado'] else 0.0,
+            'error': trabajo['error']
+        }
+        if incluir_resultado and trabajo['estado'] == 'completado':
+            resumen['resultado'] = trabajo['resultado']
+        return resumen
+    
+    def _purgar(self):
+        # Solo se expulsan trabajos terminados: los pendientes siguen ocupando su plaza
+        limite = time.time() - self.ttl_segundos
+        terminados = [i for i, t in self._trabajos.items() if t['estado'] in self.ESTADOS_FINALES]
+        for id_trabajo in terminados:
+            if self._trabajos[id_trabajo]['finalizado'] < limite:
+                del self._trabajos[id_trabajo]
+                self.expulsados += 1
+        
+        terminados = [i for i in terminados if i in self._trabajos]
+        while terminados and len(self._trabajos) >= self.max_trabajos:
+            del self._trabajos[terminados.pop(0)]
+            self.expulsados += 1
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            self._purgar()
+            estados = [t['estado'] for t in self._trabajos.values()]
+        return {
+            'trabajos': len(estados),
+            'en_cola': estados.count('en_cola'),
+            'en_ejecucion': estados.count('en_ejecucion'),
+            'max_workers': self.max_workers,
+            'max_trabajos': self.max_trabajos,
+            'expulsados': self.expulsados
+        }
+
+TRABAJOS_BUSQUEDA = TrabajosBusqueda()
+
 app = Flask(__name__)
 CORS(app)
 
 solver_global = None
 
+def obtener_solver(data: Optional[Dict[str, Any]] = None):
+    handle = (data or {}).get('handle') or request.args.get('handle')
+    
+    if handle:
+        solver = REGISTRO_SOLVERS.obtener(str(handle))
+        if solver is None:
+            return None, (jsonify({
+                'status': 'error',
+                'message': f'Solver {handle} no encontrado o expirado'
+            }), 404)
+        return solver, None
+    
+    if solver_global is None:
+        return None, (jsonify({
+            'status': 'error',
+            'message': 'Solver no configurado'
+        }), 400)
+    
+    return solver_global, None
+
 ESTUDIANTES = [
     Estudiante(
         id=1,
@@ -1062,26 +3482,36 @@ def obtener_estudiantes():
 @app.route('/api/configurar', methods=['POST'])
 def configurar_solver():
     global solver_global
-    data = request.json
     try:
-        data = convertir_datos_numericos(data)
-        
-        solver_global = SecanteComplejoAvanzado(
-            expresion_funcion=str(data['expresion_funcion']),
-            tol=seguro_float(data.get('tol', 1e-12)),
-            max_iter=int(data.get('max_iter', 200)),
-            estrategia_ciclos=str(data.get('estrategia_ciclos', 'perturbacion_hibrida')),
-            usar_derivada_numerica=bool(data.get('usar_derivada_numerica', False))
+        data = decodificar_solicitud(ESQUEMA_CONFIGURAR)
+    except ErrorValidacion as e:
+        return respuesta_error_validacion(e)
+    
+    try:
+        solver = SecanteComplejoAvanzado(
+            expresion_funcion=data['expresion_funcion'],
+            tol=seguro_float(data['tol']),
+            max_iter=data['max_iter'],
+            estrategia_ciclos=data['estrategia_ciclos'],
+            usar_derivada_numerica=data['usar_derivada_numerica'],
+            metodo=data['metodo']
         )
+        solver_global = solver
+        handle = REGISTRO_SOLVERS.registrar(solver)
         
         return jsonify({
             'status': 'success',
             'message': 'Solver configurado exitosamente',
+            'handle': handle,
             'configuracion': {
                 'expresion_funcion': data['expresion_funcion'],
-                'tol': seguro_float(data.get('tol', 1e-12)),
-                'max_iter': int(data.get('max_iter', 200)),
-                'estrategia_ciclos': data.get('estrategia_ciclos', 'perturbacion_hibrida')
+                'tol': solver.tol,
+                'max_iter': data['max_iter'],
+                'estrategia_ciclos': data['estrategia_ciclos'],
+                'metodo': data['metodo'],
+                'backend': solver.funcion_compilada.backend,
+                'grado_polinomio': (len(solver.funcion_compilada.coeficientes) - 1
+                                    if solver.funcion_compilada.coeficientes is not None else None)
             }
         })
     
@@ -1093,47 +3523,140 @@ def configurar_solver():
 
 @app.route('/api/ejecutar', methods=['POST'])
 def ejecutar_secante():
-    if solver_global is None:
+    try:
+        data = decodificar_solicitud(ESQUEMA_EJECUTAR)
+    except ErrorValidacion as e:
+        return respuesta_error_validacion(e)
+    
+    solver, error = obtener_solver(data)
+    if error:
+        return error
+    
+    handle = data['handle'] or request.args.get('handle')
+    modo_visualizacion = data['visualizacion'] or request.args.get('visualizacion', 'diferida')
+    formato = formato_solicitado()
+    
+    try:
+        resultado = solver.ejecutar_secante(
+            x0_real=data['x0_real'],
+            x0_imag=data['x0_imag'],
+            x1_real=data['x1_real'],
+            x1_imag=data['x1_imag'],
+            id_ejecucion=data['id_ejecucion'],
+            formato=formato
+        )
+        
+        if modo_visualizacion == 'inline':
+            resultado['visualizacion_base64'] = base64.b64encode(
+                solver.obtener_visualizacion_png(resultado['id_ejecucion'])
+            ).decode('utf-8')
+        elif modo_visualizacion == 'diferida':
+            # El render se encola en el primer GET de la URL, no por cada ejecución
+            resultado['visualizacion_url'] = url_for(
+                'obtener_visualizacion',
+                resultado_id=resultado['id_ejecucion'],
+                handle=handle,
+                _external=True
+            )
+        
+        return respuesta_json({
+            'status': 'success',
+            'resultado': resultado
+        }, formato)
+    
+    except Exception as e:
         return jsonify({
             'status': 'error',
-            'message': 'Solver no configurado'
+            'message': str(e)
         }), 400
+
+@app.route('/api/ejecutar/stream', methods=['POST'])
+def ejecutar_secante_stream():
+    try:
+        data = decodificar_solicitud(ESQUEMA_EJECUTAR)
+    except ErrorValidacion as e:
+        return respuesta_error_validacion(e)
+    
+    solver, error = obtener_solver(data)
+    if error:
+        return error
     
-    data = request.json
+    # ?formato= elige la serialización (json/columnar/binario) en el resto de la API; aquí el
+    # transporte del flujo se elige con 'transporte' o con la cabecera Accept
+    transporte = data['transporte'] or request.args.get('transporte', '')
+    if transporte not in ('ndjson', 'sse'):
+        transporte = 'sse' if 'text/event-stream' in request.headers.get('Accept', '') else 'ndjson'
     
     try:
-        data = convertir_datos_numericos(data)
-        
-        required_fields = ['x0_real', 'x0_imag', 'x1_real', 'x1_imag']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'status': 'error',
-                    'message': f'Campo requerido faltante: {field}'
-                }), 400
-        
-        resultado = solver_global.ejecutar_secante(
-            x0_real=seguro_float(data['x0_real'], 0.5),
-            x0_imag=seguro_float(data['x0_imag'], 0.5),
-            x1_real=seguro_float(data['x1_real'], 1.0),
-            x1_imag=seguro_float(data['x1_imag'], 0.0),
-            id_ejecucion=data.get('id_ejecucion')
+        eventos = solver.iterar_secante(
+            x0_real=data['x0_real'],
+            x0_imag=data['x0_imag'],
+            x1_real=data['x1_real'],
+            x1_imag=data['x1_imag'],
+            id_ejecucion=data['id_ejecucion']
         )
-        
-        trayectoria = [PuntoComplejo(**p) for p in resultado['trayectoria']]
-        raiz = PuntoComplejo(**resultado['raiz'])
-        
-        img_base64 = solver_global.generar_visualizacion_trayectoria(
-            trayectoria, raiz,
-            titulo=f"Trayectoria: {solver_global.expresion_funcion}"
+    
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    
+    def generar():
+        for evento in eventos:
+            linea = json.dumps(evento, allow_nan=False, default=str)
+            if transporte == 'sse':
+                yield f"event: {evento['tipo']}\ndata: {linea}\n\n"
+            else:
+                yield linea + '\n'
+    
+    mimetype = 'text/event-stream' if transporte == 'sse' else 'application/x-ndjson'
+    return Response(stream_with_context(generar()), mimetype=mimetype,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/ejecutar-lote', methods=['POST'])
+def ejecutar_secante_lote():
+    try:
+        data = decodificar_solicitud(ESQUEMA_EJECUTAR_LOTE)
+        n = data['x0_real'].size
+        columnas = ('x0_imag', 'x1_real', 'x1_imag', 'ids')
+        errores = [
+            {'campo': campo, 'mensaje': f'debe tener {n} elementos'}
+            for campo in columnas
+            if data[campo] is not None and len(data[campo]) != n
+        ]
+        if (data['x1_real'] is None) != (data['x1_imag'] is None):
+            errores.append({'campo': 'x1_real', 'mensaje': 'x1_real y x1_imag deben enviarse juntos'})
+        if errores:
+            raise ErrorValidacion(errores)
+    except ErrorValidacion as e:
+        return respuesta_error_validacion(e)
+    
+    solver, error = obtener_solver(data)
+    if error:
+        return error
+    
+    formato = formato_solicitado()
+    x0s = data['x0_real'] + 1j * data['x0_imag']
+    if data['x1_real'] is not None:
+        x1s = data['x1_real'] + 1j * data['x1_imag']
+    else:
+        x1s = x0s + complex(0.02, 0.02)
+    
+    try:
+        resultado = solver.ejecutar_lote(
+            x0s, x1s,
+            ids=data['ids'],
+            trayectorias=data['trayectorias'],
+            procesos=data['procesos'],
+            max_workers=data['max_workers'],
+            formato=formato
         )
         
-        resultado['visualizacion_base64'] = img_base64
-        
-        return jsonify({
+        return respuesta_json({
             'status': 'success',
             'resultado': resultado
-        })
+        }, formato)
     
     except Exception as e:
         return jsonify({
@@ -1141,30 +3664,37 @@ def ejecutar_secante():
             'message': str(e)
         }), 400
 
+def parametros_busqueda(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'region': data['region'],
+        'n_puntos': data['n_puntos'],
+        'distancia_minima': seguro_float(data['distancia_minima']),
+        'paralelo': data['paralelo'],
+        'vectorizado': data['vectorizado'],
+        'procesos': data['procesos'],
+        'max_workers': data['max_workers'],
+        'adaptativo': data['adaptativo'],
+        'max_semillas': data['max_semillas'],
+        'profundidad_max': data['profundidad_max'],
+        'raices_objetivo': data['raices_objetivo'],
+        'contar_raices': data['contar_raices'],
+        'semillas_companion': data['semillas_companion'],
+        'deflacion': data['deflacion']
+    }
+
 @app.route('/api/buscar-raices', methods=['POST'])
 def buscar_raices_multiples():
-    if solver_global is None:
-        return jsonify({
-            'status': 'error',
-            'message': 'Solver no configurado'
-        }), 400
+    try:
+        data = decodificar_solicitud(ESQUEMA_BUSCAR_RAICES)
+    except ErrorValidacion as e:
+        return respuesta_error_validacion(e)
     
-    data = request.json
+    solver, error = obtener_solver(data)
+    if error:
+        return error
     
     try:
-        data = convertir_datos_numericos(data)
-        
-        resultado = solver_global.buscar_raices_multiples(
-            region={
-                'x_min': seguro_float(data['region']['x_min'], -2),
-                'x_max': seguro_float(data['region']['x_max'], 2),
-                'y_min': seguro_float(data['region']['y_min'], -2),
-                'y_max': seguro_float(data['region']['y_max'], 2)
-            },
-            n_puntos=int(data.get('n_puntos', 20)),
-            distancia_minima=seguro_float(data.get('distancia_minima', 0.05)),
-            paralelo=bool(data.get('paralelo', True))
-        )
+        resultado = solver.buscar_raices_multiples(**parametros_busqueda(data))
         
         return jsonify({
             'status': 'success',
@@ -1177,27 +3707,151 @@ def buscar_raices_multiples():
             'message': str(e)
         }), 400
 
-@app.route('/api/sensibilidad', methods=['POST'])
-def analizar_sensibilidad():
-    if solver_global is None:
+@app.route('/api/buscar-raices/trabajos', methods=['POST'])
+def crear_trabajo_busqueda():
+    try:
+        data = decodificar_solicitud(ESQUEMA_BUSCAR_RAICES)
+    except ErrorValidacion as e:
+        return respuesta_error_validacion(e)
+    
+    solver, error = obtener_solver(data)
+    if error:
+        return error
+    
+    puntos_estimados = max(data['n_puntos'], 5) ** 2
+    if (data['adaptativo'] or data['deflacion']) and data['max_semillas']:
+        puntos_estimados = data['max_semillas']
+    
+    try:
+        id_trabajo = TRABAJOS_BUSQUEDA.enviar(solver, parametros_busqueda(data), puntos_estimados)
+    except RuntimeError as e:
         return jsonify({
             'status': 'error',
-            'message': 'Solver no configurado'
-        }), 400
+            'message': str(e)
+        }), 503
+    
+    return jsonify({
+        'status': 'success',
+        'trabajo': TRABAJOS_BUSQUEDA.obtener(id_trabajo, incluir_resultado=False),
+        'url_estado': url_for('obtener_trabajo_busqueda', id_trabajo=id_trabajo)
+    }), 202
+
+@app.route('/api/buscar-raices/trabajos', methods=['GET'])
+def listar_trabajos_busqueda():
+    return jsonify({
+        'status': 'success',
+        'trabajos': TRABAJOS_BUSQUEDA.listar(),
+        'estadisticas': TRABAJOS_BUSQUEDA.estadisticas()
+    })
+
+@app.route('/api/buscar-raices/trabajos/<id_trabajo>', methods=['GET'])
+def obtener_trabajo_busqueda(id_trabajo):
+    trabajo = TRABAJOS_BUSQUEDA.obtener(id_trabajo)
+    if trabajo is None:
+        return jsonify({
+            'status': 'error',
+            'message': f'Trabajo {id_trabajo} no encontrado o expirado'
+        }), 404
+    
+    return jsonify({
+        'status': 'success',
+        'trabajo': trabajo
+    })
+
+@app.route('/api/buscar-raices/trabajos/<id_trabajo>', methods=['DELETE'])
+def cancelar_trabajo_busqueda(id_trabajo):
+    trabajo = TRABAJOS_BUSQUEDA.cancelar(id_trabajo)
+    if trabajo is None:
+        return jsonify({
+            'status': 'error',
+            'message': f'Trabajo {id_trabajo} no encontrado o expirado'
+        }), 404
+    
+    return jsonify({
+        'status': 'success',
+        'trabajo': trabajo
+    })
+
+@app.route('/api/cuencas', methods=['POST'])
+def generar_cuencas():
+    try:
+        data = decodificar_solicitud(ESQUEMA_CUENCAS)
+    except ErrorValidacion as e:
+        return respuesta_error_validacion(e)
+    
+    solver, error = obtener_solver(data)
+    if error:
+        return error
+    
+    parametros = {
+        'region': data['region'],
+        'ancho': data['ancho'],
+        'alto': data['alto'],
+        'distancia_minima': data['distancia_minima'],
+        'filas_por_bloque': data['filas_por_bloque'],
+        'max_raices': data['max_raices']
+    }
     
-    data = request.json
+    # 'png' y 'ndjson' se envían bloque a bloque; solo 'arrays' arma la malla completa
+    if data['salida'] == 'png':
+        return Response(stream_with_context(solver.iterar_png_cuencas(**parametros)),
+                        mimetype='image/png')
+    
+    formato = formato_solicitado()
+    if data['salida'] == 'ndjson':
+        def generar():
+            for evento in solver.eventos_cuencas(formato=formato, **parametros):
+                yield json.dumps(evento, allow_nan=False, default=_a_json_nativo) + '\n'
+        
+        return Response(stream_with_context(generar()), mimetype='application/x-ndjson',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
     
     try:
-        data = convertir_datos_numericos(data)
+        resultado = solver.generar_cuencas(**parametros)
         
-        resultado = solver_global.analizar_sensibilidad_ruido(
-            raiz_real=seguro_float(data['raiz_real']),
-            raiz_imag=seguro_float(data['raiz_imag']),
-            niveles_ruido=data.get('niveles_ruido', [1e-15, 1e-12, 1e-9, 1e-6, 1e-3]),
-            muestras_por_nivel=int(data.get('muestras_por_nivel', 5))
-        )
+        tipo_indices = resultado['indices'].dtype.newbyteorder('<').str
+        tipo_iteraciones = resultado['iteraciones'].dtype.newbyteorder('<').str
+        if formato == 'json':
+            resultado['indices'] = resultado['indices'].ravel().tolist()
+            resultado['iteraciones'] = resultado['iteraciones'].ravel().tolist()
+        else:
+            resultado['indices'] = serie_columnar(resultado['indices'].ravel(), formato, tipo_indices)
+            resultado['iteraciones'] = serie_columnar(resultado['iteraciones'].ravel(), formato,
+                                                      tipo_iteraciones)
         
+        return respuesta_json({
+            'status': 'success',
+            'resultado': resultado
+        }, formato)
+    
+    except Exception as e:
         return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+
+@app.route('/api/sensibilidad', methods=['POST'])
+def analizar_sensibilidad():
+    try:
+        data = decodificar_solicitud(ESQUEMA_SENSIBILIDAD)
+    except ErrorValidacion as e:
+        return respuesta_error_validacion(e)
+    
+    solver, error = obtener_solver(data)
+    if error:
+        return error
+    
+    try:
+        resultado = solver.analizar_sensibilidad_ruido(
+            raiz_real=data['raiz_real'],
+            raiz_imag=data['raiz_imag'],
+            niveles_ruido=data['niveles_ruido'],
+            muestras_por_nivel=data['muestras_por_nivel'],
+            semilla=data['semilla'],
+            detalle_por_nivel=data['detalle_por_nivel']
+        )
+        
+        return respuesta_json({
             'status': 'success',
             'resultado': resultado
         })
@@ -1210,20 +3864,18 @@ def analizar_sensibilidad():
 
 @app.route('/api/estadisticas', methods=['GET'])
 def obtener_estadisticas():
-    if solver_global is None:
-        return jsonify({
-            'status': 'error',
-            'message': 'Solver no configurado'
-        }), 400
+    solver, error = obtener_solver()
+    if error:
+        return error
     
     estadisticas_serializadas = {
-        'ejecuciones_totales': int(solver_global.estadisticas['ejecuciones_totales']),
-        'convergencias_exitosas': int(solver_global.estadisticas['convergencias_exitosas']),
-        'tiempo_promedio': seguro_float(solver_global.estadisticas['tiempo_promedio'])
+        'ejecuciones_totales': int(solver.estadisticas['ejecuciones_totales']),
+        'convergencias_exitosas': int(solver.estadisticas['convergencias_exitosas']),
+        'tiempo_promedio': seguro_float(solver.estadisticas['tiempo_promedio'])
     }
     
     raices_serializadas = []
-    for r in solver_global.raices_encontradas:
+    for r in solver.raices_encontradas:
         raices_serializadas.append({
             'raiz': r['raiz'].to_dict(),
             'veces_encontrada': int(r['contador']),
@@ -1234,23 +3886,46 @@ def obtener_estadisticas():
         'status': 'success',
         'estadisticas': estadisticas_serializadas,
         'raices_encontradas': raices_serializadas,
-        'historial_count': len(solver_global.historial_ejecuciones)
+        'historial_count': len(solver.historial_ejecuciones),
+        'historial_bytes': solver.historial_ejecuciones.bytes_estimados,
+        'historial_descartados': solver.historial_ejecuciones.descartados,
+        'cache_funciones': CACHE_FUNCIONES.estadisticas(),
+        'trabajos_busqueda': TRABAJOS_BUSQUEDA.estadisticas()
     })
 
-@app.route('/api/informe/<resultado_id>', methods=['GET'])
-def obtener_informe(resultado_id):
-    if solver_global is None:
+@app.route('/api/solvers', methods=['GET'])
+def obtener_registro_solvers():
+    return jsonify({
+        'status': 'success',
+        'registro': REGISTRO_SOLVERS.estadisticas()
+    })
+
+@app.route('/api/solvers/<handle>', methods=['DELETE'])
+def eliminar_solver(handle):
+    if not REGISTRO_SOLVERS.eliminar(str(handle)):
         return jsonify({
             'status': 'error',
-            'message': 'Solver no configurado'
-        }), 400
+            'message': f'Solver {handle} no encontrado o expirado'
+        }), 404
+    
+    return jsonify({
+        'status': 'success',
+        'message': f'Solver {handle} eliminado'
+    })
+
+@app.route('/api/informe/<resultado_id>', methods=['GET'])
+def obtener_informe(resultado_id):
+    solver, error = obtener_solver()
+    if error:
+        return error
     
     try:
-        informe = solver_global.generar_informe_ejecucion(str(resultado_id))
-        return jsonify({
+        formato = formato_solicitado()
+        informe = solver.generar_informe_ejecucion(str(resultado_id), formato)
+        return respuesta_json({
             'status': 'success',
             'informe': informe
-        })
+        }, formato)
     
     except Exception as e:
         return jsonify({
@@ -1258,6 +3933,36 @@ def obtener_informe(resultado_id):
             'message': str(e)
         }), 404
 
+@app.route('/api/visualizacion/<resultado_id>', methods=['GET'])
+def obtener_visualizacion(resultado_id):
+    solver, error = obtener_solver()
+    if error:
+        return error
+    
+    try:
+        png = solver.obtener_visualizacion_png(str(resultado_id))
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 404
+    except FuturesTimeoutError:
+        return jsonify({
+            'status': 'pendiente',
+            'message': 'La visualización aún se está generando'
+        }), 202
+    except Exception as e:
+        logger.error(f"Error generando visualización: {e}")
+        png = b""
+    
+    if not png:
+        return jsonify({
+            'status': 'error',
+            'message': 'No se pudo generar la visualización'
+        }), 500
+    
+    return Response(png, mimetype='image/png', headers={'Cache-Control': 'max-age=3600'})
+
 @app.route('/api/ejemplos', methods=['GET'])
 def obtener_ejemplos():
     ejemplos = [
@@ -137,11 +137,13 @@ const ResultsPanel = ({ result, loading }) => {
         </div>
       )}
 
-      {result.visualizacion_base64 && (
+      {(result.visualizacion_base64 || result.visualizacion_url) && (
         <div className="visualization-preview">
           <h4>Visualización de la Trayectoria</h4>
           <img 
-            src={`data:image/png;base64,${result.visualizacion_base64}`}
+            src={result.visualizacion_base64
+              ? `data:image/png;base64,${result.visualizacion_base64}`
+              : result.visualizacion_url}
             alt="Visualización de la trayectoria"
             className="preview-image"
           />
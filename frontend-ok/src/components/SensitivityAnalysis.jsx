@@ -208,7 +208,7 @@ const SensitivityAnalysis = ({ onAnalyze, loading, currentRoot, results }) => {
             </div>
             
             <div className="stat-card">
-              <div className="stat-value">{results.resultados.length}</div>
+              <div className="stat-value">{results.total_muestras ?? results.resultados.length}</div>
               <div className="stat-label">Simulaciones realizadas</div>
             </div>
           </div>
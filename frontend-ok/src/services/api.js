@@ -19,19 +19,26 @@ const seguroInt = (valor, def = 0) => {
   return isNaN(num) ? def : num;
 };
 
+let solverHandle = null;
+
+const conHandle = () => (solverHandle ? { params: { handle: solverHandle } } : {});
+
 export const apiService = {
   getHealth: () => api.get('/salud'),
   
   getStudents: () => api.get('/estudiantes'),
   
-  configureSolver: (config) => {
-    return api.post('/configurar', {
+  configureSolver: async (config) => {
+    const response = await api.post('/configurar', {
       expresion_funcion: String(config.expresion_funcion || 'z**2 - 4'),
       tol: seguroFloat(config.tol, 1e-12),
       max_iter: seguroInt(config.max_iter, 100),
       estrategia_ciclos: String(config.estrategia_ciclos || 'perturbacion_hibrida'),
-      usar_derivada_numerica: Boolean(config.usar_derivada_numerica || false)
+      usar_derivada_numerica: Boolean(config.usar_derivada_numerica || false),
+      metodo: String(config.metodo || 'secante')
     });
+    solverHandle = response.data.handle || null;
+    return response;
   },
   
   executeSecante: (data) => {
@@ -41,11 +48,62 @@ export const apiService = {
       x1_real: seguroFloat(data.x1_real, 1.0),
       x1_imag: seguroFloat(data.x1_imag, 0.0),
       id_ejecucion: data.id_ejecucion || undefined
+    }, conHandle());
+  },
+  
+  executeSecanteStream: async (data, onEvent) => {
+    const query = solverHandle ? `?handle=${solverHandle}` : '';
+    const response = await fetch(`${API_BASE_URL}/ejecutar/stream${query}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        x0_real: seguroFloat(data.x0_real, 0.5),
+        x0_imag: seguroFloat(data.x0_imag, 0.5),
+        x1_real: seguroFloat(data.x1_real, 1.0),
+        x1_imag: seguroFloat(data.x1_imag, 0.0),
+        id_ejecucion: data.id_ejecucion || undefined
+      })
     });
+
+    if (!response.ok) {
+      const cuerpo = await response.json().catch(() => ({}));
+      throw new Error(cuerpo.message || `HTTP ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let resultado = null;
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      lines.filter(Boolean).forEach((line) => {
+        const evento = JSON.parse(line);
+        if (evento.tipo === 'resultado') resultado = evento.resultado;
+        onEvent(evento);
+      });
+    }
+    return resultado;
+  },
+  
+  executeSecanteBatch: (semillas, opciones = {}) => {
+    return api.post('/ejecutar-lote', {
+      x0_real: semillas.map((s) => seguroFloat(s.x0_real, 0.5)),
+      x0_imag: semillas.map((s) => seguroFloat(s.x0_imag, 0.5)),
+      x1_real: semillas.map((s) => seguroFloat(s.x1_real, 1.0)),
+      x1_imag: semillas.map((s) => seguroFloat(s.x1_imag, 0.0)),
+      ids: semillas.every((s) => s.id) ? semillas.map((s) => String(s.id)) : undefined,
+      trayectorias: Boolean(opciones.trayectorias),
+      procesos: Boolean(opciones.procesos)
+    }, conHandle());
   },
   
-  searchRoots: (data) => {
-    return api.post('/buscar-raices', {
+  submitRootSearch: (data) => {
+    return api.post('/buscar-raices/trabajos', {
       region: {
         x_min: seguroFloat(data.region.x_min, -2),
         x_max: seguroFloat(data.region.x_max, 2),
@@ -54,7 +112,44 @@ export const apiService = {
       },
       n_puntos: seguroInt(data.n_puntos, 20),
       distancia_minima: seguroFloat(data.distancia_minima, 0.05),
-      paralelo: Boolean(data.paralelo || true)
+      paralelo: Boolean(data.paralelo || true),
+      adaptativo: Boolean(data.adaptativo),
+      contar_raices: Boolean(data.contar_raices),
+      deflacion: Boolean(data.deflacion)
+    }, conHandle());
+  },
+  
+  getRootSearchJob: (jobId) => api.get(`/buscar-raices/trabajos/${jobId}`),
+  
+  cancelRootSearchJob: (jobId) => api.delete(`/buscar-raices/trabajos/${jobId}`),
+  
+  // La búsqueda corre como trabajo en segundo plano: se consulta su estado hasta que termina,
+  // así las búsquedas largas no chocan con el timeout de axios
+  searchRoots: async (data, onProgress, intervalo = 500) => {
+    const envio = await apiService.submitRootSearch(data);
+    let trabajo = envio.data.trabajo;
+    
+    while (!['completado', 'cancelado', 'error'].includes(trabajo.estado)) {
+      await new Promise((resolve) => setTimeout(resolve, intervalo));
+      trabajo = (await apiService.getRootSearchJob(trabajo.id_trabajo)).data.trabajo;
+      if (onProgress) onProgress(trabajo);
+    }
+    
+    if (trabajo.estado !== 'completado') {
+      throw new Error(trabajo.error || `Búsqueda ${trabajo.estado}`);
+    }
+    return { data: { status: 'success', resultado: trabajo.resultado } };
+  },
+  
+  computeBasins: (data) => {
+    return api.post('/cuencas', {
+      region: data.region,
+      ancho: seguroInt(data.ancho, 256),
+      alto: seguroInt(data.alto, 256),
+      salida: data.salida || 'arrays'
+    }, {
+      ...conHandle(),
+      responseType: data.salida === 'png' ? 'blob' : 'json'
     });
   },
   
@@ -65,13 +160,14 @@ export const apiService = {
       niveles_ruido: Array.isArray(data.niveles_ruido) 
         ? data.niveles_ruido.map(n => seguroFloat(n, 1e-9))
         : [1e-15, 1e-12, 1e-9, 1e-6, 1e-3],
-      muestras_por_nivel: seguroInt(data.muestras_por_nivel, 5)
-    });
+      muestras_por_nivel: seguroInt(data.muestras_por_nivel, 5),
+      semilla: data.semilla ?? undefined
+    }, conHandle());
   },
   
-  getStatistics: () => api.get('/estadisticas'),
+  getStatistics: () => api.get('/estadisticas', conHandle()),
   
-  getReport: (resultId) => api.get(`/informe/${resultId}`),
+  getReport: (resultId) => api.get(`/informe/${resultId}`, conHandle()),
   
   getExamples: () => api.get('/ejemplos')
 };
@@ -0,0 +1,22 @@
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api
+
+logging.disable(logging.CRITICAL)
+
+
+@pytest.fixture
+def cliente():
+    api.app.config['TESTING'] = True
+    return api.app.test_client()
+
+
+@pytest.fixture
+def region():
+    return {'x_min': -2.0, 'x_max': 2.0, 'y_min': -2.0, 'y_max': 2.0}
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+import api
+
+EXPRESIONES = ['sin(z) - z/2', 'exp(z) - 2', 'cos(z)*z**2 + 1', 'sqrt(z) - 1 + I', 'log(z) + z']
+
+
+def puntos_prueba():
+    rng = np.random.default_rng(24)
+    return (rng.uniform(-3, 3, 200) + 1j * rng.uniform(-3, 3, 200)).astype(np.complex128)
+
+
+def referencia(expresion):
+    """Evaluación original: lambdify con NumPy y el ajuste de 1e-15 en los ceros."""
+    z = sp.symbols('z')
+    f = sp.lambdify(z, sp.parse_expr(expresion), modules='numpy')
+
+    def evaluar(valores):
+        with np.errstate(all='ignore'):
+            resultado = np.asarray(f(valores), dtype=np.complex128) + 0j
+        resultado[np.abs(resultado) < 1e-15] += complex(1e-15, 1e-15)
+        return resultado
+
+    return evaluar
+
+
+@pytest.mark.parametrize('expresion', EXPRESIONES)
+def test_escalar_y_vectorizada_coinciden_con_numpy(expresion):
+    compilada = api.compilar_expresion(expresion)
+    assert compilada.backend.startswith('cmath')
+
+    z = puntos_prueba()
+    esperado = referencia(expresion)(z)
+    escalares = np.array([compilada.escalar(complex(v)) for v in z])
+    np.testing.assert_allclose(escalares, esperado, rtol=1e-12, atol=1e-14)
+    np.testing.assert_allclose(compilada.vectorizada(z), esperado, rtol=1e-12, atol=1e-14)
+
+
+@pytest.mark.parametrize('expresion', EXPRESIONES)
+def test_numexpr_coincide_con_numpy(expresion):
+    numexpr = pytest.importorskip('numexpr')
+    z = sp.symbols('z')
+    cadena = api.expresion_numexpr(sp.parse_expr(expresion), z)
+    if cadena is None:
+        pytest.skip('numexpr no cubre esta expresión')
+
+    puntos = puntos_prueba()
+    np.testing.assert_allclose(numexpr.evaluate(cadena, local_dict={'z': puntos}),
+                               referencia(expresion)(puntos), rtol=1e-12, atol=1e-14)
+    assert 'numexpr' in api.compilar_expresion(expresion).backend
+
+
+def test_backend_numpy_cuando_cmath_no_cubre_la_expresion():
+    compilada = api.compilar_expresion('gamma(z) - 2')
+    assert 'cmath' not in compilada.backend
+    z = puntos_prueba()[:20]
+    np.testing.assert_allclose([compilada.escalar(complex(v)) for v in z],
+                               compilada.vectorizada(z), rtol=1e-12, atol=1e-14)
+
+
+def test_desbordamiento_no_se_confunde_con_una_raiz():
+    compilada = api.compilar_expresion('exp(z) - 1')
+    valor = compilada.escalar(800)
+    assert not np.isfinite(valor)
+    assert abs(valor) > 1
+    assert not np.isfinite(compilada.vectorizada(np.array([800 + 0j]))[0])
+
+
+def test_ceros_exactos_conservan_el_ajuste():
+    compilada = api.compilar_expresion('sin(z)')
+    assert compilada.escalar(0) == complex(1e-15, 1e-15)
+    assert compilada.vectorizada(np.zeros(3, dtype=np.complex128))[0] == complex(1e-15, 1e-15)
+
+
+def test_solver_no_converge_en_el_desbordamiento():
+    solver = api.SecanteComplejoAvanzado('exp(z) - 1', estrategia_ciclos='reset', max_iter=20)
+    resultado = solver.ejecutar_secante(800, 0, 801, 0)
+    raiz = complex(resultado['raiz']['real'], resultado['raiz']['imag'])
+    if resultado['convergio']:
+        assert abs(np.exp(raiz) - 1) < 1e-6
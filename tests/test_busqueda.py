@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+import api
+
+CONFIGURACION = {'max_iter': 20, 'estrategia_ciclos': 'reset'}
+
+
+def raices(resultado):
+    return np.array([complex(r['real'], r['imag']) for r in resultado['raices']])
+
+
+def mismas_raices(a, b):
+    # Se empareja por cercanía: ordenar no sirve con pares conjugados de igual parte real
+    a, b = raices(a), raices(b)
+    distancias = np.abs(a[:, np.newaxis] - b[np.newaxis, :])
+    return (a.size == b.size and bool(np.all(distancias.min(axis=0) < 1e-8))
+            and bool(np.all(distancias.min(axis=1) < 1e-8)))
+
+
+@pytest.mark.parametrize('opciones', [{'adaptativo': True}, {'deflacion': True}])
+def test_estrategias_de_busqueda_coinciden_con_la_malla(region, opciones):
+    solver = api.SecanteComplejoAvanzado('z**3 - 2*z + 2', **CONFIGURACION)
+    malla = solver.buscar_raices_multiples(region, n_puntos=15, semillas_companion=False)
+    otra = solver.buscar_raices_multiples(region, n_puntos=15, semillas_companion=False, **opciones)
+    assert mismas_raices(otra, malla)
+
+
+def test_funcion_deflactada_divide_por_las_raices_conocidas():
+    solver = api.SecanteComplejoAvanzado('z**3 - 1')
+    raiz = complex(1, 0)
+    deflactada = api.deflactar_funcion(solver.funcion_vectorizada, [raiz])
+    z = np.linspace(-2, 2, 9) + 0.5j
+    np.testing.assert_allclose(deflactada(z), z ** 2 + z + 1, rtol=1e-9)
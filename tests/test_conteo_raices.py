@@ -0,0 +1,19 @@
+import pytest
+
+import api
+
+
+@pytest.mark.parametrize('expresion,region,esperadas', [
+    ('z**5 - 1', (-2, 2, -2, 2), 5),
+    ('z**5 - 1', (0.5, 2, -0.5, 0.5), 1),
+    ('sin(z)', (-7, 7, -1, 1), 5),
+    ('1/(z - 0.5) + z', (-2, 2, -2, 2), 1),
+])
+def test_principio_del_argumento_cuenta_ceros_menos_polos(expresion, region, esperadas):
+    solver = api.SecanteComplejoAvanzado(expresion)
+    assert solver.contar_raices_region(*region) == esperadas
+
+
+def test_principio_del_argumento_rechaza_ceros_en_el_contorno():
+    solver = api.SecanteComplejoAvanzado('z - 1')
+    assert solver.contar_raices_region(1, 2, -1, 1) is None
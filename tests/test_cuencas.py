@@ -0,0 +1,90 @@
+import base64
+import io
+import json
+
+import numpy as np
+from matplotlib import image
+
+import api
+
+# Con 'reset' y max_iter=20 no hay perturbaciones aleatorias: cada píxel es determinista
+CONFIGURACION = {'expresion_funcion': 'z**3 - 1', 'max_iter': 20, 'estrategia_ciclos': 'reset'}
+ANCHO, ALTO = 40, 30
+
+
+def raiz_por_pixel(indices, raices):
+    """Raíz (redondeada) de cada píxel, independiente del orden en que se numeraron."""
+    tabla = [complex(round(r['real'], 6), round(r['imag'], 6)) for r in raices] + [complex('nan')]
+    return np.asarray(tabla)[np.where(np.asarray(indices) >= 0, indices, -1)]
+
+
+def eventos_ndjson(respuesta):
+    return [json.loads(linea) for linea in respuesta.get_data(as_text=True).splitlines()]
+
+
+def test_cuencas_arrays_usa_tipos_compactos(region):
+    solver = api.SecanteComplejoAvanzado(**CONFIGURACION)
+    resultado = solver.generar_cuencas(region, ANCHO, ALTO)
+    assert resultado['indices'].dtype == np.int16
+    assert resultado['iteraciones'].dtype == np.uint16
+    assert len(resultado['raices']) == 3
+
+
+def test_cuencas_ndjson_coincide_con_arrays(cliente, region):
+    cliente.post('/api/configurar', json=CONFIGURACION)
+    completa = cliente.post('/api/cuencas', json={'region': region, 'ancho': ANCHO, 'alto': ALTO}).get_json()
+    completa = completa['resultado']
+
+    respuesta = cliente.post('/api/cuencas', json={'region': region, 'ancho': ANCHO, 'alto': ALTO,
+                                                   'salida': 'ndjson', 'filas_por_bloque': 7})
+    assert respuesta.mimetype == 'application/x-ndjson'
+    eventos = eventos_ndjson(respuesta)
+    bloques, fin = eventos[:-1], eventos[-1]
+    assert [b['fila'] for b in bloques] == list(range(0, ALTO, 7))
+    assert fin['tipo'] == 'fin'
+
+    raices = [r for b in bloques for r in b['raices_nuevas']]
+    assert raices == fin['raices']
+    indices = np.concatenate([b['indices'] for b in bloques])
+    iteraciones = np.concatenate([b['iteraciones'] for b in bloques])
+
+    np.testing.assert_array_equal(iteraciones, completa['iteraciones'])
+    np.testing.assert_array_equal(raiz_por_pixel(indices, raices),
+                                  raiz_por_pixel(completa['indices'], completa['raices']))
+    assert fin['pixeles_convergidos'] == completa['pixeles_convergidos']
+
+
+def test_cuencas_ndjson_binario(cliente, region):
+    cliente.post('/api/configurar', json=CONFIGURACION)
+    respuesta = cliente.post('/api/cuencas?formato=binario',
+                             json={'region': region, 'ancho': ANCHO, 'alto': ALTO, 'salida': 'ndjson'})
+    bloque = eventos_ndjson(respuesta)[0]
+    iteraciones = np.frombuffer(base64.b64decode(bloque['iteraciones']['datos']), dtype='<u2')
+    assert iteraciones.size == bloque['filas'] * ANCHO == bloque['iteraciones']['longitud']
+
+
+def test_cuencas_png_se_codifica_por_filas(cliente, region):
+    cliente.post('/api/configurar', json=CONFIGURACION)
+    respuesta = cliente.post('/api/cuencas', json={'region': region, 'ancho': ANCHO, 'alto': ALTO,
+                                                   'salida': 'png', 'filas_por_bloque': 4})
+    assert respuesta.mimetype == 'image/png'
+    png = np.round(image.imread(io.BytesIO(respuesta.get_data()), format='png') * 255).astype(np.uint8)
+    assert png.shape == (ALTO, ANCHO, 3)
+
+    # La fila superior del PNG es y_max: se compara con la malla recorrida desde arriba
+    solver = api.SecanteComplejoAvanzado(**CONFIGURACION)
+    bloques = list(solver.iterar_cuencas(region, ANCHO, ALTO, filas_por_bloque=4, descendente=True))
+    indices = np.vstack([b[1] for b in bloques])
+    iteraciones = np.vstack([b[2] for b in bloques])
+    np.testing.assert_array_equal(png, solver.colorear_cuencas(indices, iteraciones))
+
+    completa = solver.generar_cuencas(region, ANCHO, ALTO)
+    np.testing.assert_array_equal(iteraciones, completa['iteraciones'][::-1])
+    np.testing.assert_array_equal(png.any(axis=2), completa['indices'][::-1] >= 0)
+
+
+def test_cuencas_arrays_limita_el_tamano(cliente, region):
+    cliente.post('/api/configurar', json=CONFIGURACION)
+    respuesta = cliente.post('/api/cuencas', json={'region': region, 'ancho': 2048, 'alto': 2048})
+    assert respuesta.status_code == 400
+    assert 'ndjson' in respuesta.get_json()['message']
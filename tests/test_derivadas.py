@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+import api
+
+
+def puntos_prueba():
+    rng = np.random.default_rng(22)
+    return rng.uniform(-2, 2, 64) + 1j * rng.uniform(-2, 2, 64)
+
+
+@pytest.mark.parametrize('expresion', ['sin(z)*z - 1', 'exp(z**2) - z', 'z**7 - 3*z + 1', 'log(z) + cos(z)'])
+def test_derivada_analitica_coincide_con_sympy(expresion):
+    compilada = api.compilar_expresion(expresion)
+    z = sp.symbols('z')
+    df = sp.lambdify(z, sp.diff(sp.parse_expr(expresion), z), modules='numpy')
+    puntos = puntos_prueba()
+
+    valor, derivada = compilada.vectorizada_con_derivada(puntos)
+    np.testing.assert_allclose(valor, compilada.vectorizada(puntos), rtol=1e-12)
+    np.testing.assert_allclose(derivada, df(puntos) + 0j, rtol=1e-10, atol=1e-12)
+    for p, d in zip(puntos[:10], derivada[:10]):
+        np.testing.assert_allclose(compilada.escalar_con_derivada(complex(p))[1], d, rtol=1e-10, atol=1e-12)
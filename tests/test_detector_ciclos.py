@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import api
+
+
+def detectar_ciclo_base(errores, ventana=10):
+    """_detectar_ciclo original: recalcula la ventana completa en cada iteración."""
+    if len(errores) < ventana:
+        return False
+    ultimos = errores[-ventana:]
+    if abs(ultimos[-1] - ultimos[0]) / (ultimos[0] + 1e-15) < 0.01:
+        return True
+    diferencias = np.diff(ultimos)
+    if np.std(diferencias) < 1e-10:
+        return True
+    return np.sum(np.abs(np.diff(np.sign(diferencias)))) > ventana * 0.8
+
+
+def series_de_errores():
+    rng = np.random.default_rng(3)
+    n = 120
+    k = np.arange(n)
+    return {
+        'convergente': 10.0 * 0.7 ** k,
+        'oscilante': 1.0 + 0.5 * (-1.0) ** k,
+        'lineal': 5.0 - 1e-3 * k,
+        'meseta': np.concatenate([np.geomspace(1, 1e-3, n // 2), np.full(n - n // 2, 1e-3)]),
+        'aleatoria': np.abs(rng.normal(size=n)) + 1e-3,
+        'paseo': np.abs(np.cumsum(rng.normal(size=n))) + 1e-3,
+        'ruido_pequeno': 1.0 + 1e-13 * rng.normal(size=n),
+    }
+
+
+@pytest.mark.parametrize('nombre', list(series_de_errores()))
+def test_detector_incremental_coincide_con_original(nombre):
+    serie = series_de_errores()[nombre].tolist()
+    detector = api.DetectorCiclos(10)
+    for i, error in enumerate(serie):
+        detector.agregar(error)
+        assert detector.hay_ciclo() == detectar_ciclo_base(serie[:i + 1]), i
+
+
+def test_detector_lote_coincide_con_escalar_por_carril():
+    series = np.array(list(series_de_errores().values()))
+    lote = api.DetectorCiclosLote(series.shape[0], 10)
+    escalares = [api.DetectorCiclos(10) for _ in series]
+
+    carriles = np.arange(series.shape[0])
+    for k in range(series.shape[1]):
+        lote.agregar(series[carriles, k])
+        for carril in carriles:
+            escalares[carril].agregar(float(series[carril, k]))
+        esperado = [escalares[c].hay_ciclo() for c in carriles]
+        assert lote.hay_ciclo().tolist() == esperado, k
+
+        # A mitad de la serie se retiran carriles, como cuando convergen en el motor por lotes
+        if k == 60:
+            seguir = carriles % 2 == 0
+            lote.filtrar(seguir)
+            carriles = carriles[seguir]
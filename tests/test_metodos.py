@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import api
+
+METODOS = ['muller', 'iqi', 'steffensen']
+
+
+def ternas(n=300):
+    rng = np.random.default_rng(21)
+    puntos = rng.uniform(-2, 2, (3, n)) + 1j * rng.uniform(-2, 2, (3, n))
+    # Algunas ternas degeneradas (puntos repetidos) para cubrir los casos sin paso válido
+    puntos[0, :20] = puntos[1, :20]
+    return puntos
+
+
+@pytest.mark.parametrize('metodo', METODOS)
+def test_paso_lote_coincide_con_escalar(metodo):
+    solver = api.SecanteComplejoAvanzado('z**3 - 2*z + 2')
+    paso_escalar, paso_lote = solver.metodos[metodo]
+    x_ant, x0, x1 = ternas()
+    f = solver.funcion_vectorizada
+    fx_ant, fx0, fx1 = f(x_ant), f(x0), f(x1)
+
+    x_lote, valido = paso_lote(x_ant, x0, x1, fx_ant, fx0, fx1, f)
+    for i in range(x1.size):
+        x_escalar = paso_escalar(complex(x_ant[i]), complex(x0[i]), complex(x1[i]), complex(fx_ant[i]),
+                                 complex(fx0[i]), complex(fx1[i]), solver.funcion)
+        assert valido[i] == (x_escalar is not None), i
+        if x_escalar is not None:
+            assert abs(x_lote[i] - x_escalar) <= 1e-9 * (1 + abs(x_escalar))
+
+
+@pytest.mark.parametrize('metodo', METODOS)
+def test_motor_lote_coincide_con_escalar_por_metodo(metodo):
+    # 'reset' no perturba antes de la iteración 21: ambos motores son deterministas hasta ahí
+    solver = api.SecanteComplejoAvanzado('z**3 - 1', metodo=metodo, estrategia_ciclos='reset')
+    xs = np.linspace(-1.4, 1.4, 7) + 0.013
+    x0 = (xs[:, np.newaxis] + 1j * xs[np.newaxis, :]).ravel()
+    x1 = x0 + complex(0.02, 0.02)
+    lote = solver.ejecutar_secante_lote(x0, x1)
+
+    comparadas = 0
+    for i in range(x0.size):
+        escalar = solver.ejecutar_secante(x0[i].real, x0[i].imag, x1[i].real, x1[i].imag)
+        if not escalar['convergio'] or escalar['iteraciones'] > 20:
+            continue
+        comparadas += 1
+        assert lote['iteraciones'][i] == escalar['iteraciones'], i
+        raiz = complex(escalar['raiz']['real'], escalar['raiz']['imag'])
+        assert abs(lote['raices'][i] - raiz) < 1e-9
+
+    assert comparadas >= 0.8 * x0.size
+
+
+@pytest.mark.parametrize('metodo', METODOS)
+def test_metodos_convergen_a_una_raiz(metodo):
+    solver = api.SecanteComplejoAvanzado('z**3 - 1', metodo=metodo)
+    resultado = solver.ejecutar_secante(0.7, 0.6, 0.8, 0.6)
+    raiz = complex(resultado['raiz']['real'], resultado['raiz']['imag'])
+    assert resultado['convergio']
+    assert abs(raiz ** 3 - 1) < 1e-10
@@ -0,0 +1,72 @@
+import numpy as np
+
+import api
+
+
+def semillas_malla(n=9, lado=1.5):
+    xs = np.linspace(-lado, lado, n)
+    x0 = (xs[:, np.newaxis] + 1j * xs[np.newaxis, :]).ravel() + complex(0.013, 0.007)
+    return x0, x0 + complex(0.02, 0.02)
+
+
+def raices_redondeadas(resultado, decimales=6):
+    return sorted((round(r['real'], decimales), round(r['imag'], decimales)) for r in resultado['raices'])
+
+
+def test_lote_coincide_con_escalar():
+    # 'reset' no perturba antes de la iteración 21: hasta ahí ambos motores son deterministas
+    solver = api.SecanteComplejoAvanzado('z**3 - 1', estrategia_ciclos='reset')
+    x0, x1 = semillas_malla()
+    lote = solver.ejecutar_secante_lote(x0, x1)
+
+    comparadas = 0
+    for i in range(x0.size):
+        escalar = solver.ejecutar_secante(x0[i].real, x0[i].imag, x1[i].real, x1[i].imag)
+        if not escalar['convergio'] or escalar['iteraciones'] > 20:
+            continue
+        comparadas += 1
+        assert lote['convergio'][i]
+        assert lote['iteraciones'][i] == escalar['iteraciones']
+        raiz = complex(escalar['raiz']['real'], escalar['raiz']['imag'])
+        assert abs(lote['raices'][i] - raiz) < 1e-9
+
+    assert comparadas >= 0.8 * x0.size
+
+
+def test_lote_registra_raices_unicas():
+    solver = api.SecanteComplejoAvanzado('z**3 - 1', estrategia_ciclos='reset')
+    x0, x1 = semillas_malla()
+    lote = solver.ejecutar_secante_lote(x0, x1)
+
+    esperadas = np.exp(2j * np.pi * np.arange(3) / 3)
+    encontradas = [e['complejo'] for e in solver.raices_encontradas]
+    assert len(encontradas) == 3
+    assert all(np.min(np.abs(esperadas - z)) < 1e-9 for z in encontradas)
+    assert lote['convergio'].sum() == solver.estadisticas['convergencias_exitosas']
+
+
+def test_busqueda_vectorizada_coincide_con_escalar(region):
+    solver = api.SecanteComplejoAvanzado('z**4 - 1', estrategia_ciclos='reset')
+    parametros = dict(region=region, n_puntos=10, semillas_companion=False, paralelo=False)
+
+    vectorizada = solver.buscar_raices_multiples(vectorizado=True, **parametros)
+    escalar = solver.buscar_raices_multiples(vectorizado=False, **parametros)
+
+    assert raices_redondeadas(vectorizada) == raices_redondeadas(escalar)
+    assert vectorizada['total_raices'] == 4
+
+
+def test_busqueda_vectorizada_usa_lotes_acotados(region, monkeypatch):
+    tamanos = []
+    original = api.SecanteComplejoAvanzado.ejecutar_secante_lote
+
+    def registrar_tamano(self, x0s, x1s, *args, **kwargs):
+        tamanos.append(np.size(x0s))
+        return original(self, x0s, x1s, *args, **kwargs)
+
+    monkeypatch.setattr(api.SecanteComplejoAvanzado, 'ejecutar_secante_lote', registrar_tamano)
+    solver = api.SecanteComplejoAvanzado('sin(z) - z/2', max_iter=15)
+    solver.buscar_raices_multiples(region, n_puntos=200, semillas_companion=False)
+
+    assert sum(tamanos) >= 200 * 200
+    assert max(tamanos) <= api.MAX_SEMILLAS_POR_PASADA
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+import api
+
+POLINOMIOS = ['z**3 - 1', 'z**10 - 3*z**4 + 2', '(z - 1)**3*(z + 1)', '2*z**5 + I*z**2 - z + 7']
+
+
+def puntos_prueba():
+    rng = np.random.default_rng(11)
+    return (rng.uniform(-2, 2, 200) + 1j * rng.uniform(-2, 2, 200)).astype(np.complex128)
+
+
+def referencia(expresion):
+    z = sp.symbols('z')
+    expr = sp.parse_expr(expresion)
+    return (sp.lambdify(z, expr, modules='numpy'),
+            sp.lambdify(z, sp.diff(expr, z), modules='numpy'))
+
+
+@pytest.mark.parametrize('expresion', POLINOMIOS)
+def test_horner_coincide_con_lambdify(expresion):
+    compilada = api.compilar_expresion(expresion)
+    assert compilada.backend == 'horner'
+
+    f, df = referencia(expresion)
+    z = puntos_prueba()
+    esperado = f(z) + 0j
+    esperado[np.abs(esperado) < 1e-15] += complex(1e-15, 1e-15)
+
+    escalares = np.array([compilada.escalar(complex(v)) for v in z])
+    np.testing.assert_allclose(compilada.vectorizada(z), esperado, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(escalares, esperado, rtol=1e-10, atol=1e-12)
+
+    valor, derivada = compilada.vectorizada_con_derivada(z)
+    np.testing.assert_allclose(valor, esperado, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(derivada, df(z) + 0j, rtol=1e-10, atol=1e-12)
+    for v, d in zip(z[:20], derivada[:20]):
+        np.testing.assert_allclose(compilada.escalar_con_derivada(complex(v))[1], d, rtol=1e-10, atol=1e-12)
+
+
+def test_horner_escalar_desbordado_sigue_al_vectorizado():
+    compilada = api.compilar_expresion('z**400 - 1')
+    z = complex(1e3, 1e-15)
+    escalar = compilada.escalar(z)
+    vectorizado = compilada.vectorizada(np.array([z]))[0]
+    assert not np.isfinite(escalar)
+    np.testing.assert_array_equal(np.isnan([escalar.real, escalar.imag]),
+                                  np.isnan([vectorizado.real, vectorizado.imag]))
+    # abs() no debe arrastrar el OverflowError de la potencia fallida
+    assert not np.isfinite(abs(escalar))
+
+
+def test_ejecutar_con_desbordamiento_no_falla(cliente):
+    cliente.post('/api/configurar', json={'expresion_funcion': 'z**400 - 1', 'max_iter': 20,
+                                          'estrategia_ciclos': 'reset'})
+    respuesta = cliente.post('/api/ejecutar', json={'x0_real': 1e3, 'x0_imag': 0, 'x1_real': 1001,
+                                                    'x1_imag': 0, 'visualizacion': 'ninguna'})
+    assert respuesta.status_code == 200
+    assert respuesta.get_json()['resultado']['convergio'] is False
+
+
+@pytest.mark.parametrize('expresion', POLINOMIOS)
+def test_raices_companion_coinciden_con_sympy(expresion):
+    solver = api.SecanteComplejoAvanzado(expresion)
+    z = sp.symbols('z')
+    esperadas = np.array([complex(r) for r in sp.Poly(sp.parse_expr(expresion), z).nroots(maxsteps=500)])
+    obtenidas = solver.raices_polinomio()
+    assert obtenidas.size == esperadas.size
+    # Las raíces múltiples solo se resuelven hasta ~eps**(1/m)
+    for raiz in esperadas:
+        assert np.min(np.abs(obtenidas - raiz)) < 1e-4
+
+
+def test_raices_companion_respeta_grado_maximo():
+    assert api.SecanteComplejoAvanzado('z**250 - 1').raices_polinomio(grado_max=200) is None
+    assert api.SecanteComplejoAvanzado('sin(z)').raices_polinomio() is None
@@ -0,0 +1,46 @@
+import numpy as np
+
+import api
+
+CONFIGURACION = {'max_iter': 20, 'estrategia_ciclos': 'reset'}
+
+
+def semillas(n=64):
+    rng = np.random.default_rng(2)
+    x0 = rng.uniform(-2, 2, n) + 1j * rng.uniform(-2, 2, n)
+    return x0, x0 + complex(0.05, 0.03)
+
+
+def raices(resultado):
+    return np.array([complex(r['real'], r['imag']) for r in resultado['raices']])
+
+
+def mismas_raices(a, b):
+    # Se empareja por cercanía: ordenar no sirve con pares conjugados de igual parte real
+    a, b = raices(a), raices(b)
+    distancias = np.abs(a[:, np.newaxis] - b[np.newaxis, :])
+    return (a.size == b.size and bool(np.all(distancias.min(axis=0) < 1e-8))
+            and bool(np.all(distancias.min(axis=1) < 1e-8)))
+
+
+def test_lote_en_procesos_coincide_con_el_del_proceso():
+    solver = api.SecanteComplejoAvanzado('z**4 - 1', **CONFIGURACION)
+    x0, x1 = semillas()
+    local = solver.ejecutar_lote(x0, x1)
+    en_procesos = solver.ejecutar_lote(x0, x1, procesos=True, max_workers=2)
+
+    for a, b in zip(local['resultados'], en_procesos['resultados']):
+        assert a['convergio'] == b['convergio']
+        assert a['iteraciones'] == b['iteraciones']
+        assert abs(complex(a['raiz']['real'], a['raiz']['imag'])
+                   - complex(b['raiz']['real'], b['raiz']['imag'])) < 1e-12
+
+
+def test_busqueda_en_procesos_encuentra_las_mismas_raices(region):
+    solver = api.SecanteComplejoAvanzado('z**4 - 1', **CONFIGURACION)
+    base = solver.buscar_raices_multiples(region, n_puntos=12, paralelo=False, vectorizado=False,
+                                          semillas_companion=False)
+    en_procesos = solver.buscar_raices_multiples(region, n_puntos=12, procesos=True, max_workers=2,
+                                                 semillas_companion=False)
+    assert mismas_raices(base, en_procesos)
+    assert len(base['raices']) == 4
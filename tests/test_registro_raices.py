@@ -0,0 +1,56 @@
+import pickle
+
+import numpy as np
+import pytest
+
+import api
+
+
+def entradas(registro):
+    return [(e['complejo'], e['veces_encontrada']) for e in registro]
+
+
+@pytest.mark.parametrize('distancia', [0.05, 0.3, 1.0])
+def test_insertar_lote_equivale_a_insertar_en_orden(distancia):
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        previas = (rng.normal(size=rng.integers(0, 6)) + 1j * rng.normal()) * 2
+        centros = (rng.normal(size=5) + 1j * rng.normal(size=5)) * 2
+        dispersion = distancia * rng.choice([0.01, 0.5, 2.0])
+        puntos = centros[rng.integers(0, 5, 200)] + dispersion * (rng.normal(size=200) + 1j * rng.normal(size=200))
+
+        uno_a_uno = api.RegistroRaices(distancia)
+        por_lote = api.RegistroRaices(distancia)
+        for z in previas:
+            uno_a_uno.insertar(z)
+            por_lote.insertar(z)
+
+        nuevas = sum(uno_a_uno.insertar(complex(z)) for z in puntos)
+        assert por_lote.insertar_lote(puntos) == nuevas
+        assert entradas(por_lote) == entradas(uno_a_uno)
+
+
+def test_insertar_lote_compara_distancias_reales():
+    registro = api.RegistroRaices(1.0)
+    # Misma celda pero a más de distancia_minima: son dos raíces distintas
+    assert registro.insertar_lote(np.array([0.05 + 0.05j, 0.95 + 0.95j])) == 2
+    # Celdas vecinas a menos de distancia_minima: se fusionan con la existente
+    assert registro.insertar_lote(np.array([-0.05 + 0.05j])) == 0
+    assert entradas(registro) == [(0.05 + 0.05j, 2), (0.95 + 0.95j, 1)]
+
+
+def test_insertar_lote_ignora_no_finitos_y_guarda_datos():
+    registro = api.RegistroRaices(0.1)
+    raices = np.array([1 + 0j, np.nan, np.inf, 1 + 1e-3j])
+    assert registro.insertar_lote(raices, lambda z: {'real': z.real}) == 1
+    [entrada] = list(registro)
+    assert entrada['real'] == 1.0
+    assert entrada['veces_encontrada'] == 2
+
+
+def test_registro_se_serializa_con_pickle():
+    registro = api.RegistroRaices(0.1)
+    registro.insertar_lote(np.array([1 + 0j, -1 + 0j]))
+    copia = pickle.loads(pickle.dumps(registro))
+    assert entradas(copia) == entradas(registro)
+    assert copia.insertar(1 + 1e-3j) is False
@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+import pytest
+import sympy as sp
+
+import api
+
+
+def funcion_base(expresion):
+    """Evaluación original: lambdify con NumPy y el mismo ajuste de 1e-15 que funcion_segura."""
+    z = sp.symbols('z')
+    f = sp.lambdify(z, sp.parse_expr(expresion), modules=['numpy', 'cmath'])
+
+    def evaluar(valor):
+        with np.errstate(all='ignore'):
+            resultado = complex(f(complex(valor)))
+        return resultado + complex(1e-15, 1e-15) if abs(resultado) < 1e-15 else resultado
+
+    return evaluar
+
+
+def secante_base(f, x0, x1, tol, max_iter, ventana=10):
+    """Bucle original de ejecutar_secante (listas que crecen) con la estrategia 'reset'."""
+    fx0, fx1 = f(x0), f(x1)
+    trayectoria = [x0, x1]
+    errores = [max(abs(fx0), 1e-15), max(abs(fx1), 1e-15)]
+    relativos = []
+    for k in range(1, max_iter + 1):
+        assert k <= 20, 'la estrategia reset deja de ser determinista a partir de la iteración 21'
+        if abs(fx1 - fx0) < 1e-15:
+            # El original perturba al azar el punto medio: no es comparable
+            return trayectoria, errores, relativos, False, k
+        x_next = x1 - fx1 * (x1 - x0) / (fx1 - fx0)
+        fx_next = f(x_next)
+        error = abs(fx_next)
+        error = 1.0 if not math.isfinite(error) else max(error, 1e-15)
+        trayectoria.append(x_next)
+        errores.append(error)
+        anterior = trayectoria[-2]
+        relativos.append(max(abs((x_next - anterior) / anterior) if abs(anterior) > 1e-15
+                             else abs(x_next - anterior), 1e-15))
+        if error < tol:
+            return trayectoria, errores, relativos, True, k
+
+        ultimos = errores[-ventana:]
+        if k > 10 and len(errores) >= ventana and (
+                abs(ultimos[-1] - ultimos[0]) / (ultimos[0] + 1e-15) < 0.01
+                or np.std(np.diff(ultimos)) < 1e-10
+                or np.sum(np.abs(np.diff(np.sign(np.diff(ultimos))))) > ventana * 0.8):
+            continue
+        x0, x1, fx0, fx1 = x1, x_next, fx1, fx_next
+    return trayectoria, errores, relativos, False, max_iter
+
+
+def complejos(puntos):
+    return np.array([p['real'] + 1j * p['imag'] for p in puntos])
+
+
+@pytest.mark.parametrize('expresion', ['z**3 - 1', 'sin(z) - z/2', 'exp(z) - 2'])
+def test_secante_coincide_con_bucle_original(expresion):
+    solver = api.SecanteComplejoAvanzado(expresion, tol=1e-10, estrategia_ciclos='reset')
+    f = funcion_base(expresion)
+
+    comparadas = 0
+    for x in np.linspace(-1.3, 1.7, 6):
+        for y in np.linspace(-1.1, 1.3, 5):
+            x0, x1 = complex(x, y), complex(x + 0.1, y + 0.05)
+            trayectoria, errores, relativos, convergio, iteraciones = secante_base(f, x0, x1, 1e-10, 20)
+            if not convergio:
+                continue
+            comparadas += 1
+
+            resultado = solver.ejecutar_secante(x0.real, x0.imag, x1.real, x1.imag)
+            assert resultado['convergio']
+            assert resultado['iteraciones'] == iteraciones
+            np.testing.assert_allclose(complejos(resultado['trayectoria']), trayectoria,
+                                       rtol=1e-7, atol=1e-12)
+            np.testing.assert_allclose(resultado['errores_iteracion'][:-1], errores[:-1],
+                                       rtol=1e-5, atol=1e-12)
+            assert resultado['errores_iteracion'][-1] < 1e-10
+            np.testing.assert_allclose(resultado['errores_relativos'], relativos, rtol=1e-5, atol=1e-12)
+
+    assert comparadas >= 15
+
+
+def test_resultado_no_retiene_buferes_de_max_iter():
+    solver = api.SecanteComplejoAvanzado('z**2 - 2', max_iter=100000)
+    resultado = solver.ejecutar_secante(1.0, 0.0, 2.0, 0.0)
+    guardado = solver.historial_ejecuciones.obtener(resultado['id_ejecucion'])
+
+    assert guardado.trayectoria.size == resultado['iteraciones'] + 2
+    assert guardado.trayectoria.base is None
+    assert guardado.nbytes() < 4096
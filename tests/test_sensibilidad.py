@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import api
+
+NIVELES = [1e-9, 1e-6, 1e-3, 1e-1]
+
+
+@pytest.mark.parametrize('tamano_bloque', [777, 1000, 2**18])
+def test_estadisticas_por_bloques_coinciden_con_las_directas(tamano_bloque):
+    solver = api.SecanteComplejoAvanzado('z**3 - 2*z + 1')
+    muestras = 1000
+    resultado = solver.analizar_sensibilidad_ruido(1.0, 0.0, NIVELES, muestras, semilla=5,
+                                                   detalle_por_nivel=muestras,
+                                                   tamano_bloque=tamano_bloque)
+
+    sensibilidades = np.array([r['sensibilidad'] for r in resultado['resultados']]).reshape(len(NIVELES), muestras)
+    estadisticas = resultado['estadisticas']
+    np.testing.assert_allclose(estadisticas['sensibilidad_promedio'], sensibilidades.mean(axis=1), rtol=1e-10)
+    np.testing.assert_allclose(estadisticas['sensibilidad_std'], sensibilidades.std(axis=1), rtol=1e-8)
+    np.testing.assert_array_equal(estadisticas['min'], sensibilidades.min(axis=1))
+    np.testing.assert_array_equal(estadisticas['max'], sensibilidades.max(axis=1))
+    assert [r['nivel_ruido'] for r in resultado['resultados'][::muestras]] == NIVELES
+
+
+def test_misma_semilla_reproduce_el_analisis():
+    solver = api.SecanteComplejoAvanzado('z**2 - 2')
+    a = solver.analizar_sensibilidad_ruido(2 ** 0.5, 0.0, NIVELES, 500, semilla=9)
+    b = solver.analizar_sensibilidad_ruido(2 ** 0.5, 0.0, NIVELES, 500, semilla=9)
+    assert a['estadisticas_por_nivel'] == b['estadisticas_por_nivel']
+
+
+def test_detalle_limitado_por_nivel():
+    solver = api.SecanteComplejoAvanzado('z**2 - 2')
+    resultado = solver.analizar_sensibilidad_ruido(2 ** 0.5, 0.0, NIVELES, 500, semilla=1, detalle_por_nivel=3)
+    assert resultado['total_muestras'] == 500 * len(NIVELES)
+    assert len(resultado['resultados']) == 3 * len(NIVELES)
+
+
+def test_endpoint_acepta_el_maximo_de_muestras_por_nivel(cliente):
+    cliente.post('/api/configurar', json={'expresion_funcion': 'z**2 - 2'})
+    respuesta = cliente.post('/api/sensibilidad', json={'raiz_real': 2 ** 0.5, 'raiz_imag': 0,
+                                                        'muestras_por_nivel': 10**6, 'detalle_por_nivel': 0})
+    assert respuesta.status_code == 200
+    assert respuesta.get_json()['resultado']['total_muestras'] == 5 * 10**6